@@ -0,0 +1,103 @@
+"""
+Benchmark the offset-based engine (recursive_chunk_spans()) against recursive_chunk_legacy().
+
+Generates synthetic documents of the requested sizes, checks that both implementations
+produce identical chunk boundaries and reports throughput for each (best of --repeat runs).
+
+Both are linear in the input size. The engine wins when chunks span many parts (it jumps
+to the last separator that fits instead of concatenating part by part) and loses when
+every paragraph is about one chunk long, where the legacy str.split() loop is cheaper than
+the engine's per-chunk bookkeeping. Because of that last case recursive_chunk() keeps
+returning the legacy chunks; the engine backs recursive_chunk_spans(), sliding overlap and
+the streaming pipeline, where offsets are needed anyway. Measured speedup (legacy time / engine time, 1-100 MB,
+chunk size 1000, CPython 3.11):
+
+    default (paragraph every 5000 words)          1.1-1.2x
+    --paragraph-every 20                          1.1-1.2x
+    --paragraph-every 100                         0.5-0.6x  (legacy faster)
+    --line-break-rate 0                           1.2-1.5x
+    --paragraph-every 1000000000 --line-break-rate 0   1.8-2.0x
+
+Usage:
+    python Benchmark_chunk.py                      # 1, 10 and 100 MB
+    python Benchmark_chunk.py --sizes 1 5 --chunk-size 4000 --line-break-rate 0
+    python Benchmark_chunk.py --legacy-max-mb 10   # skip legacy above 10 MB
+"""
+import argparse
+import random
+import time
+
+from Recursive_chunk import recursive_chunk_legacy, recursive_chunk_spans
+
+WORDS = ["vector", "database", "shard", "tenant", "replica", "index", "query", "object",
+         "embedding", "schema", "cluster", "node", "batch", "filter", "hybrid", "cursor"]
+
+def generate_text(size_bytes, paragraph_every=5000, line_break_rate=0.01, seed=42):
+    """
+    Build ASCII text of `size_bytes` characters: words, sentences and line breaks,
+    with paragraph breaks every `paragraph_every` words.
+    """
+    rng = random.Random(seed)
+    pieces = []
+    length = 0
+    words_since_paragraph = 0
+    while length < size_bytes:
+        word = rng.choice(WORDS)
+        roll = rng.random()
+        if words_since_paragraph >= paragraph_every:
+            word += ".\n\n"
+            words_since_paragraph = 0
+        elif roll < line_break_rate:
+            word += "\n"
+        elif roll < line_break_rate + 0.08:
+            word += ". "
+        else:
+            word += " "
+        pieces.append(word)
+        length += len(word)
+        words_since_paragraph += 1
+    return "".join(pieces)[:size_bytes]
+
+def time_chunker(chunker, text, chunk_size, overlap, repeat=1):
+    # Best of `repeat` runs: single runs of a few tens of milliseconds are mostly noise
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chunks = chunker(text, chunk_size, overlap)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return chunks, best
+
+def engine_chunk(text, max_chunk_size, overlap):
+    return [chunk for _, _, chunk in recursive_chunk_spans(text, max_chunk_size, overlap)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recursive chunking implementations")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 10, 100], help="Input sizes in MB")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--overlap", type=int, default=200)
+    parser.add_argument("--paragraph-every", type=int, default=5000, help="Words between paragraph breaks")
+    parser.add_argument("--line-break-rate", type=float, default=0.01, help="Probability of a line break after a word")
+    parser.add_argument("--legacy-max-mb", type=float, default=100,
+                        help="Skip the legacy chunker above this size (it holds a copy of every part)")
+    parser.add_argument("--repeat", type=int, default=5, help="Report the best of this many runs")
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'chunks':>9} {'engine s':>9} {'MB/s':>8} {'legacy s':>9} {'MB/s':>8} {'speedup':>8} same")
+    for size_mb in args.sizes:
+        text = generate_text(int(size_mb * 1024 * 1024), args.paragraph_every, args.line_break_rate)
+
+        chunks, elapsed = time_chunker(engine_chunk, text, args.chunk_size, args.overlap, args.repeat)
+        row = f"{size_mb:>6g}MB {len(chunks):>9} {elapsed:>9.2f} {size_mb / elapsed:>8.1f}"
+
+        if size_mb <= args.legacy_max_mb:
+            legacy_chunks, legacy_elapsed = time_chunker(recursive_chunk_legacy, text, args.chunk_size, args.overlap,
+                                                         args.repeat)
+            same = "yes" if legacy_chunks == chunks else "NO"
+            row += f" {legacy_elapsed:>9.2f} {size_mb / legacy_elapsed:>8.1f} {legacy_elapsed / elapsed:>7.1f}x {same}"
+        else:
+            row += f" {'skipped':>9} {'-':>8} {'-':>8} -"
+        print(row)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+On-disk cache of extracted text and chunk spans, keyed by file content.
+
+Re-running the chunking pipeline over a folder of mostly unchanged documents should
+not pay for PDF parsing again. Each cache entry stores the extracted document text
+(zlib-compressed) plus the (segment, start, end) spans of its chunks, so cached chunks
+are sliced straight out of the stored text.
+
+Layout of <cache_dir>:
+    index.sqlite         entry sizes / last access time (LRU) and a stat() -> hash map
+    ab/abcdef....chunks  one file per entry: compressed text, int64 spans, fixed footer
+
+Keys combine the SHA-256 of the file content with the chunking parameters, so a
+changed file or a different max_chunk_size / overlap / window_size is simply a miss. Files whose
+size and mtime are unchanged are not even re-hashed.
+"""
+import codecs
+import hashlib
+import os
+import sqlite3
+import struct
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+# Bump when the chunker or the entry layout changes, so old entries stop matching
+# (2: documents are chunked whole by default; v1 entries hold windowed boundaries;
+#  3: sliding overlap counts the gap between chunks against `overlap`)
+CACHE_FORMAT_VERSION = 3
+
+_FOOTER = struct.Struct("<QQ8s")  # span count, compressed text length, magic
+_MAGIC = b"WVCHUNK1"
+_READ_SIZE = 1 << 16
+
+def file_digest(file_path):
+    """SHA-256 of the file content, read in blocks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class CacheEntryWriter:
+    """
+    Write one cache entry while the document is being extracted and chunked.
+
+    Wrap the segment stream with tee_segments(), call add_span() for every chunk
+    produced, then commit(). The entry is written to a temporary file and only moved
+    into place on commit(), so an interrupted run never leaves a truncated entry.
+    """
+
+    def __init__(self, entry_path):
+        self._entry_path = Path(entry_path)
+        self._entry_path.parent.mkdir(parents=True, exist_ok=True)
+        self._temp_path = self._entry_path.with_suffix(f".tmp{os.getpid()}")
+        self._file = open(self._temp_path, "wb")
+        self._compressor = zlib.compressobj(6)
+        self._compressed_length = 0
+        self._spans = []
+
+    def tee_segments(self, segments):
+        for segment in segments:
+            self._write(self._compressor.compress(segment.encode("utf-8", "surrogatepass")))
+            yield segment
+
+    def add_span(self, segment, start, end):
+        self._spans.append((segment, start, end))
+
+    def _write(self, data):
+        self._file.write(data)
+        self._compressed_length += len(data)
+
+    def commit(self):
+        self._write(self._compressor.flush())
+        spans = np.asarray(self._spans, dtype="<i8").reshape(-1, 3)
+        self._file.write(spans.tobytes())
+        self._file.write(_FOOTER.pack(len(spans), self._compressed_length, _MAGIC))
+        self._file.close()
+        os.replace(self._temp_path, self._entry_path)
+
+    def discard(self):
+        self._file.close()
+        self._temp_path.unlink(missing_ok=True)
+
+def iter_cache_entry(entry_path):
+    """
+    Yield (segment, start, end, chunk) for every chunk stored in a cache entry.
+
+    The text is decompressed incrementally and trimmed behind the current chunk, so
+    reading a hit needs about one chunk of memory, not the whole document.
+    """
+    with open(entry_path, "rb") as file:
+        file.seek(-_FOOTER.size, os.SEEK_END)
+        count, compressed_length, magic = _FOOTER.unpack(file.read(_FOOTER.size))
+        if magic != _MAGIC:
+            raise ValueError(f"Not a chunk cache entry: {entry_path}")
+        file.seek(compressed_length)
+        spans = np.frombuffer(file.read(count * 24), dtype="<i8").reshape(-1, 3).tolist()
+
+        file.seek(0)
+        remaining = compressed_length
+        decompressor = zlib.decompressobj()
+        decoder = codecs.getincrementaldecoder("utf-8")("surrogatepass")
+        buffer, buffer_start = "", 0
+        for segment, start, end in spans:
+            while buffer_start + len(buffer) < end and remaining:
+                data = file.read(min(_READ_SIZE, remaining))
+                remaining -= len(data)
+                buffer += decoder.decode(decompressor.decompress(data), final=not remaining)
+            yield segment, start, end, buffer[start - buffer_start:end - buffer_start]
+            # Chunk starts never move backwards, so everything before this one is done
+            buffer, buffer_start = buffer[start - buffer_start:], start
+
+def check_cache_entry(entry_path):
+    """
+    Read a cache entry through once and raise if it is damaged.
+
+    zlib only verifies its checksum at the end of the stream, so iter_cache_entry()
+    would otherwise yield chunks of a corrupt entry before failing. Checking first
+    costs one decompression pass, far less than extracting the document again.
+    """
+    with open(entry_path, "rb") as file:
+        file.seek(-_FOOTER.size, os.SEEK_END)
+        count, compressed_length, magic = _FOOTER.unpack(file.read(_FOOTER.size))
+        if magic != _MAGIC:
+            raise ValueError(f"Not a chunk cache entry: {entry_path}")
+        file.seek(compressed_length)
+        spans = np.frombuffer(file.read(count * 24), dtype="<i8").reshape(-1, 3)
+
+        file.seek(0)
+        remaining = compressed_length
+        decompressor = zlib.decompressobj()
+        decoder = codecs.getincrementaldecoder("utf-8")("surrogatepass")
+        length = 0
+        while remaining:
+            data = file.read(min(_READ_SIZE, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            length += len(decoder.decode(decompressor.decompress(data), final=not remaining))
+        if remaining or not decompressor.eof:
+            raise ValueError(f"Truncated chunk cache entry: {entry_path}")
+        if count and int(spans[:, 2].max()) > length:
+            raise ValueError(f"Chunk spans past the end of the text: {entry_path}")
+
+class ChunkCache:
+    """
+    Content-addressed chunk cache with size-based LRU eviction and hit/miss counters.
+
+    Only the process that owns the ChunkCache touches the SQLite index; pool workers
+    just write entry files (see entry_path()) which the owner then register()s.
+    """
+
+    def __init__(self, cache_dir, max_bytes=10 * 1024 ** 3):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._db = sqlite3.connect(self.cache_dir / "index.sqlite")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, size INTEGER, last_access REAL);
+            CREATE INDEX IF NOT EXISTS entries_by_access ON entries (last_access);
+            CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, digest TEXT);
+            """
+        )
+
+    def key(self, file_path, max_chunk_size, overlap, sliding_overlap=False, window_size=None):
+        """
+        Cache key for a file and chunking parameters.
+
+        The content hash is reused from the index while the file's size and mtime are
+        unchanged, so unchanged files cost one stat() instead of a full read.
+        """
+        file_path = Path(file_path).resolve()
+        stat = file_path.stat()
+        row = self._db.execute(
+            "SELECT size, mtime_ns, digest FROM files WHERE path = ?", (str(file_path),)
+        ).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            digest = row[2]
+        else:
+            digest = file_digest(file_path)
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                    (str(file_path), stat.st_size, stat.st_mtime_ns, digest),
+                )
+        params = f"v{CACHE_FORMAT_VERSION}-{max_chunk_size}-{overlap}-{int(bool(sliding_overlap))}"
+        if window_size:
+            params += f"-w{window_size}"
+        return f"{digest}-{params}"
+
+    def entry_path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.chunks"
+
+    def lookup(self, key):
+        """
+        Return the entry path for a key and count a hit, or count a miss and return None.
+        """
+        path = self.entry_path(key)
+        row = self._db.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone()
+        if row and path.exists():
+            with self._db:
+                self._db.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+            return path
+        self.misses += 1
+        return None
+
+    def register(self, key):
+        """Record a freshly written entry and evict least recently used ones if over budget."""
+        size = self.entry_path(key).stat().st_size
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?)", (key, size, time.time()))
+        self.evict()
+
+    def invalidate(self, key):
+        """Drop an entry lookup() returned but that could not be read; the hit becomes a miss."""
+        self.hits -= 1
+        self.misses += 1
+        self.entry_path(key).unlink(missing_ok=True)
+        with self._db:
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            self.entry_path(key).unlink(missing_ok=True)
+            with self._db:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def stats(self):
+        entries, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": total,
+        }
+
+    def close(self):
+        self._db.close()
@@ -1,28 +1,80 @@
+import hashlib
 import os
+import numpy as np
 import PyPDF2
+from bisect import bisect_left, bisect_right
+from collections import deque, namedtuple
+from itertools import accumulate
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import random
+import re
 from docx import Document
+from weaviate.classes.query import Filter
+from weaviate.util import generate_uuid5
 
-def extract_text_from_pdf(file_path):
-    text = ""
+from Chunk_cache import CacheEntryWriter, check_cache_entry, iter_cache_entry
+
+SUPPORTED_EXTENSIONS = {'.pdf', '.docx', '.txt'}
+
+# Separators in priority order
+SEPARATORS = ["\n\n", "\n", ". ", " "]
+# Matches "\n\n" left to right without overlaps, exactly where str.split("\n\n") splits
+PARAGRAPH_BREAK = re.compile("\n\n")
+
+# One chunk produced by the streaming pipeline. `segment` is the page (PDF),
+# paragraph (DOCX) or line (TXT) index, counted from 0, where the chunk starts;
+# `start`/`end` are character offsets of the chunk in the extracted document text.
+ChunkRecord = namedtuple("ChunkRecord", ["source_path", "segment", "chunk", "start", "end"])
+
+# Outcome of chunking one file in parallel mode: its records, or the error that stopped it
+FileResult = namedtuple("FileResult", ["source_path", "records", "error"])
+
+def iter_pdf_pages(file_path):
     with open(file_path, 'rb') as file:
         pdf_reader = PyPDF2.PdfReader(file)
         for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-    return text
+            yield page.extract_text() + "\n"
 
-def extract_text_from_docx(file_path):
+def iter_docx_paragraphs(file_path):
     doc = Document(file_path)
-    text = ""
     for paragraph in doc.paragraphs:
-        text += paragraph.text + "\n"
-    return text
+        yield paragraph.text + "\n"
+
+def iter_txt_lines(file_path):
+    with open(file_path, 'r', encoding='utf-8') as file:
+        yield from file
+
+def extract_text_from_pdf(file_path):
+    # Join once instead of `text += ...` per page, which is quadratic on large PDFs
+    return "".join(iter_pdf_pages(file_path))
+
+def extract_text_from_docx(file_path):
+    return "".join(iter_docx_paragraphs(file_path))
 
 def extract_text_from_txt(file_path):
     with open(file_path, 'r', encoding='utf-8') as file:
         return file.read()
 
+def iter_text_segments(file_path):
+    """
+    Yield the text of a file one page / paragraph / line at a time.
+
+    Joining the segments gives exactly the text returned by extract_text_from_file().
+    """
+    file_path = Path(file_path)
+    extension = file_path.suffix.lower()
+
+    if extension == '.pdf':
+        return iter_pdf_pages(file_path)
+    elif extension == '.docx':
+        return iter_docx_paragraphs(file_path)
+    elif extension == '.txt':
+        return iter_txt_lines(file_path)
+    else:
+        print(f"Unsupported file type: {extension}")
+        return iter(())
+
 def extract_text_from_file(file_path):
     file_path = Path(file_path)
     extension = file_path.suffix.lower()
@@ -37,15 +89,17 @@ def extract_text_from_file(file_path):
         print(f"Unsupported file type: {extension}")
         return ""
 
-def recursive_chunk(text, max_chunk_size=1000, overlap=200):
+def recursive_chunk_legacy(text, max_chunk_size=1000, overlap=200):
+    # Original string-splitting implementation and the reference for chunk boundaries
+    # (see Benchmark_chunk.py). Copies every part and chunk, yet stays the fastest way to
+    # get plain chunk strings when paragraphs are about one chunk long, so recursive_chunk()
+    # still uses it; iter_chunk_spans() returns the same chunks as offsets.
     # Base case: if text is small enough, return as single chunk
     if len(text) <= max_chunk_size:
         return [text.strip()] if text.strip() else []
     
-    # Define separators in priority order
-    separators = ["\n\n", "\n", ". ", " "]
-    
-    for separator in separators:
+    # Try separators in priority order
+    for separator in SEPARATORS:
         if separator in text:
             parts = text.split(separator)
             chunks = []
@@ -64,7 +118,7 @@ def recursive_chunk(text, max_chunk_size=1000, overlap=200):
                     
                     # If this part is still too large, recursively split it
                     if len(part) > max_chunk_size:
-                        sub_chunks = recursive_chunk(part, max_chunk_size, overlap)
+                        sub_chunks = recursive_chunk_legacy(part, max_chunk_size, overlap)
                         chunks.extend(sub_chunks)
                         current_chunk = ""
                     else:
@@ -88,28 +142,617 @@ def recursive_chunk(text, max_chunk_size=1000, overlap=200):
     
     return chunks
 
-def process_documents(folder_path, chunk_size=1000, overlap=200):
+def _strip_span(text, start, end):
+    # Same as text[start:end].strip(), without building the substring
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+def iter_chunk_spans(text, max_chunk_size=1000, overlap=200, start=0, end=None):
+    """
+    Yield (start, end) offsets of the chunks recursive_chunk_legacy() would produce
+    for text[start:end].
+
+    Works on offsets into the original string: separators are found with str.find() /
+    str.rfind() (or, for "\n\n" inside runs of three or more newlines, from one regex
+    pass) in a single forward pass per level, and a chunk jumps straight to the last
+    separator that fits instead of visiting each part, so no substring is copied. The
+    legacy version splits into copies and re-concatenates the growing chunk for every part.
+    """
+    end = len(text) if end is None else end
+
+    # Base case: if text is small enough, return as single chunk
+    if end - start <= max_chunk_size:
+        start, end = _strip_span(text, start, end)
+        if start < end:
+            yield start, end
+        return
+
+    for separator in SEPARATORS:
+        if text.find(separator, start, end) == -1:
+            continue
+
+        step = len(separator)
+        if separator == "\n\n" and text.find("\n\n\n", start, end) != -1:
+            # "\n\n" overlaps itself inside runs of newlines, so str.rfind() could land between
+            # two of str.split()'s occurrences; collect split's own (non-overlapping) ones once
+            breaks = [match.start() for match in PARAGRAPH_BREAK.finditer(text, start, end)]
+
+            def next_separator(position):
+                index = bisect_left(breaks, position)
+                return breaks[index] if index < len(breaks) else -1
+
+            def last_separator(low, high):
+                index = bisect_right(breaks, high - step) - 1
+                return breaks[index] if index >= 0 and breaks[index] >= low else -1
+        else:
+            def next_separator(position):
+                return text.find(separator, position, end)
+
+            def last_separator(low, high):
+                return text.rfind(separator, low, high)
+
+        chunk_start = None      # None while the current chunk is still empty
+        chunk_end = start
+        # The part after the current chunk: [part_start, part_end), part_end == -1 at the end
+        part_start = start
+        part_end = next_separator(start)
+        while True:
+            if chunk_start is None:
+                if part_end == -1:
+                    part_end = end
+
+                # If this part is too large on its own, recursively split it
+                if part_end - part_start > max_chunk_size:
+                    yield from iter_chunk_spans(text, max_chunk_size, overlap, part_start, part_end)
+                elif part_end > part_start:
+                    chunk_start, chunk_end = part_start, part_end
+
+                if part_end == end:
+                    break
+                part_start = part_end + step
+                part_end = next_separator(part_start)
+                continue
+
+            limit = chunk_start + max_chunk_size
+            if end <= limit:
+                chunk_end = end
+                break
+
+            if (end if part_end == -1 else part_end) > limit:
+                # The next part alone overflows: the chunk ends here and that part,
+                # already located, starts the next one
+                last = chunk_end
+            else:
+                # Parts are contiguous, so the chunk can grow until `limit`: jump straight
+                # to the last separator that still fits instead of visiting each part
+                following = next_separator(limit + 1)
+                last = last_separator(part_end, end if following == -1 else following)
+                part_start, part_end = last + step, following
+
+            # Save the current chunk; the part after `last` starts a new one
+            span = _strip_span(text, chunk_start, last)
+            if span[0] < span[1]:
+                yield span
+            chunk_start = None
+
+        if chunk_start is not None:
+            span = _strip_span(text, chunk_start, chunk_end)
+            if span[0] < span[1]:
+                yield span
+        return
+
+    # If no separators found, split by character count as fallback
+    position = start
+    while position < end:
+        span = _strip_span(text, position, min(position + max_chunk_size, end))
+        if span[0] < span[1]:
+            yield span
+        position = max(position + 1, position + max_chunk_size - overlap)
+
+# Code points str.isspace() / str.strip() treat as whitespace
+WHITESPACE_CODES = np.array([code for code in range(0x3000 + 1) if chr(code).isspace()], dtype=np.uint32)
+
+def _separator_offsets(codes, offset):
+    """
+    Yield, for each separator in priority order, a sorted array with the offsets right
+    after every occurrence of that separator.
+
+    `codes` are the UTF-32 code points of text[offset:...], so positions are character
+    offsets and separators are located with vectorized comparisons, not string scans.
+    """
+    newline = codes == ord("\n")
+    yield np.flatnonzero(newline[:-1] & newline[1:]) + (offset + 2)
+    yield np.flatnonzero(newline) + (offset + 1)
+    yield np.flatnonzero((codes[:-1] == ord(".")) & (codes[1:] == ord(" "))) + (offset + 2)
+    yield np.flatnonzero(codes == ord(" ")) + (offset + 1)
+
+def add_sliding_overlap(text, spans, overlap, previous=None):
+    """
+    Extend each chunk backwards by at most `overlap` characters, so it repeats the end of
+    the chunk before it.
+
+    The new start is the earliest separator boundary inside that overlap window,
+    preferring paragraph, then line, sentence and word breaks; all chunks are resolved
+    together with np.searchsorted() over precomputed separator offsets. Chunks whose
+    window contains no usable separator get a plain character overlap. The window is
+    measured from the chunk's own start, so the whitespace between two chunks counts
+    against `overlap`; with chunk ends unchanged, a chunk is at most
+    max_chunk_size + overlap characters long.
+
+    Args:
+        text: The text the spans point into
+        spans: Non-overlapping (start, end) spans in document order
+        overlap: Maximum number of characters to add in front of each chunk
+        previous: (start, end) of the chunk preceding spans[0], if any
+
+    Returns:
+        list: (start, end) spans with the overlap applied
+    """
+    if not spans or overlap <= 0:
+        return list(spans)
+
+    bounds = np.asarray(spans, dtype=np.int64)
+    starts, ends = bounds[:, 0], bounds[:, 1]
+    previous_starts = np.empty_like(starts)
+    previous_ends = np.empty_like(ends)
+    previous_starts[1:], previous_ends[1:] = starts[:-1], ends[:-1]
+    previous_starts[0], previous_ends[0] = previous if previous else (starts[0], starts[0])
+
+    # Never add more than `overlap` characters, nor reach back past the previous chunk
+    targets = np.clip(starts - overlap, previous_starts, starts)
+    new_starts = starts.copy()
+    pending = np.flatnonzero(targets < starts)
+    if not pending.size:
+        return [tuple(span) for span in bounds.tolist()]
+
+    # Start two characters early so separators ending right at a target are seen
+    low = max(int(targets[pending].min()) - 2, 0)
+    codes = np.frombuffer(text[low:int(starts.max())].encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+
+    # A boundary only adds overlap if some non-whitespace follows it before the chunk start
+    content = np.flatnonzero(~np.isin(codes, WHITESPACE_CODES)) + low
+    if not content.size:
+        # Only whitespace before every chunk, within reach
+        return [tuple(span) for span in bounds.tolist()]
+    last_content = np.searchsorted(content, starts[pending]) - 1
+    limits = np.where(last_content >= 0, content[np.maximum(last_content, 0)] + 1, low)
+    keep = limits > targets[pending]
+    pending, limits = pending[keep], limits[keep]
+
+    for offsets in _separator_offsets(codes, low):
+        if not pending.size:
+            break
+        if not offsets.size:
+            continue
+        index = np.searchsorted(offsets, targets[pending])
+        candidates = offsets[np.minimum(index, offsets.size - 1)]
+        hit = (index < offsets.size) & (candidates < limits)
+        new_starts[pending[hit]] = candidates[hit]
+        pending, limits = pending[~hit], limits[~hit]
+    new_starts[pending] = targets[pending]
+
+    return [_strip_span(text, start, end) for start, end in zip(new_starts.tolist(), ends.tolist())]
+
+def recursive_chunk_spans(text, max_chunk_size=1000, overlap=200, sliding_overlap=False):
+    """
+    Chunk text and return (start, end, chunk) tuples, with text[start:end] == chunk.
+
+    With sliding_overlap=True every chunk also starts up to `overlap` characters earlier,
+    repeating the end of the previous one (see add_sliding_overlap()); the underlying
+    boundaries are the same.
+    """
+    spans = list(iter_chunk_spans(text, max_chunk_size, overlap))
+    if sliding_overlap:
+        spans = add_sliding_overlap(text, spans, overlap)
+    return [(start, end, text[start:end]) for start, end in spans]
+
+def recursive_chunk(text, max_chunk_size=1000, overlap=200, sliding_overlap=False):
+    # The offset engine is not faster on every input shape (see Benchmark_chunk.py), so
+    # plain chunks still come from the legacy splitter; sliding overlap needs offsets
+    if sliding_overlap:
+        return [chunk for _, _, chunk in recursive_chunk_spans(text, max_chunk_size, overlap, sliding_overlap)]
+    return recursive_chunk_legacy(text, max_chunk_size, overlap)
+
+def _window_cut(text, begin, max_chunk_size):
+    # Cut the window right after the last high-priority separator in its second half,
+    # so the carried-over tail starts where recursive_chunk() would most likely split
+    for separator in SEPARATORS:
+        position = text.rfind(separator, (begin + len(text)) // 2)
+        if position != -1:
+            return position + len(separator)
+    return max(len(text) - max_chunk_size, begin)
+
+def iter_chunks_from_segments(segments, max_chunk_size=1000, overlap=200, window_size=None,
+                              sliding_overlap=False):
+    """
+    Chunk a stream of text segments (pages, paragraphs, lines).
+
+    With window_size=None (the default) the segments are joined and chunked as one text,
+    so the chunks are exactly those of recursive_chunk() on the whole document.
+
+    With a window_size (opt-in, e.g. max_chunk_size * 8 for very large files) the whole
+    document is never held in memory: segments are buffered until roughly `window_size`
+    characters are pending, the buffer is cut after its last paragraph (or line, sentence,
+    word) break, the head is chunked and emitted and the tail is carried into the next
+    window. Chunk boundaries then differ from recursive_chunk() around the window cuts
+    (a chunk may end early, and later boundaries shift), so do not switch an existing
+    collection between the two modes. With sliding_overlap=True the last chunk of a
+    window is kept as context, so the overlap carries across window cuts.
+
+    Yields:
+        (segment_index, start, end, chunk) tuples: the segment the chunk starts in and
+        the chunk's character offsets in the whole document text
+    """
+    if window_size is None:
+        segments = list(segments)
+        segment_starts = list(accumulate((len(segment) for segment in segments), initial=0))[:-1]
+        text = "".join(segments)
+        del segments
+        for start, end, chunk in recursive_chunk_spans(text, max_chunk_size, overlap, sliding_overlap):
+            yield bisect_right(segment_starts, start) - 1, start, end, chunk
+        return
+
+    carry = ""              # tail of the previous window (plus overlap context)
+    carry_start = 0         # absolute character offset of carry[0]
+    chunked_until = 0       # absolute offset up to which text has been chunked
+    last_chunk = None       # absolute (start, end) of the last emitted chunk
+    pending = []
+    pending_length = 0
+    segment_starts = []     # absolute start offsets of the segments still buffered
+    segment_ids = []
+    position = 0
+
+    def chunk_window(final):
+        nonlocal carry, carry_start, chunked_until, last_chunk, pending, pending_length
+        nonlocal segment_starts, segment_ids
+        text = carry + "".join(pending)
+        begin = chunked_until - carry_start
+        cut = len(text) if final else _window_cut(text, begin, max_chunk_size)
+
+        spans = list(iter_chunk_spans(text, max_chunk_size, overlap, begin, cut))
+        if sliding_overlap:
+            previous = None
+            if last_chunk and last_chunk[0] >= carry_start:
+                previous = (last_chunk[0] - carry_start, last_chunk[1] - carry_start)
+            spans = add_sliding_overlap(text, spans, overlap, previous)
+
+        for start, end in spans:
+            index = bisect_right(segment_starts, carry_start + start) - 1
+            yield segment_ids[index], carry_start + start, carry_start + end, text[start:end]
+
+        if spans:
+            last_chunk = (carry_start + spans[-1][0], carry_start + spans[-1][1])
+        keep_from = cut
+        if sliding_overlap and last_chunk:
+            keep_from = min(cut, max(last_chunk[0] - carry_start, 0))
+
+        chunked_until = carry_start + cut
+        carry = text[keep_from:]
+        carry_start += keep_from
+        pending, pending_length = [], 0
+        keep = max(bisect_right(segment_starts, carry_start) - 1, 0)
+        segment_starts, segment_ids = segment_starts[keep:], segment_ids[keep:]
+
+    for index, segment in enumerate(segments):
+        segment_starts.append(position)
+        segment_ids.append(index)
+        position += len(segment)
+        pending.append(segment)
+        pending_length += len(segment)
+        if pending_length >= window_size:
+            yield from chunk_window(final=False)
+
+    if segment_starts:
+        yield from chunk_window(final=True)
+
+def iter_supported_files(folder_path, recursive=True):
+    """
+    Return the supported files under folder_path, sorted so every run (and every
+    worker count) processes them in the same order.
+    """
+    folder_path = Path(folder_path)
+    paths = folder_path.rglob("*") if recursive else folder_path.iterdir()
+    return sorted(path for path in paths if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS)
+
+def iter_file_chunks(file_path, chunk_size=1000, overlap=200, sliding_overlap=False, cache_entry=None,
+                     window_size=None):
+    """
+    Yield the ChunkRecords of one file. When `cache_entry` is given, the extracted
+    text and chunk spans are also written there as a Chunk_cache entry.
+    See iter_chunks_from_segments() for `window_size`.
+    """
+    segments = iter_text_segments(file_path)
+    writer = None
+    if cache_entry is not None:
+        writer = CacheEntryWriter(cache_entry)
+        segments = writer.tee_segments(segments)
+
+    try:
+        chunks = iter_chunks_from_segments(segments, chunk_size, overlap, window_size, sliding_overlap)
+        for segment, start, end, chunk in chunks:
+            if writer:
+                writer.add_span(segment, start, end)
+            yield ChunkRecord(file_path, segment, chunk, start, end)
+    except BaseException:
+        if writer:
+            writer.discard()
+        raise
+    if writer:
+        writer.commit()
+
+def iter_cached_chunks(file_path, cache_entry):
+    for segment, start, end, chunk in iter_cache_entry(cache_entry):
+        yield ChunkRecord(file_path, segment, chunk, start, end)
+
+def _chunk_files(jobs, chunk_size, overlap, sliding_overlap, window_size=None):
+    # Runs in a pool worker: extract and chunk a group of files, never raising
+    results = []
+    for file_path, cache_entry in jobs:
+        try:
+            records = list(iter_file_chunks(file_path, chunk_size, overlap, sliding_overlap, cache_entry,
+                                            window_size))
+            results.append(FileResult(file_path, records, None))
+        except Exception as e:
+            results.append(FileResult(file_path, [], f"{type(e).__name__}: {e}"))
+    return results
+
+def iter_file_results_parallel(file_paths, chunk_size=1000, overlap=200, sliding_overlap=False,
+                               max_workers=None, chunksize=1, cache_entries=None, window_size=None):
+    """
+    Extract and chunk files in a ProcessPoolExecutor, yielding a FileResult per file.
+
+    PDF parsing is CPU-bound and holds the GIL, so processes (not threads) are needed to
+    use more than one core. Files are sent to workers in groups of `chunksize`; only
+    about two groups per worker are in flight, so memory stays bounded on large folders.
+    Results come back in the order of `file_paths` regardless of which worker finishes first.
+    Workers write cache entries themselves when `cache_entries` (one path per file) is given.
+    """
+    file_paths = list(file_paths)
+    jobs = list(zip(file_paths, cache_entries or [None] * len(file_paths)))
+    groups = [jobs[i:i + chunksize] for i in range(0, len(jobs), chunksize)]
+
+    max_workers = max_workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        max_in_flight = max_workers * 2
+        in_flight = deque()
+        for group in groups:
+            in_flight.append(executor.submit(_chunk_files, group, chunk_size, overlap, sliding_overlap,
+                                             window_size))
+            if len(in_flight) >= max_in_flight:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+def iter_document_chunks(folder_path, chunk_size=1000, overlap=200, sliding_overlap=False,
+                         max_workers=1, chunksize=1, recursive=True, failures=None, cache=None,
+                         window_size=None):
+    """
+    Lazily yield a ChunkRecord for every chunk of every supported file under the folder.
+
+    With max_workers=1 files are streamed one at a time and records are not accumulated
+    across files, so the caller controls memory: consume the records one by one (e.g.
+    straight into a Weaviate batch with import_chunks()). With max_workers > 1 (or None
+    for all cores) extraction runs in a process pool and each file's records are
+    returned whole.
+
+    Each document is chunked as a whole, with the same boundaries as recursive_chunk().
+    Pass `window_size` to stream very large files in windows instead (bounded memory,
+    different boundaries; see iter_chunks_from_segments()).
+
+    Either way, a file that fails to extract is reported and skipped instead of
+    aborting the run; pass a list as `failures` to collect (file_path, error) pairs.
+
+    Pass a Chunk_cache.ChunkCache as `cache` to serve unchanged files from disk instead
+    of extracting them again; only misses are extracted (and then cached). An entry that
+    fails its read-through check is dropped and its file extracted again.
+    """
+    file_paths = iter_supported_files(folder_path, recursive)
+
+    def report_failure(file_path, error):
+        print(f"Failed to process {file_path}: {error}")
+        if failures is not None:
+            failures.append((file_path, error))
+
+    # (file_path, cache key, cached entry path or None) for every file, in order
+    plan = []
+    for file_path in file_paths:
+        key = cached = None
+        if cache is not None:
+            try:
+                key = cache.key(file_path, chunk_size, overlap, sliding_overlap, window_size)
+                cached = cache.lookup(key)
+            except OSError as e:
+                print(f"Cache unavailable for {file_path}: {e}")
+        plan.append((file_path, key, cached))
+
+    misses = [(file_path, key) for file_path, key, cached in plan if cached is None]
+    if max_workers != 1:
+        entries = [cache.entry_path(key) if key else None for _, key in misses]
+        results = iter_file_results_parallel(
+            [file_path for file_path, _ in misses], chunk_size, overlap, sliding_overlap,
+            max_workers, chunksize, entries, window_size,
+        )
+
+    for file_path, key, cached in plan:
+        print(f"Processing: {file_path}{' (cached)' if cached else ''}")
+        try:
+            if cached:
+                # Check the whole entry before yielding from it, so a damaged one is
+                # dropped and re-extracted instead of failing after partial output
+                try:
+                    check_cache_entry(cached)
+                except Exception as e:
+                    print(f"Unreadable cache entry for {file_path}, extracting again: {type(e).__name__}: {e}")
+                    cache.invalidate(key)
+                    yield from iter_file_chunks(file_path, chunk_size, overlap, sliding_overlap,
+                                                cache.entry_path(key), window_size)
+                    cache.register(key)
+                    continue
+                yield from iter_cached_chunks(file_path, cached)
+                continue
+            if max_workers == 1:
+                entry = cache.entry_path(key) if key else None
+                yield from iter_file_chunks(file_path, chunk_size, overlap, sliding_overlap, entry, window_size)
+            else:
+                result = next(results)
+                if result.error:
+                    report_failure(file_path, result.error)
+                    continue
+                yield from result.records
+            if key:
+                cache.register(key)
+        except Exception as e:
+            report_failure(file_path, f"{type(e).__name__}: {e}")
+
+def process_documents(folder_path, chunk_size=1000, overlap=200, sliding_overlap=False, max_workers=1, cache=None,
+                      window_size=None):
+    # Materialized variant, kept for small folders and quick inspection
+    failures = []
+    records = iter_document_chunks(folder_path, chunk_size, overlap, sliding_overlap, max_workers,
+                                   failures=failures, cache=cache, window_size=window_size)
+    chunks = [record.chunk for record in records]
+    if failures:
+        print(f"{len(failures)} file(s) could not be processed")
+    if cache is not None:
+        print(f"Chunk cache: {cache.stats()}")
+    return chunks
+
+def chunk_uuid(record, root):
+    """
+    Deterministic UUID of a chunk: the same file, span and content always map to the
+    same object, so re-imports update nothing that has not changed.
+
+    The source path is taken relative to `root` (the ingested folder) so IDs stay
+    stable when the folder is moved or mounted elsewhere. import_chunks() and
+    sync_documents() both pass the folder, so either one recognizes the other's objects.
+    """
+    source_path = Path(record.source_path).relative_to(root)
+    content_hash = hashlib.sha256(record.chunk.encode("utf-8", "surrogatepass")).hexdigest()
+    return generate_uuid5(f"{source_path.as_posix()}:{record.start}:{record.end}:{content_hash}")
+
+def _chunk_properties(record):
+    return {
+        "text": record.chunk,
+        "source_path": str(record.source_path),
+        "segment": record.segment,
+        "start": record.start,
+        "end": record.end,
+    }
+
+def import_chunks(collection, records, root, batch_size=200, concurrent_requests=2):
+    """
+    Stream chunk records into a Weaviate collection through a fixed_size batch.
+
+    `root` is the folder the records were read from (as passed to iter_document_chunks()).
+
+    Because `records` is consumed lazily, extraction and chunking of the next documents
+    overlap with the batch's background requests instead of running before the import.
+    Objects get deterministic IDs (see chunk_uuid()), so importing the same chunk twice
+    overwrites it instead of creating a duplicate.
+
+    Returns:
+        int: Number of chunks handed to the batch
+    """
+    count = 0
+    with collection.batch.fixed_size(batch_size=batch_size, concurrent_requests=concurrent_requests) as batch:
+        for record in records:
+            batch.add_object(properties=_chunk_properties(record), uuid=chunk_uuid(record, root))
+            count += 1
+
+    failed_objects = collection.batch.failed_objects
+    if failed_objects:
+        print(f"Number of failed objects: {len(failed_objects)}")
+        for i, failed_obj in enumerate(failed_objects[:5], 1):
+            print(f"Failed object {i}: {failed_obj.message}")
+    else:
+        print(f"All {count} chunks were successfully added.")
+    return count
+
+def sync_documents(collection, folder_path, chunk_size=1000, overlap=200, sliding_overlap=False,
+                   max_workers=1, cache=None, batch_size=200, concurrent_requests=2,
+                   delete_stale=True, dry_run=False, window_size=None):
+    """
+    Incrementally sync a folder into a collection that mirrors it.
+
+    Reads the IDs already in the collection, then only inserts chunks whose
+    deterministic ID is new and deletes objects no longer produced by any file.
+    Unchanged chunks are left alone, so they are not sent to the vectorizer again.
+    Objects belonging to files that failed to extract in this run are never deleted.
+
+    Returns:
+        dict: inserted / unchanged / deleted counts and the number of failed files
+    """
     folder_path = Path(folder_path)
-    all_chunks = []
-    supported_extensions = {'.pdf', '.docx', '.txt'}
-    
-    for file_path in folder_path.iterdir():
-        if file_path.is_file() and file_path.suffix.lower() in supported_extensions:
-            print(f"Processing: {file_path.name}")
-            text = extract_text_from_file(file_path)
-            if text:
-                chunks = recursive_chunk(text, chunk_size, overlap)
-                all_chunks.extend(chunks)
-    
-    return all_chunks
+    existing = {
+        str(obj.uuid): obj.properties.get("source_path")
+        for obj in collection.iterator(return_properties=["source_path"])
+    }
+    print(f"{len(existing)} chunks already in '{collection.name}'")
+
+    failures = []
+    seen = set()
+    unchanged = 0
+
+    def new_records():
+        nonlocal unchanged
+        records = iter_document_chunks(folder_path, chunk_size, overlap, sliding_overlap, max_workers,
+                                       failures=failures, cache=cache, window_size=window_size)
+        for record in records:
+            object_id = chunk_uuid(record, folder_path)
+            seen.add(object_id)
+            if object_id in existing:
+                unchanged += 1
+            else:
+                yield record
+
+    if dry_run:
+        inserted = sum(1 for _ in new_records())
+    else:
+        inserted = import_chunks(collection, new_records(), folder_path, batch_size, concurrent_requests)
+
+    failed_sources = {str(file_path) for file_path, _ in failures}
+    stale = [object_id for object_id, source in existing.items()
+             if object_id not in seen and source not in failed_sources]
+    if delete_stale and not dry_run:
+        # Filter.by_id().contains_any() keeps each request well under the server's query limit
+        for i in range(0, len(stale), 5000):
+            collection.data.delete_many(where=Filter.by_id().contains_any(stale[i:i + 5000]))
+
+    summary = {
+        "inserted": inserted,
+        "unchanged": unchanged,
+        "deleted": len(stale) if delete_stale else 0,
+        "failed_files": len(failures),
+    }
+    print(f"Sync{' (dry run)' if dry_run else ''} of '{folder_path}': {summary}")
+    return summary
+
+if __name__ == "__main__":
+    # max_workers=None uses every core for extraction and chunking; the cache makes
+    # re-runs skip files whose content has not changed since the last run
+    from Chunk_cache import ChunkCache
+    cache = ChunkCache(os.path.expanduser("~/.cache/weaviate_chunks"))
+    chunks = process_documents("/Users/mohamedshahin/Documents/", max_workers=None, cache=cache)
 
-chunks = process_documents("/Users/mohamedshahin/Documents/")
+    print(f"Number of chunks: {len(chunks)}")
 
-print(f"Number of chunks: {len(chunks)}")
+    if len(chunks) >= 5:
+        sample_chunks = random.sample(chunks, 5)
+        for i, chunk in enumerate(sample_chunks, 1):
+            print(f"\nChunk {i}:")
+            print("-" * 50)
+            print(chunk)
 
-if len(chunks) >= 5:
-    sample_chunks = random.sample(chunks, 5)
-    for i, chunk in enumerate(sample_chunks, 1):
-        print(f"\nChunk {i}:")
-        print("-" * 50)
-        print(chunk)
+    # Streaming import: chunks are produced while the batch sends them to Weaviate
+    # import weaviate
+    # client = weaviate.connect_to_weaviate_cloud(...)
+    # collection = client.collections.use("DocumentChunks")
+    # folder = "/Users/mohamedshahin/Documents/"
+    # import_chunks(collection, iter_document_chunks(folder), folder)
+    #
+    # Nightly re-runs: only new chunks are inserted and stale ones deleted
+    # sync_documents(collection, folder, cache=cache, max_workers=None)
+    # client.close()
@@ -0,0 +1,487 @@
+"""
+Weaviate Client Instrumentation
+===============================
+
+Optional wrapper around the (sync or async) Weaviate client handed out by
+WeaviateConnectionManager. It intercepts collection operations and passes every call
+through a chain of interceptors:
+
+- ClientMetrics: latency histograms, payload sizes (objects sent / returned), error
+  counts and call counts per operation (query.hybrid, query.near_vector, batch,
+  aggregate.over_all, ...), transport (grpc / rest), collection and tenant; exported
+  as Prometheus text.
+- OpenTelemetryTracer: one span per operation with the same attributes (requires
+  opentelemetry-api).
+
+Interceptors implement before(call) / after(call, result, error, elapsed). before()
+may return a value other than MISS to answer the call without hitting the cluster,
+which is how result caches plug into the same chain.
+
+OVERHEAD:
+When instrumentation is disabled the manager hands out the raw client, so there is no
+cost at all. When enabled, each operation costs one small Call object, two
+perf_counter() calls and a dict update per interceptor (a few microseconds), which is
+negligible next to a network round trip. batch.add_object() is not timed per object;
+a batch is one "batch" operation measured from entering to leaving its (async) context.
+
+ASYNC CLIENT:
+WeaviateAsyncClient methods are plain functions returning awaitables, so the client is
+recognized by type (is_async_client()); its calls are timed until the await completes.
+
+Usage:
+    metrics = ClientMetrics()
+    client = InstrumentedClient(weaviate_client, [metrics])
+    client.collections.use("Article").query.hybrid("cats", limit=5)
+    print(metrics.prometheus_text())
+"""
+import inspect
+import threading
+import time
+from bisect import bisect_left
+
+import weaviate
+
+MISS = object()
+
+# Transport used by each operation (weaviate-client v4: queries, aggregations and batch
+# imports go over gRPC; single-object writes, config and tenant calls over REST)
+GRPC_NAMESPACES = {"query", "generate", "aggregate", "batch"}
+GRPC_DATA_METHODS = {"insert_many", "delete_many"}
+INSTRUMENTED_NAMESPACES = {"query", "generate", "aggregate", "data", "batch", "tenants"}
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def transport_of(namespace, method):
+    if namespace in GRPC_NAMESPACES or (namespace == "data" and method in GRPC_DATA_METHODS):
+        return "grpc"
+    return "rest"
+
+
+class Call:
+    """One intercepted client operation; `state` is scratch space for interceptors."""
+
+    __slots__ = ("operation", "namespace", "method", "collection", "tenant", "transport", "function",
+                 "args", "kwargs", "objects_sent", "objects_returned", "cached", "state")
+
+    def __init__(self, namespace, method, collection, tenant, args, kwargs, function=None):
+        self.operation = f"{namespace}.{method}"
+        self.namespace = namespace
+        self.method = method
+        self.function = function
+        self.collection = collection
+        self.tenant = tenant
+        self.transport = transport_of(namespace, method)
+        self.args = args
+        self.kwargs = kwargs
+        self.objects_sent = _objects_sent(method, args, kwargs)
+        self.objects_returned = 0
+        self.cached = False
+        self.state = {}
+
+
+def _objects_sent(method, args, kwargs):
+    if method == "insert_many":
+        objects = args[0] if args else kwargs.get("objects", ())
+        return len(objects) if hasattr(objects, "__len__") else 0
+    if method in ("insert", "update", "replace"):
+        return 1
+    return 0
+
+
+def is_async_client(client):
+    """
+    True for a WeaviateAsyncClient. Its methods are sync wrappers returning awaitables,
+    so inspect.iscoroutinefunction() cannot tell; the check falls back to it for stand-ins.
+    """
+    if isinstance(client, InstrumentedClient):
+        client = client.unwrapped
+    if isinstance(client, weaviate.WeaviateAsyncClient):
+        return True
+    return inspect.iscoroutinefunction(getattr(client, "connect", None))
+
+
+def _objects_returned(result):
+    objects = getattr(result, "objects", None)
+    if objects is not None:
+        return len(objects)
+    if isinstance(result, list):
+        return len(result)
+    return 1 if result is not None else 0
+
+
+class Interceptor:
+    """Base class: override before() and/or after()."""
+
+    def before(self, call):
+        return MISS
+
+    def after(self, call, result, error, elapsed):
+        pass
+
+
+def _run_before(interceptors, call):
+    for interceptor in interceptors:
+        result = interceptor.before(call)
+        if result is not MISS:
+            call.cached = True
+            return result
+    return MISS
+
+
+def _run_after(interceptors, call, result, error, elapsed):
+    if error is None and result is not None:
+        call.objects_returned = _objects_returned(result)
+    for interceptor in interceptors:
+        interceptor.after(call, result, error, elapsed)
+
+
+def _intercepted(function, call, interceptors, is_async):
+    """Run `function` for `call` through the interceptor chain (sync or async)."""
+    if is_async:
+        async def run_async():
+            result = _run_before(interceptors, call)
+            if result is not MISS:
+                _run_after(interceptors, call, result, None, 0.0)
+                return result
+            started = time.perf_counter()
+            try:
+                result = await function(*call.args, **call.kwargs)
+            except Exception as e:
+                _run_after(interceptors, call, None, e, time.perf_counter() - started)
+                raise
+            _run_after(interceptors, call, result, None, time.perf_counter() - started)
+            return result
+        return run_async()
+
+    result = _run_before(interceptors, call)
+    if result is not MISS:
+        _run_after(interceptors, call, result, None, 0.0)
+        return result
+    started = time.perf_counter()
+    try:
+        result = function(*call.args, **call.kwargs)
+    except Exception as e:
+        _run_after(interceptors, call, None, e, time.perf_counter() - started)
+        raise
+    _run_after(interceptors, call, result, None, time.perf_counter() - started)
+    return result
+
+
+class _NamespaceProxy:
+    """Wraps collection.query / .data / .aggregate / ... and intercepts its methods."""
+
+    def __init__(self, target, namespace, collection_proxy):
+        self._target = target
+        self._namespace = namespace
+        self._collection = collection_proxy
+
+    def __getattr__(self, name):
+        attribute = getattr(self._target, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+        collection = self._collection
+
+        def method(*args, **kwargs):
+            call = Call(self._namespace, name, collection._name, collection._tenant, args, kwargs, attribute)
+            return _intercepted(attribute, call, collection._interceptors, collection._is_async)
+
+        method.__name__ = name
+        method.__doc__ = attribute.__doc__
+        return method
+
+
+class _BatchContextProxy:
+    """
+    Times a whole batch context (`with` or, for the async client, `async with`) as one
+    "batch" operation and counts the objects added. Client-level batches (client.batch)
+    have no collection: collection and tenant are None.
+    """
+
+    def __init__(self, context, method, batch_namespace):
+        self._context = context
+        self._namespace = batch_namespace
+        self._interceptors = batch_namespace._interceptors
+        self._call = Call("batch", method, batch_namespace._collection, batch_namespace._tenant, (), {})
+        self._started = None
+        self._batch = None
+
+    def __enter__(self):
+        _run_before(self._interceptors, self._call)
+        self._started = time.perf_counter()
+        self._batch = self._context.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            return self._context.__exit__(exc_type, exc_val, exc_tb)
+        finally:
+            self._finish(exc_val)
+
+    async def __aenter__(self):
+        _run_before(self._interceptors, self._call)
+        self._started = time.perf_counter()
+        self._batch = await self._context.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        try:
+            return await self._context.__aexit__(exc_type, exc_val, exc_tb)
+        finally:
+            self._finish(exc_val)
+
+    def _finish(self, error):
+        failed = getattr(self._namespace._target, "failed_objects", None) or []
+        self._call.state["failed_objects"] = len(failed)
+        _run_after(self._interceptors, self._call, None, error, time.perf_counter() - self._started)
+
+    def add_object(self, *args, **kwargs):
+        self._call.objects_sent += 1
+        return self._batch.add_object(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._batch, name)
+
+
+class _BatchNamespaceProxy:
+    def __init__(self, target, interceptors, collection=None, tenant=None):
+        self._target = target
+        self._interceptors = interceptors
+        self._collection = collection
+        self._tenant = tenant
+
+    def __getattr__(self, name):
+        attribute = getattr(self._target, name)
+        if name in ("dynamic", "fixed_size", "rate_limit", "stream"):
+            def method(*args, **kwargs):
+                return _BatchContextProxy(attribute(*args, **kwargs), name, self)
+            return method
+        return attribute
+
+
+class InstrumentedCollection:
+    """Collection wrapper; with_tenant() keeps the wrapper (and the tenant label)."""
+
+    def __init__(self, target, name, interceptors, is_async, tenant=None):
+        self._target = target
+        self._name = name
+        self._interceptors = interceptors
+        self._is_async = is_async
+        self._tenant = tenant
+
+    def with_tenant(self, tenant=None):
+        tenant_name = getattr(tenant, "name", tenant)
+        return InstrumentedCollection(self._target.with_tenant(tenant), self._name, self._interceptors,
+                                      self._is_async, tenant_name)
+
+    def __getattr__(self, name):
+        attribute = getattr(self._target, name)
+        if name == "batch":
+            return _BatchNamespaceProxy(attribute, self._interceptors, self._name, self._tenant)
+        if name in INSTRUMENTED_NAMESPACES:
+            return _NamespaceProxy(attribute, name, self)
+        return attribute
+
+
+class _CollectionsProxy:
+    def __init__(self, target, interceptors, is_async):
+        self._target = target
+        self._interceptors = interceptors
+        self._is_async = is_async
+
+    def use(self, name, *args, **kwargs):
+        return InstrumentedCollection(self._target.use(name, *args, **kwargs), name, self._interceptors, self._is_async)
+
+    def get(self, name, *args, **kwargs):
+        return InstrumentedCollection(self._target.get(name, *args, **kwargs), name, self._interceptors, self._is_async)
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+
+class InstrumentedClient:
+    """
+    Wraps a WeaviateClient or WeaviateAsyncClient. Collection operations obtained through
+    client.collections.use()/get() go through the interceptors; everything else is
+    passed through unchanged.
+    """
+
+    def __init__(self, client, interceptors):
+        self._client = client
+        self._interceptors = list(interceptors)
+        is_async = is_async_client(client)
+        self.collections = _CollectionsProxy(client.collections, self._interceptors, is_async)
+        if hasattr(client, "batch"):
+            self.batch = _BatchNamespaceProxy(client.batch, self._interceptors)
+
+    @property
+    def unwrapped(self):
+        return self._client
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def __enter__(self):
+        self._client.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self._client.__exit__(exc_type, exc_val, exc_tb)
+
+    async def __aenter__(self):
+        await self._client.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return await self._client.__aexit__(exc_type, exc_val, exc_tb)
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, buckets):
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+
+class ClientMetrics(Interceptor):
+    """
+    Thread-safe latency / payload / error metrics per
+    (operation, transport, collection, tenant).
+
+    label_tenants=False drops the tenant label: with tens of thousands of tenants the
+    per-tenant series can be more than a Prometheus server wants to scrape.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, label_tenants=True):
+        self.buckets = tuple(buckets)
+        self.label_tenants = label_tenants
+        self._latency = {}
+        self._calls = {}
+        self._errors = {}
+        self._objects_sent = {}
+        self._objects_returned = {}
+        self._cache_hits = {}
+        self._lock = threading.Lock()
+
+    def _key(self, call):
+        return (call.operation, call.transport, call.collection or "", (call.tenant or "") if self.label_tenants else "")
+
+    def after(self, call, result, error, elapsed):
+        key = self._key(call)
+        with self._lock:
+            self._calls[key] = self._calls.get(key, 0) + 1
+            self._objects_sent[key] = self._objects_sent.get(key, 0) + call.objects_sent
+            self._objects_returned[key] = self._objects_returned.get(key, 0) + call.objects_returned
+            if error is not None:
+                self._errors[key] = self._errors.get(key, 0) + 1
+            if call.cached:
+                self._cache_hits[key] = self._cache_hits.get(key, 0) + 1
+                return
+            histogram = self._latency.get(key)
+            if histogram is None:
+                histogram = self._latency[key] = _Histogram(self.buckets)
+            histogram.counts[bisect_left(self.buckets, elapsed)] += 1
+            histogram.total += elapsed
+            histogram.count += 1
+
+    def percentile(self, operation, q, collection=None):
+        """Approximate latency percentile (upper bucket bound) for an operation, across series."""
+        with self._lock:
+            counts = [0] * (len(self.buckets) + 1)
+            for key, histogram in self._latency.items():
+                if key[0] == operation and (collection is None or key[2] == collection):
+                    counts = [a + b for a, b in zip(counts, histogram.counts)]
+        total = sum(counts)
+        if not total:
+            return None
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            seen += count
+            if seen >= q * total:
+                return bound
+        return float("inf")
+
+    def snapshot(self):
+        """Plain dict view: {(operation, transport, collection, tenant): {...}}."""
+        with self._lock:
+            return {
+                key: {
+                    "calls": calls,
+                    "errors": self._errors.get(key, 0),
+                    "cache_hits": self._cache_hits.get(key, 0),
+                    "objects_sent": self._objects_sent.get(key, 0),
+                    "objects_returned": self._objects_returned.get(key, 0),
+                    "latency_sum": self._latency[key].total if key in self._latency else 0.0,
+                    "latency_count": self._latency[key].count if key in self._latency else 0,
+                }
+                for key, calls in self._calls.items()
+            }
+
+    def prometheus_text(self, prefix="weaviate_client"):
+        """Render all series in the Prometheus text exposition format."""
+        def labels(key, extra=""):
+            operation, transport, collection, tenant = key
+            text = f'operation="{operation}",transport="{transport}",collection="{collection}",tenant="{tenant}"'
+            return "{" + text + extra + "}"
+
+        lines = []
+        with self._lock:
+            lines += [f"# HELP {prefix}_request_duration_seconds Latency of Weaviate client operations",
+                      f"# TYPE {prefix}_request_duration_seconds histogram"]
+            for key, histogram in sorted(self._latency.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, histogram.counts):
+                    cumulative += count
+                    le = ',le="%s"' % bound
+                    lines.append(f"{prefix}_request_duration_seconds_bucket{labels(key, le)} {cumulative}")
+                le = ',le="+Inf"'
+                lines.append(f"{prefix}_request_duration_seconds_bucket{labels(key, le)} {histogram.count}")
+                lines.append(f"{prefix}_request_duration_seconds_sum{labels(key)} {histogram.total}")
+                lines.append(f"{prefix}_request_duration_seconds_count{labels(key)} {histogram.count}")
+            for name, help_text, series in (
+                ("requests_total", "Weaviate client operations", self._calls),
+                ("errors_total", "Weaviate client operations that raised", self._errors),
+                ("cache_hits_total", "Operations answered by a client-side cache", self._cache_hits),
+                ("objects_sent_total", "Objects sent by write operations", self._objects_sent),
+                ("objects_returned_total", "Objects returned by read operations", self._objects_returned),
+            ):
+                lines += [f"# HELP {prefix}_{name} {help_text}", f"# TYPE {prefix}_{name} counter"]
+                lines += [f"{prefix}_{name}{labels(key)} {value}" for key, value in sorted(series.items())]
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetryTracer(Interceptor):
+    """One OpenTelemetry span per operation; requires opentelemetry-api (and an SDK to export)."""
+
+    def __init__(self, tracer=None):
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise Exception("OpenTelemetry export requires opentelemetry-api: pip install opentelemetry-api")
+        self._trace = trace
+        self._tracer = tracer or trace.get_tracer("weaviate.client")
+
+    def before(self, call):
+        span = self._tracer.start_span(f"weaviate.{call.operation}", attributes={
+            "db.system": "weaviate",
+            "db.operation": call.operation,
+            "db.collection.name": call.collection or "",
+            "weaviate.tenant": call.tenant or "",
+            "weaviate.transport": call.transport,
+        })
+        call.state["span"] = span
+        return MISS
+
+    def after(self, call, result, error, elapsed):
+        span = call.state.pop("span", None)
+        if span is None:
+            return
+        span.set_attribute("weaviate.objects_sent", call.objects_sent)
+        span.set_attribute("weaviate.objects_returned", call.objects_returned)
+        span.set_attribute("weaviate.cache_hit", call.cached)
+        if error is not None:
+            span.record_exception(error)
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, str(error)))
+        span.end()
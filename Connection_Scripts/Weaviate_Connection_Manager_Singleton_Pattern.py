@@ -11,17 +11,64 @@ a persistent connection to the cluster. Creating multiple clients causes unneces
 connection setup/teardown overhead. Weaviate recommends ONE long-lived client instance
 per application.
 
-IMPORTANT: This is NOT about connection pooling in the traditional sense. The client
-maintains a single persistent HTTP connection via httpx. Concurrent requests are
-handled via httpx's async capabilities and HTTP/2 multiplexing, not by a pool of
-connections.
+By default the manager holds exactly one client: its persistent HTTP connection
+(httpx) and gRPC channel are shared by every request, and concurrent requests are
+multiplexed over them. Only very high concurrency calls for more than one client (see
+CLIENT POOL below); even then each pooled client is long-lived, never per request.
 
 ARCHITECTURE:
-- One client instance per application lifetime
+- One client instance per application lifetime (or pool_size long-lived clients)
 - httpx (HTTP client) handles persistent connection via connection pooling at the HTTP layer
-- Concurrent requests are multiplexed over the single HTTP connection
+- Concurrent requests are multiplexed over the client's HTTP connection and gRPC channel
 - Lazy initialization of async client on first use
 
+CLIENT POOL (optional):
+A single gRPC channel (one HTTP/2 connection) saturates well before a 64-thread API
+worker does. With pool_size=N (or WEAVIATE_POOL_SIZE=N) the manager holds N clients,
+each with its own channel, and hands them out round-robin or least-busy:
+- manager.client                -> next client (round-robin; least_busy: fewest leases first)
+- with manager.lease() as c:    -> tracked until the block exits
+Only leases are counted, so "least_busy" only sees work taken through lease(): the
+client with the fewest leases in flight wins, ties (e.g. no leases at all, as for
+manager.client / get_weaviate_client() callers) are broken round-robin.
+pool_size=1 (the default) keeps the classic single-client singleton.
+
+FORK SAFETY:
+gunicorn / Celery prefork workers inherit the parent's client, whose gRPC channel does
+not survive fork(). The manager remembers the PID that created its clients; in a child
+process the inherited clients are dropped (not closed, which could disturb the parent's
+sockets) and new ones are created on first use. Initialization is guarded by locks, so
+concurrent first calls from several threads create exactly one manager and one pool.
+
+ASYNC LIFECYCLE:
+- The async client is created once per event loop behind an asyncio.Lock (single-flight:
+  concurrent first awaiters share one connect instead of racing to create several).
+- aclose() awaits client.close(), so sockets and gRPC channels are really released.
+- The manager is an async context manager for ASGI lifespans:
+      async with WeaviateConnectionManager(warm_up=True) as manager:
+          client = await manager.get_async_client()
+- Warm-up (warm_up=True or WEAVIATE_WARM_UP=1) opens the HTTP and gRPC connections and
+  pre-fetches get_meta() and the collection configs at startup, so the first production
+  request does not pay for TCP/TLS setup. Set WEAVIATE_WARM_UP_COLLECTIONS=A,B to also
+  issue one tiny gRPC query per collection.
+
+INSTRUMENTATION (optional):
+With instrument=True (or WEAVIATE_INSTRUMENT=1) the clients handed out are wrapped by
+Weaviate_Client_Instrumentation.InstrumentedClient, which records latency histograms,
+payload sizes, transport (gRPC / REST) and errors per operation, collection and tenant.
+manager.metrics_text() returns them in the Prometheus text format; WEAVIATE_OTEL=1 also
+emits OpenTelemetry spans. Disabled (the default), the raw client is returned and there
+is no overhead.
+
+QUERY CACHE (optional):
+With query_cache=True (or WEAVIATE_QUERY_CACHE=1) the same wrapper answers repeated
+hybrid / near_text / near_vector / bm25 / fetch_objects calls from a client-side LRU
+(Weaviate_Query_Cache.QueryCache) keyed on the normalized query parameters and tenant.
+Entries expire after WEAVIATE_QUERY_CACHE_TTL seconds (default 60), the cache is capped
+at WEAVIATE_QUERY_CACHE_MAX_MB (default 64), and writes through the handed-out clients
+(data.*, batch, tenant changes) invalidate the affected collection / tenant. Hit rates
+are in manager.query_cache.stats() and in metrics_text().
+
 NETWORK CONSIDERATIONS:
 gRPC health checks may fail due to network latency, especially if the application
 region differs from the cluster region. In such cases:
@@ -50,7 +97,7 @@ Usage:
 
 Best Practices (per Weaviate docs):
     - Initialize once at application startup
-    - Reuse the same client instance for all requests
+    - Reuse the long-lived client (or pool of clients) for all requests
     - Only close at application shutdown
     - Concurrent requests are handled by httpx's async capabilities
     - DO NOT create new clients per request (wasteful connection overhead)
@@ -60,6 +107,10 @@ import os
 import logging
 import atexit
 import asyncio
+import itertools
+import threading
+import time
+from contextlib import contextmanager
 import weaviate
 from weaviate.classes.init import Auth, AdditionalConfig, Timeout
 from dotenv import load_dotenv
@@ -71,19 +122,41 @@ logger = logging.getLogger(__name__)
 
 class WeaviateConnectionManager:
     """
-    Singleton manager that maintains ONE long-lived Weaviate client connection.
+    Singleton manager that maintains ONE long-lived Weaviate client connection
+    (or a small pool of long-lived clients with pool_size > 1).
     
     Architecture:
     - One client instance per application lifetime
     - httpx (HTTP client) handles persistent connection via connection pooling at the HTTP layer
-    - Concurrent requests are multiplexed over the single HTTP connection
+    - Concurrent requests are multiplexed over the client's HTTP connection and gRPC channel
     
     RECOMMENDATION: Use get_weaviate_client() module-level function instead of
     directly instantiating this class.
     """
 
-    def __init__(self):
-        """Initialize the singleton client connection."""
+    POOL_STRATEGIES = ("round_robin", "least_busy")
+
+    def __init__(self, pool_size=None, pool_strategy=None, warm_up=None, warm_up_collections=None,
+                 instrument=None, interceptors=None, query_cache=None):
+        """
+        Initialize the singleton client connection.
+
+        Args:
+            pool_size: Number of sync clients (gRPC channels) to hold; defaults to
+                WEAVIATE_POOL_SIZE or 1.
+            pool_strategy: "round_robin" or "least_busy"; defaults to
+                WEAVIATE_POOL_STRATEGY or "round_robin".
+            warm_up: Pre-open connections and pre-fetch meta / configs when clients are
+                created; defaults to WEAVIATE_WARM_UP.
+            warm_up_collections: Collections to send one small gRPC query to during
+                warm-up; defaults to WEAVIATE_WARM_UP_COLLECTIONS (comma-separated).
+            instrument: Wrap handed-out clients with ClientMetrics; defaults to
+                WEAVIATE_INSTRUMENT. WEAVIATE_METRICS_TENANT_LABELS=0 drops the tenant label.
+            interceptors: Extra interceptors (see Weaviate_Client_Instrumentation) applied
+                to handed-out clients, after the metrics.
+            query_cache: True to cache query results (see Weaviate_Query_Cache), or a
+                QueryCache instance; defaults to WEAVIATE_QUERY_CACHE.
+        """
         load_dotenv(override=True)
         
         self._cluster_url = os.getenv("CLUSTER_URL")
@@ -103,13 +176,70 @@ class WeaviateConnectionManager:
         
         # Configure timeouts
         self._weaviate_timeout = Timeout(init=60, query=240, insert=240)
+
+        self._pool_size = max(int(pool_size or os.getenv("WEAVIATE_POOL_SIZE", "1")), 1)
+        self._pool_strategy = pool_strategy or os.getenv("WEAVIATE_POOL_STRATEGY", "round_robin")
+        if self._pool_strategy not in self.POOL_STRATEGIES:
+            raise ValueError(f"pool_strategy must be one of {self.POOL_STRATEGIES}")
+
+        if instrument is None:
+            instrument = os.getenv("WEAVIATE_INSTRUMENT", "").lower() in ("1", "true", "yes")
+        self.metrics = None
+        self._interceptors = []
+        if instrument:
+            # Imported only when enabled, so plain connections don't load these modules
+            from Weaviate_Client_Instrumentation import ClientMetrics, OpenTelemetryTracer
+            self.metrics = ClientMetrics(label_tenants=os.getenv("WEAVIATE_METRICS_TENANT_LABELS", "1") != "0")
+            self._interceptors.append(self.metrics)
+            if os.getenv("WEAVIATE_OTEL", "").lower() in ("1", "true", "yes"):
+                self._interceptors.append(OpenTelemetryTracer())
+        if query_cache is None:
+            query_cache = os.getenv("WEAVIATE_QUERY_CACHE", "").lower() in ("1", "true", "yes")
+        self.query_cache = None
+        if query_cache:
+            from Weaviate_Query_Cache import QueryCache
+            if isinstance(query_cache, QueryCache):
+                self.query_cache = query_cache
+            else:
+                self.query_cache = QueryCache(
+                    ttl=float(os.getenv("WEAVIATE_QUERY_CACHE_TTL", "60")),
+                    max_bytes=int(float(os.getenv("WEAVIATE_QUERY_CACHE_MAX_MB", "64")) * 1024 * 1024),
+                )
+        if self.query_cache:
+            self._interceptors.append(self.query_cache)
+        self._interceptors.extend(interceptors or [])
+
+        # Guards (re)creation of the clients; re-entrant so close() can run inside it
+        self._lock = threading.RLock()
+        self._pid = os.getpid()
+        self._sync_clients = []
+        self._handed_out = []       # the clients as returned to callers (wrapped if instrumented)
+        self._in_flight = []
+        self._round_robin = itertools.count()
+        self._closed = False
+
+        # Create the long-lived synchronous client(s)
+        self._ensure_sync_clients()
+        logger.info(f"Weaviate synchronous client pool initialized (size={self._pool_size})")
         
-        # Create the ONE long-lived synchronous client
-        self._sync_client = self._create_sync_client()
-        logger.info("Weaviate synchronous client initialized")
-        
-        # Async client will be lazily initialized
+        if warm_up is None:
+            warm_up = os.getenv("WEAVIATE_WARM_UP", "").lower() in ("1", "true", "yes")
+        if warm_up_collections is None:
+            warm_up_collections = [c for c in os.getenv("WEAVIATE_WARM_UP_COLLECTIONS", "").split(",") if c]
+        self._warm_up = warm_up
+        self._warm_up_collections = list(warm_up_collections)
+        self.meta = None
+        self.collection_configs = {}
+
+        if self._warm_up:
+            self.warm_up()
+
+        # Async client will be lazily initialized, once per event loop
         self._async_client = None
+        self._async_handed_out = None
+        self._async_loop = None
+        self._async_lock = None
+        self._async_lock_loop = None
         
         # Register cleanup on application shutdown
         atexit.register(self.close)
@@ -132,47 +262,202 @@ class WeaviateConnectionManager:
     async def _create_async_client(self):
         """Create a single long-lived asynchronous Weaviate client."""
         try:
-            client = await weaviate.use_async_with_weaviate_cloud(
+            client = weaviate.use_async_with_weaviate_cloud(
                 cluster_url=self._cluster_url,
                 auth_credentials=Auth.api_key(self._api_key),
                 headers=self._headers or None,
                 additional_config=AdditionalConfig(timeout=self._weaviate_timeout),
                 skip_init_checks=False
-            ).__aenter__()
+            )
+            await client.connect()
             logger.info(f"Connected to Weaviate cluster (async): {self._cluster_url}")
             return client
         except Exception as e:
             logger.error(f"Failed to create async Weaviate client: {e}")
             raise
 
+    def _check_fork(self):
+        """
+        Drop clients inherited from a parent process.
+
+        Their gRPC channels are unusable after fork(). They are deliberately not closed:
+        closing would act on sockets still shared with the parent.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                logger.info(f"Fork detected (pid {self._pid} -> {os.getpid()}); recreating Weaviate clients")
+                self._pid = os.getpid()
+                self._sync_clients = []
+                self._handed_out = []
+                self._in_flight = []
+                self._async_client = None
+
+    def _after_fork_in_child(self):
+        # A lock held by another thread at fork time would never be released in the child
+        self._lock = threading.RLock()
+        self._check_fork()
+
+    def _ensure_sync_clients(self):
+        """Create the pool on first use (and again after a fork)."""
+        self._check_fork()
+        if self._sync_clients:
+            return self._sync_clients
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Sync client was closed or not initialized")
+            if not self._sync_clients:
+                clients = [self._create_sync_client() for _ in range(self._pool_size)]
+                self._in_flight = [0] * len(clients)
+                self._handed_out = [self._wrap(client) for client in clients]
+                self._sync_clients = clients
+        return self._sync_clients
+
+    def _wrap(self, client):
+        if not self._interceptors:
+            return client
+        from Weaviate_Client_Instrumentation import InstrumentedClient
+        return InstrumentedClient(client, self._interceptors)
+
+    def _pick(self):
+        clients = self._ensure_sync_clients()
+        if len(clients) == 1:
+            return 0
+        start = next(self._round_robin) % len(clients)
+        if self._pool_strategy == "least_busy":
+            # Only lease() counts in-flight work; rotating the start breaks ties round-robin
+            order = [(start + i) % len(clients) for i in range(len(clients))]
+            return min(order, key=self._in_flight.__getitem__)
+        return start
+
     @property
     def client(self):
         """
         Return the singleton synchronous Weaviate client.
         
-        This is the same client instance every time - DO NOT close it after use.
-        The persistent HTTP connection (via httpx) is reused across all requests.
+        With the default pool of one this is the same client instance every time;
+        with WEAVIATE_POOL_SIZE > 1 each call returns the next client of the pool
+        (see lease() for least-busy selection that tracks when the caller is done).
+        DO NOT close it after use: its persistent connections are reused.
         
         Returns:
             WeaviateClient: The long-lived client instance
         """
-        if self._sync_client is None:
-            raise RuntimeError("Sync client was closed or not initialized")
-        return self._sync_client
+        self._ensure_sync_clients()
+        return self._handed_out[self._pick()]
+
+    @contextmanager
+    def lease(self):
+        """
+        Borrow a pooled client for the duration of a with-block.
+
+        Leases are counted per client, so least_busy selection sends new work to the
+        client with the fewest requests in flight. The client is NOT closed on exit.
+        """
+        with self._lock:
+            index = self._pick()
+            self._in_flight[index] += 1
+            client = self._handed_out[index]
+        try:
+            yield client
+        finally:
+            with self._lock:
+                if index < len(self._in_flight) and self._handed_out[index] is client:
+                    self._in_flight[index] -= 1
+
+    @property
+    def pool_size(self):
+        return self._pool_size
+
+    def metrics_text(self):
+        """Prometheus text exposition of the client metrics and query cache ("" when neither is enabled)."""
+        text = self.metrics.prometheus_text() if self.metrics else ""
+        if self.query_cache:
+            text += self.query_cache.prometheus_text()
+        return text
 
     async def get_async_client(self):
         """
         Return the singleton asynchronous Weaviate client.
         
         Lazily initializes the async client on first call. The same instance
-        is returned on subsequent calls.
+        is returned on subsequent calls. Initialization is single-flight: concurrent
+        first callers wait for the same connect. An async client belongs to the event
+        loop it was created in, so a new loop (e.g. a second asyncio.run()) gets a new one.
         
         Returns:
             WeaviateAsyncClient: The long-lived async client instance
         """
-        if self._async_client is None:
-            self._async_client = await self._create_async_client()
-        return self._async_client
+        self._check_fork()
+        if self._closed:
+            raise RuntimeError("Async client was closed or not initialized")
+        loop = asyncio.get_running_loop()
+        if self._async_client is not None and self._async_loop is loop:
+            return self._async_handed_out
+
+        # asyncio.Lock is bound to one loop; the thread lock only guards swapping it
+        with self._lock:
+            if self._async_lock is None or self._async_lock_loop is not loop:
+                self._async_lock = asyncio.Lock()
+                self._async_lock_loop = loop
+            async_lock = self._async_lock
+
+        async with async_lock:
+            if self._closed:
+                raise RuntimeError("Async client was closed or not initialized")
+            if self._async_client is None or self._async_loop is not loop:
+                if self._async_client is not None:
+                    # Created in a loop that is gone; its transports cannot be awaited from here
+                    logger.info("Event loop changed; creating a new async Weaviate client")
+                client = await self._create_async_client()
+                if self._warm_up:
+                    await self.awarm_up(client)
+                self._async_client, self._async_loop = client, loop
+                self._async_handed_out = self._wrap(client)
+        return self._async_handed_out
+
+    def warm_up(self, collections=None):
+        """
+        Open the connections of every pooled sync client and pre-fetch meta and configs.
+
+        get_meta() opens the REST (HTTP/TLS) connection, list_all(simple=False) fetches
+        every collection config in one request, and one fetch_objects(limit=1) per
+        warm-up collection opens the gRPC channel. Errors are logged, not raised.
+        """
+        started = time.perf_counter()
+        collections = self._warm_up_collections if collections is None else collections
+        for index, client in enumerate(self._ensure_sync_clients()):
+            try:
+                meta = client.get_meta()
+                if index == 0:
+                    self.meta = meta
+                    self.collection_configs = client.collections.list_all(simple=False)
+                for name in collections:
+                    client.collections.use(name).query.fetch_objects(limit=1, return_properties=[])
+            except Exception as e:
+                logger.warning(f"Warm-up of sync client {index} failed: {e}")
+        logger.info(f"Warm-up of {len(self._sync_clients)} sync client(s) took {time.perf_counter() - started:.2f}s")
+
+    async def awarm_up(self, client=None, collections=None):
+        """Async counterpart of warm_up() for the async client; requests run concurrently."""
+        started = time.perf_counter()
+        if client is None:
+            await self.get_async_client()
+            client = self._async_client
+        collections = self._warm_up_collections if collections is None else collections
+        try:
+            meta, configs, *_ = await asyncio.gather(
+                client.get_meta(),
+                client.collections.list_all(simple=False),
+                *(client.collections.use(name).query.fetch_objects(limit=1, return_properties=[])
+                  for name in collections),
+            )
+            self.meta = meta
+            self.collection_configs = configs
+        except Exception as e:
+            logger.warning(f"Warm-up of async client failed: {e}")
+        logger.info(f"Warm-up of async client took {time.perf_counter() - started:.2f}s")
 
     def is_ready(self) -> bool:
         """
@@ -182,7 +467,7 @@ class WeaviateConnectionManager:
             bool: True if Weaviate is ready, False otherwise
         """
         try:
-            return self._sync_client.is_ready()
+            return self.client.is_ready()
         except Exception as e:
             logger.error(f"Health check failed: {e}")
             return False
@@ -194,29 +479,95 @@ class WeaviateConnectionManager:
         This should ONLY be called during application shutdown.
         DO NOT call this after individual requests.
         """
+        if self._pid != os.getpid():
+            # Inherited from the parent process (e.g. atexit in a forked worker): not ours to close
+            return
         try:
-            if self._sync_client:
-                self._sync_client.close()
-                logger.info("Weaviate synchronous client closed")
-                self._sync_client = None
+            with self._lock:
+                self._closed = True
+                clients, self._sync_clients, self._handed_out = self._sync_clients, [], []
+            for client in clients:
+                client.close()
+            if clients:
+                logger.info(f"Weaviate synchronous client(s) closed ({len(clients)})")
             
             if self._async_client:
-                # Async client cleanup would need proper event loop handling
-                logger.info("Weaviate asynchronous client marked for closure")
-                self._async_client = None
+                self._close_async_client_from_sync()
         except Exception as e:
             logger.error(f"Error closing Weaviate clients: {e}")
 
+    def _close_async_client_from_sync(self):
+        # Best effort for callers without a loop (atexit); prefer `await manager.aclose()`
+        client, loop = self._async_client, self._async_loop
+        self._async_client = self._async_loop = self._async_handed_out = None
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if loop is None or loop.is_closed():
+            logger.warning("Async Weaviate client's event loop is closed; use `await manager.aclose()` "
+                           "before the loop ends to release its connections")
+        elif running is loop:
+            loop.create_task(client.close())
+            logger.info("Weaviate asynchronous client close scheduled on the running loop")
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.close(), loop).result(timeout=10)
+            logger.info("Weaviate asynchronous client closed")
+        else:
+            loop.run_until_complete(client.close())
+            logger.info("Weaviate asynchronous client closed")
+
+    async def aclose(self):
+        """
+        Close all clients, awaiting the async client's close.
+
+        Call this (or use `async with manager:`) at application shutdown from the event
+        loop that used the async client.
+        """
+        client, self._async_client, self._async_loop = self._async_client, None, None
+        self._async_handed_out = None
+        if client is not None and self._pid == os.getpid():
+            try:
+                await client.close()
+                logger.info("Weaviate asynchronous client closed")
+            except Exception as e:
+                logger.error(f"Error closing async Weaviate client: {e}")
+        self.close()
+
+    async def __aenter__(self):
+        await self.get_async_client()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
 
 # Singleton instance getter for synchronous client
 _manager_instance = None
+_manager_lock = threading.Lock()
+
+
+def _reset_locks_after_fork():
+    # Runs in the child right after fork(): locks may have been held by threads that no longer exist
+    global _manager_lock
+    _manager_lock = threading.Lock()
+    if _manager_instance is not None:
+        _manager_instance._after_fork_in_child()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_locks_after_fork)
+
 
 def get_weaviate_client():
     """
     Get the singleton Weaviate client instance.
     
-    This returns the SAME client instance every time. Use this client directly
-    for all operations - do not close it after use.
+    With the default pool of one this returns the SAME client instance every
+    time; with WEAVIATE_POOL_SIZE > 1 it returns the next pooled client, and
+    get_weaviate_manager().lease() borrows one for a with-block so least_busy
+    selection sees when the work is done. Use the client directly for all
+    operations - do not close it after use.
     
     Example:
         client = get_weaviate_client()
@@ -224,12 +575,9 @@ def get_weaviate_client():
         # Client remains open for next request
     
     Returns:
-        WeaviateClient: The singleton client instance
+        WeaviateClient: The singleton client, or the next pooled client
     """
-    global _manager_instance
-    if _manager_instance is None:
-        _manager_instance = WeaviateConnectionManager()
-    return _manager_instance.client
+    return get_weaviate_manager().client
 
 
 async def get_async_weaviate_client():
@@ -250,10 +598,7 @@ async def get_async_weaviate_client():
     Returns:
         WeaviateAsyncClient: The singleton async client instance
     """
-    global _manager_instance
-    if _manager_instance is None:
-        _manager_instance = WeaviateConnectionManager()
-    return await _manager_instance.get_async_client()
+    return await get_weaviate_manager().get_async_client()
 
 
 def get_weaviate_manager() -> WeaviateConnectionManager:
@@ -263,15 +608,32 @@ def get_weaviate_manager() -> WeaviateConnectionManager:
     Use this if you need access to manager methods like is_ready() or close().
     For normal operations, use get_weaviate_client() instead.
     
+    Thread-safe: concurrent first calls create exactly one manager (double-checked locking).
+    
     Returns:
         WeaviateConnectionManager: The singleton manager instance
     """
     global _manager_instance
     if _manager_instance is None:
-        _manager_instance = WeaviateConnectionManager()
+        with _manager_lock:
+            if _manager_instance is None:
+                _manager_instance = WeaviateConnectionManager()
     return _manager_instance
 
 
+async def close_async_weaviate_connection():
+    """
+    Close the Weaviate connections from async code, awaiting the async client's close.
+
+    Call this from the application's shutdown hook (e.g. the end of an ASGI lifespan).
+    """
+    global _manager_instance
+    with _manager_lock:
+        manager, _manager_instance = _manager_instance, None
+    if manager:
+        await manager.aclose()
+
+
 def close_weaviate_connection():
     """
     Close the Weaviate connection.
@@ -281,9 +643,10 @@ def close_weaviate_connection():
     calls are typically unnecessary.
     """
     global _manager_instance
-    if _manager_instance:
-        _manager_instance.close()
-        _manager_instance = None
+    with _manager_lock:
+        if _manager_instance:
+            _manager_instance.close()
+            _manager_instance = None
 
 
 # Example usage
@@ -305,12 +668,20 @@ if __name__ == "__main__":
     is_ready = manager.is_ready()
     print(f"Weaviate is ready: {is_ready}")
     
-    # Example 3: Multiple requests (reuses same client)
-    print("\nExample 3: Multiple requests with same client")
+    # Example 3: Multiple requests (reuse long-lived clients)
+    print("\nExample 3: Multiple requests with long-lived clients")
     client1 = get_weaviate_client()
     client2 = get_weaviate_client()
-    print(f"client1 is client2: {client1 is client2}")  # True - same instance
-    print("Multiple calls return the SAME client instance - no connection overhead")
+    # True with a pool of one; with WEAVIATE_POOL_SIZE > 1 calls rotate through the pool
+    print(f"client1 is client2: {client1 is client2} (pool size {manager.pool_size})")
+    print("Calls reuse the pooled clients - no connection overhead")
+
+    # Example 3b: Client pool (set WEAVIATE_POOL_SIZE=4 to hand out 4 clients / gRPC channels)
+    print("\nExample 3b: Pooled clients")
+    with manager.lease() as pooled_client:
+        # Counted as in flight until the block exits, so least_busy routes around it
+        print(f"Leased a client from a pool of {manager.pool_size}")
+        # result = pooled_client.collections.use("YourCollection").query.fetch_objects()
     
     # Example 4: Async usage
     print("\nExample 4: Async usage")
@@ -322,8 +693,37 @@ if __name__ == "__main__":
             # result = await client.collections.use("YourCollection").query.fetch_objects()
         except Exception as e:
             print(f"Error: {e}")
+        # Shutdown from inside the loop: awaits the async client's close, then closes the sync client(s)
+        await close_async_weaviate_connection()
     
     asyncio.run(async_example())
+
+    # Example 5: Async lifecycle (e.g. an ASGI lifespan) with warm-up and awaited close
+    print("\nExample 5: async with + warm-up")
+    async def lifespan_example():
+        async with WeaviateConnectionManager(warm_up=True) as manager:
+            client = await manager.get_async_client()
+            print(f"Warmed up: server version {(manager.meta or {}).get('version')}, "
+                  f"{len(manager.collection_configs)} collection configs prefetched")
+            # result = await client.collections.use("YourCollection").query.fetch_objects()
+
+    asyncio.run(lifespan_example())
+
+    # Example 6: Instrumented client (or set WEAVIATE_INSTRUMENT=1 for the singleton)
+    print("\nExample 6: Latency / payload metrics")
+    instrumented = WeaviateConnectionManager(instrument=True)
+    # instrumented.client.collections.use("YourCollection").query.hybrid("query", limit=5)
+    print(instrumented.metrics_text() or "(no operations recorded yet)")
+    instrumented.close()
+
+    # Example 7: Query result cache (or set WEAVIATE_QUERY_CACHE=1 for the singleton)
+    print("\nExample 7: Client-side query cache")
+    cached = WeaviateConnectionManager(instrument=True, query_cache=True)
+    # articles = cached.client.collections.use("YourCollection").with_tenant("tenantA")
+    # articles.query.hybrid("popular query", limit=5)   # cluster
+    # articles.query.hybrid("popular query", limit=5)   # cache hit
+    print(cached.query_cache.stats())
+    cached.close()
     
     # Cleanup (automatic via atexit, but shown here for demonstration)
     print("\nClosing connections...")
@@ -0,0 +1,291 @@
+"""
+Weaviate Query Cache
+====================
+
+Client-side result cache for repeated queries, plugged into the interceptor chain of
+Weaviate_Client_Instrumentation.InstrumentedClient (and so into the clients handed out by
+WeaviateConnectionManager(query_cache=True)).
+
+CACHED OPERATIONS:
+query.hybrid, near_text, near_vector, near_object, bm25, fetch_objects and
+fetch_object_by_id. The key is the operation, collection and tenant plus the call's
+arguments bound to the method signature (defaults applied), so hybrid("q", limit=5) and
+hybrid(query="q", limit=5) share an entry. Query text is whitespace-normalized; enums
+(HybridFusion, ...), filters, MetadataQuery and vectors are serialized by value. Calls
+with an argument that cannot be serialized deterministically are not cached.
+
+BOUNDS:
+Entries expire after `ttl` seconds. The cache is an LRU bounded by `max_entries` and by
+`max_bytes` of (estimated) result size; results larger than a quarter of `max_bytes` are
+not stored.
+
+INVALIDATION:
+Writes through the same wrapped client drop the entries of their collection and tenant
+(all tenants when the write has none): data.* (insert, insert_many, update, replace,
+delete_by_id, delete_many, reference_*), collection and client batches (client.batch
+drops everything) and tenant changes. Every write bumps a per-scope generation both when
+it starts and when it finishes, so a query that was in flight during a write is not
+stored with pre-write results. Writes from other processes or clients are not seen;
+`ttl` bounds how stale a result can be.
+
+ASYNC CLIENT:
+With a WeaviateAsyncClient the interceptors run inside the coroutine returned by the
+wrapped method: the awaited result is stored, and a hit is returned by a fresh coroutine,
+so `await collection.query.hybrid(...)` works the same whether it hits or misses.
+
+Cached results are shared between callers: treat them as read-only.
+
+Usage:
+    cache = QueryCache(ttl=30, max_bytes=64 * 1024 * 1024)
+    client = InstrumentedClient(weaviate_client, [cache])
+    client.collections.use("Article").with_tenant("acme").query.hybrid("cats", limit=5)
+    print(cache.stats())
+"""
+import dataclasses
+import enum
+import hashlib
+import inspect
+import json
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from Weaviate_Client_Instrumentation import MISS, Interceptor
+
+CACHEABLE_OPERATIONS = {
+    "query.hybrid", "query.near_text", "query.near_vector", "query.near_object",
+    "query.bm25", "query.fetch_objects", "query.fetch_object_by_id",
+}
+# Read-only methods of the namespaces that can write
+READ_ONLY_METHODS = {"exists", "get", "get_by_name", "get_by_names"}
+WRITE_NAMESPACES = {"data", "batch", "tenants"}
+
+
+class _Uncacheable(Exception):
+    pass
+
+
+def _normalize(value):
+    """Turn an argument into plain JSON-serializable data, or raise _Uncacheable."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, enum.Enum):
+        return f"{type(value).__name__}.{value.name}"
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if hasattr(value, "tolist"):                  # numpy arrays
+        return value.tolist()
+    if hasattr(value, "model_dump"):              # pydantic models (MetadataQuery, QueryReference, ...)
+        return [type(value).__name__, _normalize(value.model_dump())]
+    if dataclasses.is_dataclass(value):
+        return [type(value).__name__, _normalize(dataclasses.asdict(value))]
+    if hasattr(value, "__dict__") and type(value).__repr__ is object.__repr__:
+        return [type(value).__name__, _normalize(vars(value))]   # filters
+    text = repr(value)
+    if " at 0x" in text:
+        raise _Uncacheable(type(value).__name__)
+    return [type(value).__name__, text]
+
+
+def estimate_size(value, _depth=0):
+    """Rough memory footprint of a query result in bytes (objects, properties, vectors)."""
+    size = sys.getsizeof(value)
+    if _depth > 8 or isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return size
+    if isinstance(value, dict):
+        return size + sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        if value and isinstance(next(iter(value)), float):
+            return size + 24 * len(value)         # vectors: skip walking every float
+        return size + sum(estimate_size(v, _depth + 1) for v in value)
+    if hasattr(value, "__dict__"):
+        return size + estimate_size(vars(value), _depth + 1)
+    if hasattr(value, "__slots__"):
+        return size + sum(estimate_size(getattr(value, s, None), _depth + 1) for s in value.__slots__)
+    return size
+
+
+class _Entry:
+    __slots__ = ("result", "expires_at", "size", "scope")
+
+    def __init__(self, result, expires_at, size, scope):
+        self.result = result
+        self.expires_at = expires_at
+        self.size = size
+        self.scope = scope
+
+
+class QueryCache(Interceptor):
+    """
+    LRU + TTL query result cache with write invalidation, as an instrumentation interceptor.
+
+    stats() returns hits, misses, hit_rate, evictions, expirations, invalidations, entries
+    and bytes; prometheus_text() exports the same counters.
+    """
+
+    def __init__(self, ttl=60.0, max_entries=10000, max_bytes=64 * 1024 * 1024,
+                 operations=CACHEABLE_OPERATIONS):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.operations = set(operations)
+        self._entries = OrderedDict()     # key -> _Entry, least recently used first
+        self._scopes = {}                 # (collection, tenant) -> set of keys
+        self._generations = {}            # (collection, tenant) -> write counter
+        self._bytes = 0
+        self._signatures = {}
+        self._counters = dict.fromkeys(("hits", "misses", "uncacheable", "stores", "evictions",
+                                        "expirations", "invalidations", "writes"), 0)
+        self._lock = threading.Lock()
+
+    # Keys
+
+    def _arguments(self, call):
+        if call.function is None:
+            return {"args": call.args, "kwargs": call.kwargs}
+        signature = self._signatures.get(call.operation)
+        if signature is None:
+            signature = self._signatures[call.operation] = inspect.signature(call.function)
+        bound = signature.bind(*call.args, **call.kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        if isinstance(arguments.get("query"), str):
+            arguments["query"] = re.sub(r"\s+", " ", arguments["query"]).strip()
+        return arguments
+
+    def key(self, call):
+        """Normalized cache key of a query call (None if it cannot be cached)."""
+        try:
+            payload = json.dumps([call.operation, call.collection, call.tenant, _normalize(self._arguments(call))],
+                                 sort_keys=True, separators=(",", ":"))
+        except (_Uncacheable, TypeError, ValueError):
+            return None
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    # Interceptor hooks
+
+    def before(self, call):
+        if call.operation in self.operations:
+            return self._lookup(call)
+        if call.namespace in WRITE_NAMESPACES and call.method not in READ_ONLY_METHODS:
+            self._write(call)
+        return MISS
+
+    def after(self, call, result, error, elapsed):
+        if call.cached:
+            return
+        if call.operation in self.operations:
+            if error is None and "cache_key" in call.state:
+                self._store(call, result)
+        elif call.namespace in WRITE_NAMESPACES and call.method not in READ_ONLY_METHODS:
+            self._write(call, count=False)
+
+    def _lookup(self, call):
+        key = self.key(call)
+        scope = (call.collection, call.tenant)
+        with self._lock:
+            if key is None:
+                self._counters["uncacheable"] += 1
+                return MISS
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self._counters["expirations"] += 1
+                entry = None
+            if entry is None:
+                self._counters["misses"] += 1
+                call.state["cache_key"] = key
+                call.state["cache_generation"] = (self._generations.get(scope, 0),
+                                                  self._generations.get((call.collection, None), 0),
+                                                  self._generations.get((None, None), 0))
+                return MISS
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return entry.result
+
+    def _store(self, call, result):
+        if inspect.isawaitable(result):
+            return      # an un-awaited coroutine can only be awaited once: never share it
+        size = estimate_size(result)
+        if size > self.max_bytes // 4:
+            return
+        key = call.state["cache_key"]
+        scope = (call.collection, call.tenant)
+        with self._lock:
+            generation = (self._generations.get(scope, 0), self._generations.get((call.collection, None), 0),
+                          self._generations.get((None, None), 0))
+            if generation != call.state["cache_generation"]:
+                return      # a write to this scope started or finished while the query ran
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(result, time.monotonic() + self.ttl, size, scope)
+            self._scopes.setdefault(scope, set()).add(key)
+            self._bytes += size
+            self._counters["stores"] += 1
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._counters["evictions"] += 1
+
+    def _write(self, call, count=True):
+        # Tenant changes and writes without a tenant affect the whole collection
+        tenant = None if call.namespace == "tenants" else call.tenant
+        with self._lock:
+            if count:
+                self._counters["writes"] += 1
+            self._invalidate(call.collection, tenant)
+
+    # Maintenance
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        keys = self._scopes.get(entry.scope)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._scopes[entry.scope]
+
+    def _invalidate(self, collection, tenant):
+        scope = (collection, tenant)
+        self._generations[scope] = self._generations.get(scope, 0) + 1
+        if collection is None:
+            scopes = list(self._scopes)
+        elif tenant is None:
+            scopes = [s for s in self._scopes if s[0] == collection]
+        else:
+            scopes = [scope] if scope in self._scopes else []
+        for each in scopes:
+            for key in list(self._scopes.get(each, ())):
+                self._remove(key)
+                self._counters["invalidations"] += 1
+
+    def invalidate(self, collection=None, tenant=None):
+        """Drop entries of a collection / tenant (everything when collection is None)."""
+        with self._lock:
+            self._invalidate(collection, tenant)
+
+    def clear(self):
+        self.invalidate()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters, entries=len(self._entries), bytes=self._bytes)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+    def prometheus_text(self, prefix="weaviate_client_query_cache"):
+        stats = self.stats()
+        lines = []
+        for name in ("hits", "misses", "uncacheable", "stores", "evictions", "expirations", "invalidations"):
+            lines += [f"# TYPE {prefix}_{name}_total counter", f"{prefix}_{name}_total {stats[name]}"]
+        for name in ("entries", "bytes", "hit_rate"):
+            lines += [f"# TYPE {prefix}_{name} gauge", f"{prefix}_{name} {stats[name]}"]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,623 @@
+"""
+Weaviate Tenant Temperature
+===========================
+
+Access-driven tenant state management: keep the tenants that are being used ACTIVE, move
+idle ones to INACTIVE and long-idle ones to OFFLOADED, as Optimization_Guides/
+Multi_Tenancy.md recommends ("tenant states are your primary lever for cost vs.
+performance"), so a cluster with 100k tenants only holds its working set in RAM.
+
+ACCESS TRACKING:
+TenantAccessTracker is an interceptor for the connection manager's client wrapper
+(Weaviate_Client_Instrumentation). Every query / data / aggregate / batch call made with
+a tenant updates that tenant's last access time, an exponentially decayed access
+frequency and an hour-of-day profile. Tenant API calls are not counted as accesses.
+
+HOT SET:
+TenantTemperatureManager keeps the ACTIVE tenants within `budget`: a tenant count by
+default, or any unit returned by `size_of(collection, tenant)` (e.g. estimated bytes).
+The coldest tenants are the least recently used ("lru") or least frequently used
+("lfu", decayed frequency) ones. Hysteresis prevents flapping:
+- demotion only starts when usage exceeds the budget and then goes down to
+  `low_watermark` * budget, leaving headroom for tenants that come back;
+- a tenant is not demoted within `min_active_seconds` of being activated or accessed.
+INACTIVE tenants idle for longer than `offload_after` seconds are OFFLOADED (requires the
+offload module; None disables it).
+
+PREDICTION:
+A tenant that was used in the coming hour (of the day) on at least `predict_min_days`
+earlier days is activated ahead of time, displacing colder tenants up to the budget, so
+regular users do not pay for reactivation.
+
+COLD STARTS:
+Tenants accessed while not ACTIVE are counted as cold starts. activate_on_miss:
+- True with a sync client: the calling thread activates the tenant before its request
+  goes out. Activations are group-committed: while one tenants.update() is in flight,
+  the cold starts of other threads queue up and go out together in the next one.
+- True with an async client: the tenant is queued and an aflush_activations() task is
+  scheduled on the running event loop, so the loop is never blocked (the triggering
+  request is not held). Tasks share one asyncio lock and group-commit the same way.
+- "queue": tenants are only queued; flush_activations() or the next cycle sends them.
+
+ASYNC CLIENT:
+With a WeaviateAsyncClient the tenant calls are awaited: use arefresh(),
+aflush_activations(), aapply() and arun_once(), and run the background loop as a task
+(asyncio.create_task(manager.arun(60)); cancel it to stop). The sync methods raise
+TypeError for an async client and the a-prefixed ones for a sync client.
+
+STARTUP:
+Tenants that were neither accessed nor activated since the manager started are not
+protected by `min_active_seconds`, so the first cycle brings a cluster where every
+tenant is ACTIVE down to the budget right away.
+
+All state changes go out as bulk tenants.update() calls of up to 100 tenants.
+plan() computes the transitions without applying them (dry run).
+
+Usage:
+    tracker = TenantAccessTracker()
+    manager = WeaviateConnectionManager(interceptors=[tracker])
+    temperature = TenantTemperatureManager(manager.client, ["Documents"], tracker, budget=5000)
+    temperature.start(interval=60)          # background thread; or call run_once() yourself
+
+    temperature = TenantTemperatureManager(async_client, ["Documents"], tracker, budget=5000)
+    task = asyncio.create_task(temperature.arun(interval=60))   # async client
+
+    python Weaviate_Tenant_Temperature.py --simulate --tenants 5000 --budget 1500 --days 5
+    python Weaviate_Tenant_Temperature.py --simulate --async --days 2
+"""
+import argparse
+import asyncio
+import random
+import threading
+import time
+
+from weaviate.classes.tenants import Tenant, TenantActivityStatus
+
+from Weaviate_Client_Instrumentation import MISS, Interceptor, is_async_client
+
+ACCESS_NAMESPACES = {"query", "generate", "aggregate", "data", "batch"}
+UPDATE_CHUNK = 100
+# Newer / older names of the same states
+STATUS_ALIASES = {"HOT": "ACTIVE", "COLD": "INACTIVE", "FROZEN": "OFFLOADED"}
+
+
+def _status(tenant):
+    value = getattr(getattr(tenant, "activity_status", None), "value", None) or "ACTIVE"
+    return STATUS_ALIASES.get(value, value)
+
+
+class _TenantStats:
+    __slots__ = ("last_access", "frequency", "frequency_at", "hours", "accesses")
+
+    def __init__(self):
+        self.last_access = None
+        self.frequency = 0.0
+        self.frequency_at = 0.0
+        self.hours = {}       # hour of day -> [days seen, last day]
+        self.accesses = 0
+
+
+class TenantAccessTracker(Interceptor):
+    """Per-tenant access recency, decayed frequency and hour-of-day profile."""
+
+    def __init__(self, half_life=3600.0, clock=time.time, utc_offset_hours=0):
+        self.half_life = half_life
+        self.clock = clock
+        self.utc_offset = utc_offset_hours * 3600
+        self.listeners = []           # callables(collection, tenant, call) run on every access
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def before(self, call):
+        if call.tenant and call.namespace in ACCESS_NAMESPACES:
+            self.access(call.collection, call.tenant, call)
+        return MISS
+
+    def access(self, collection, tenant, call=None):
+        """Record an access and notify the listeners (the interceptor path)."""
+        self.record(collection, tenant)
+        for listener in self.listeners:
+            listener(collection, tenant, call)
+
+    def record(self, collection, tenant, now=None):
+        now = self.clock() if now is None else now
+        local = now + self.utc_offset
+        day, hour = int(local // 86400), int(local % 86400 // 3600)
+        key = (collection, tenant)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _TenantStats()
+            stats.frequency = self._decayed(stats, now) + 1.0
+            stats.frequency_at = now
+            stats.last_access = now
+            stats.accesses += 1
+            seen = stats.hours.get(hour)
+            if seen is None:
+                stats.hours[hour] = [1, day]
+            elif seen[1] != day:
+                seen[0] += 1
+                seen[1] = day
+
+    def _decayed(self, stats, now):
+        return stats.frequency * 0.5 ** ((now - stats.frequency_at) / self.half_life)
+
+    def get(self, collection, tenant):
+        return self._stats.get((collection, tenant))
+
+    def last_access(self, collection, tenant):
+        stats = self._stats.get((collection, tenant))
+        return stats.last_access if stats else None
+
+    def frequency(self, collection, tenant, now=None):
+        stats = self._stats.get((collection, tenant))
+        return self._decayed(stats, self.clock() if now is None else now) if stats else 0.0
+
+    def predicted(self, collection, now=None, lookahead_hours=1, min_days=3):
+        """
+        Tenants of `collection` used in this or the next `lookahead_hours` hours of the day
+        on at least `min_days` days, most regular first.
+        """
+        now = self.clock() if now is None else now
+        local = now + self.utc_offset
+        hours = {int((local + 3600 * i) % 86400 // 3600) for i in range(lookahead_hours + 1)}
+        with self._lock:
+            scored = []
+            for (name, tenant), stats in self._stats.items():
+                if name == collection:
+                    days = max(stats.hours.get(hour, (0,))[0] for hour in hours)
+                    if days >= min_days:
+                        scored.append((days, tenant))
+        return [tenant for _, tenant in sorted(scored, key=lambda item: (-item[0], item[1]))]
+
+
+class TenantTemperatureManager:
+    """
+    Plans and applies ACTIVE / INACTIVE / OFFLOADED transitions for the tenants of
+    `collections` from the accesses seen by `tracker`.
+    """
+
+    def __init__(self, client, collections, tracker, budget=1000, size_of=None, policy="lru",
+                 low_watermark=0.9, min_active_seconds=600.0, offload_after=None,
+                 predict=True, predict_lookahead_hours=2, predict_min_days=2,
+                 activate_on_miss=False, refresh_every=10):
+        if policy not in ("lru", "lfu"):
+            raise ValueError("policy must be 'lru' or 'lfu'")
+        if activate_on_miss not in (False, True, "queue"):
+            raise ValueError("activate_on_miss must be False, True or 'queue'")
+        self.client = client
+        self.collections = list(collections)
+        self.tracker = tracker
+        self.budget = budget
+        self.size_of = size_of or (lambda collection, tenant: 1)
+        self.policy = policy
+        self.low_watermark = low_watermark
+        self.min_active_seconds = min_active_seconds
+        self.offload_after = offload_after
+        self.predict = predict
+        self.predict_lookahead_hours = predict_lookahead_hours
+        self.predict_min_days = predict_min_days
+        self.activate_on_miss = activate_on_miss
+        self.refresh_every = refresh_every
+        self.status = {}              # (collection, tenant) -> "ACTIVE" / "INACTIVE" / "OFFLOADED" / ...
+        self.activated_at = {}
+        self.stats = dict.fromkeys(("cycles", "update_calls", "activated", "deactivated", "offloaded",
+                                    "predicted", "cold_starts", "activated_on_miss"), 0)
+        self._started_at = tracker.clock()
+        self._lock = threading.RLock()
+        self._pending = {}            # collection -> tenants waiting for activation
+        self._flush_lock = threading.Lock()
+        self._async = is_async_client(client)
+        self._async_flush_lock = asyncio.Lock()
+        self._tasks = set()           # activation tasks scheduled on the event loop (async client)
+        self._thread = None
+        self._stop = threading.Event()
+        tracker.listeners.append(self._on_access)
+
+    # Tenant state
+
+    def _require(self, asynchronous):
+        if self._async and not asynchronous:
+            raise TypeError("The client is async: use arefresh() / aflush_activations() / aapply() / "
+                            "arun_once() / arun()")
+        if asynchronous and not self._async:
+            raise TypeError("The client is sync: use refresh() / flush_activations() / apply() / "
+                            "run_once() / start()")
+
+    def refresh(self):
+        """Reload the tenant states of every managed collection (one tenants.get() each)."""
+        self._require(asynchronous=False)
+        for name in self.collections:
+            self._load(name, self.client.collections.use(name).tenants.get())
+
+    async def arefresh(self):
+        """refresh() for an async client."""
+        self._require(asynchronous=True)
+        for name in self.collections:
+            self._load(name, await self.client.collections.use(name).tenants.get())
+
+    def _load(self, name, tenants):
+        with self._lock:
+            self.status = {key: value for key, value in self.status.items() if key[0] != name}
+            for tenant_name, tenant in tenants.items():
+                self.status[(name, tenant_name)] = _status(tenant)
+
+    def _on_access(self, collection, tenant, call=None):
+        key = (collection, tenant)
+        with self._lock:
+            status = self.status.get(key)
+            if status is None or status == "ACTIVE":
+                return
+            self.stats["cold_starts"] += 1
+            if not self.activate_on_miss:
+                return
+            self._pending.setdefault(collection, set()).add(tenant)
+        if self.activate_on_miss is not True:
+            return
+        if not self._async:
+            self.flush_activations()
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return                    # not on an event loop: the next cycle activates it
+        task = loop.create_task(self.aflush_activations())
+        self._tasks.add(task)
+        task.add_done_callback(self._activation_done)
+
+    def _activation_done(self, task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Tenant activation failed: {task.exception()}")
+
+    def _take_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            return {name: sorted(t for t in tenants if self.status.get((name, t)) != "ACTIVE")
+                    for name, tenants in pending.items()}
+
+    def flush_activations(self):
+        """
+        Activate every queued cold-start tenant with bulk updates. Callers that arrive while
+        a flush is running wait for it and then send everything queued meanwhile at once.
+        """
+        self._require(asynchronous=False)
+        with self._flush_lock:
+            for collection, tenants in self._take_pending().items():
+                if tenants:
+                    self._update(collection, tenants, "ACTIVE")
+                    with self._lock:
+                        self.stats["activated_on_miss"] += len(tenants)
+
+    async def aflush_activations(self):
+        """flush_activations() for an async client."""
+        self._require(asynchronous=True)
+        async with self._async_flush_lock:
+            for collection, tenants in self._take_pending().items():
+                if tenants:
+                    await self._aupdate(collection, tenants, "ACTIVE")
+                    with self._lock:
+                        self.stats["activated_on_miss"] += len(tenants)
+
+    # Planning
+
+    def _coldness(self, key, now):
+        # Lower = colder; tenants never accessed count from when tracking started
+        if self.policy == "lfu":
+            return self.tracker.frequency(*key, now=now)
+        return self.tracker.last_access(*key) or self._started_at
+
+    def plan(self, now=None):
+        """Return {collection: {"ACTIVE": [...], "INACTIVE": [...], "OFFLOADED": [...]}} transitions."""
+        now = self.tracker.clock() if now is None else now
+        with self._lock:
+            status = dict(self.status)
+        transitions = {name: {"ACTIVE": [], "INACTIVE": [], "OFFLOADED": []} for name in self.collections}
+        active = [key for key, value in status.items() if value == "ACTIVE" and key[0] in transitions]
+        used = sum(self.size_of(*key) for key in active)
+        low = self.budget * self.low_watermark
+
+        predicted = []
+        if self.predict:
+            for name in self.collections:
+                predicted += [(name, tenant) for tenant in self.tracker.predicted(
+                    name, now, self.predict_lookahead_hours, self.predict_min_days)]
+        protected = set(predicted)
+
+        def idle(key):
+            # Tenants untouched since the manager started (e.g. all ACTIVE at startup) are not protected
+            touched = [t for t in (self.tracker.last_access(*key), self.activated_at.get(key)) if t is not None]
+            return not touched or now - max(touched) >= self.min_active_seconds
+
+        # Demotion candidates, coldest first: not predicted and idle for min_active_seconds
+        candidates = iter(sorted(
+            (key for key in active if key not in protected and idle(key)),
+            key=lambda key: self._coldness(key, now),
+        ))
+
+        def demote():
+            key = next(candidates, None)
+            if key is None:
+                return False
+            transitions[key[0]]["INACTIVE"].append(key[1])
+            return self.size_of(*key)
+
+        if used > self.budget:
+            while used > low:
+                freed = demote()
+                if freed is False:
+                    break
+                used -= freed
+
+        # Pre-activate predicted tenants, displacing colder unpredicted ones at the budget
+        for key in predicted:
+            if status.get(key) not in ("INACTIVE", "OFFLOADED"):
+                continue
+            size = self.size_of(*key)
+            while used + size > self.budget:
+                freed = demote()
+                if freed is False:
+                    break
+                used -= freed
+            if used + size > self.budget:
+                break
+            transitions[key[0]]["ACTIVE"].append(key[1])
+            used += size
+
+        if self.offload_after is not None:
+            for key, value in status.items():
+                if value == "INACTIVE" and key[0] in transitions and key not in protected:
+                    idle_since = self.tracker.last_access(*key) or self._started_at
+                    if now - idle_since >= self.offload_after:
+                        transitions[key[0]]["OFFLOADED"].append(key[1])
+        return transitions
+
+    def _chunks(self, tenants, target):
+        status = getattr(TenantActivityStatus, target)
+        for i in range(0, len(tenants), UPDATE_CHUNK):
+            yield [Tenant(name=name, activity_status=status) for name in tenants[i:i + UPDATE_CHUNK]]
+
+    def _updated(self, collection, chunk, target):
+        # Recorded only once the update call returned, so a failed call changes nothing
+        now = self.tracker.clock()
+        with self._lock:
+            self.stats["update_calls"] += 1
+            for tenant in chunk:
+                self.status[(collection, tenant.name)] = target
+                if target == "ACTIVE":
+                    self.activated_at[(collection, tenant.name)] = now
+
+    def _update(self, collection, tenants, target):
+        tenants_api = self.client.collections.use(collection).tenants
+        for chunk in self._chunks(tenants, target):
+            tenants_api.update(chunk)
+            self._updated(collection, chunk, target)
+
+    async def _aupdate(self, collection, tenants, target):
+        tenants_api = self.client.collections.use(collection).tenants
+        for chunk in self._chunks(tenants, target):
+            await tenants_api.update(chunk)
+            self._updated(collection, chunk, target)
+
+    def _changes(self, transitions):
+        for collection, targets in transitions.items():
+            for target, counter in (("ACTIVE", "activated"), ("INACTIVE", "deactivated"), ("OFFLOADED", "offloaded")):
+                if targets[target]:
+                    yield collection, targets[target], target, counter
+
+    def apply(self, transitions):
+        self._require(asynchronous=False)
+        for collection, tenants, target, counter in self._changes(transitions):
+            self._update(collection, tenants, target)
+            self.stats[counter] += len(tenants)
+
+    async def aapply(self, transitions):
+        """apply() for an async client."""
+        self._require(asynchronous=True)
+        for collection, tenants, target, counter in self._changes(transitions):
+            await self._aupdate(collection, tenants, target)
+            self.stats[counter] += len(tenants)
+
+    def _next_plan(self, now):
+        transitions = self.plan(now)
+        self.stats["predicted"] += sum(len(t["ACTIVE"]) for t in transitions.values())
+        return transitions
+
+    def run_once(self, now=None):
+        if self.stats["cycles"] % self.refresh_every == 0:
+            self.refresh()
+        self.flush_activations()
+        transitions = self._next_plan(now)
+        self.apply(transitions)
+        self.stats["cycles"] += 1
+        return transitions
+
+    async def arun_once(self, now=None):
+        """run_once() for an async client."""
+        if self.stats["cycles"] % self.refresh_every == 0:
+            await self.arefresh()
+        await self.aflush_activations()
+        transitions = self._next_plan(now)
+        await self.aapply(transitions)
+        self.stats["cycles"] += 1
+        return transitions
+
+    def active_usage(self):
+        with self._lock:
+            return sum(self.size_of(*key) for key, value in self.status.items() if value == "ACTIVE")
+
+    # Background loop
+
+    def start(self, interval=60.0):
+        self._require(asynchronous=False)
+
+        def loop():
+            while not self._stop.wait(interval):
+                try:
+                    self.run_once()
+                except Exception as e:
+                    print(f"Tenant temperature cycle failed: {e}")
+        self._stop.clear()
+        self._thread = threading.Thread(target=loop, name="tenant-temperature", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    async def arun(self, interval=60.0):
+        """Background loop for an async client; run it as a task and cancel the task to stop."""
+        self._require(asynchronous=True)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.arun_once()
+            except Exception as e:
+                print(f"Tenant temperature cycle failed: {e}")
+
+
+class FakeTenantsAPI:
+    """
+    In-memory stand-in for collection.tenants (get / update) of several collections,
+    counting update calls; client.collections.use(name).tenants works on it. With
+    asynchronous=True, get() and update() are coroutines, as on a WeaviateAsyncClient.
+    """
+
+    def __init__(self, tenants_by_collection, status="ACTIVE", asynchronous=False):
+        self.tenants = {name: dict.fromkeys(tenants, status) for name, tenants in tenants_by_collection.items()}
+        self.update_calls = 0
+        fake = self
+
+        class _Tenants:
+            def __init__(self, name):
+                self.name = name
+
+            def get(self):
+                return {tenant: Tenant(name=tenant, activity_status=getattr(TenantActivityStatus, value))
+                        for tenant, value in fake.tenants[self.name].items()}
+
+            def update(self, tenants):
+                if len(tenants) > UPDATE_CHUNK:
+                    raise ValueError(f"At most {UPDATE_CHUNK} tenants per update")
+                fake.update_calls += 1
+                for tenant in tenants:
+                    fake.tenants[self.name][tenant.name] = _status(tenant)
+
+        class _AsyncTenants(_Tenants):
+            async def get(self):
+                return _Tenants.get(self)
+
+            async def update(self, tenants):
+                _Tenants.update(self, tenants)
+
+        class _Collection:
+            def __init__(self, name):
+                self.tenants = (_AsyncTenants if asynchronous else _Tenants)(name)
+
+        class _Collections:
+            def use(self, name):
+                return _Collection(name)
+
+        self.collections = _Collections()
+        if asynchronous:
+            async def connect():
+                pass
+            self.connect = connect    # how is_async_client() recognizes a stand-in
+
+    def active(self, collection):
+        return sum(value == "ACTIVE" for value in self.tenants[collection].values())
+
+
+def simulate(tenants=5000, budget=1500, days=5, requests_per_minute=100, policy="lru",
+             offload_after_hours=24, cycle_minutes=5, predict=True, activation_seconds=1, seed=7,
+             asynchronous=False):
+    """
+    Simulated days of Zipf-distributed traffic where each tenant is busy during its own
+    8-hour window, against a FakeTenantsAPI (every tenant ACTIVE at the start); prints RAM
+    (active tenants), cold starts and update calls per day. An activation is assumed to take
+    `activation_seconds`: cold starts within that time are group-committed into one update.
+
+    With asynchronous=True the fake API is async and the manager runs the async path:
+    cold starts schedule activation tasks on the event loop and cycles use arun_once().
+    """
+    return asyncio.run(_simulate(tenants, budget, days, requests_per_minute, policy, offload_after_hours,
+                                 cycle_minutes, predict, activation_seconds, seed, asynchronous))
+
+
+async def _simulate(tenants, budget, days, requests_per_minute, policy, offload_after_hours,
+                    cycle_minutes, predict, activation_seconds, seed, asynchronous):
+    rng = random.Random(seed)
+    names = [f"tenant{i:06d}" for i in range(tenants)]
+    weights = [1.0 / (rank + 1) ** 1.1 for rank in range(tenants)]
+    home_hour = [rng.randrange(24) for _ in range(tenants)]
+    awake = []
+    for hour in range(24):
+        members = [i for i in range(tenants) if (hour - home_hour[i]) % 24 < 8]
+        cumulative, total = [], 0.0
+        for i in members:
+            total += weights[i]
+            cumulative.append(total)
+        awake.append((members, cumulative))
+
+    clock = [0.0]
+    api = FakeTenantsAPI({"Documents": names}, asynchronous=asynchronous)
+    tracker = TenantAccessTracker(clock=lambda: clock[0])
+    manager = TenantTemperatureManager(api, ["Documents"], tracker, budget=budget, policy=policy,
+                                       min_active_seconds=1800, offload_after=offload_after_hours * 3600,
+                                       predict=predict, activate_on_miss=True if asynchronous else "queue",
+                                       refresh_every=10 ** 9)
+    ticks = max(60 // activation_seconds, 1)
+    print(f"{'day':>4} {'requests':>9} {'cold starts':>12} {'miss updates':>13} {'peak active':>12} "
+          f"{'end active':>11} {'offloaded':>10} {'update calls':>13}")
+    for day in range(days):
+        cold_before, calls_before = manager.stats["cold_starts"], api.update_calls
+        miss_updates = peak = 0
+        for minute in range(24 * 60):
+            members, cumulative = awake[minute // 60]
+            requests = rng.choices(members, cum_weights=cumulative, k=requests_per_minute)
+            for tick in range(ticks):
+                clock[0] = day * 86400 + minute * 60 + tick * 60 / ticks
+                for index in requests[tick * len(requests) // ticks:(tick + 1) * len(requests) // ticks]:
+                    tracker.access("Documents", names[index])
+                calls = api.update_calls
+                if asynchronous:
+                    # Let the activation tasks scheduled by this tick's cold starts run
+                    while manager._tasks:
+                        await asyncio.sleep(0)
+                else:
+                    manager.flush_activations()
+                miss_updates += api.update_calls - calls
+            if minute % cycle_minutes == 0:
+                if asynchronous:
+                    await manager.arun_once()
+                else:
+                    manager.run_once()
+            peak = max(peak, api.active("Documents"))
+        offloaded = sum(value == "OFFLOADED" for value in api.tenants["Documents"].values())
+        print(f"{day + 1:>4} {requests_per_minute * 1440:>9} {manager.stats['cold_starts'] - cold_before:>12} "
+              f"{miss_updates:>13} {peak:>12} {api.active('Documents'):>11} {offloaded:>10} "
+              f"{api.update_calls - calls_before:>13}")
+    print(f"Budget {budget} of {tenants} tenants; {manager.stats}")
+    return manager.stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Access-driven tenant temperature management")
+    parser.add_argument("--simulate", action="store_true", help="Run against a fake tenants API")
+    parser.add_argument("--tenants", type=int, default=5000)
+    parser.add_argument("--budget", type=int, default=1500, help="Maximum ACTIVE tenants")
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--requests-per-minute", type=int, default=100)
+    parser.add_argument("--policy", choices=["lru", "lfu"], default="lru")
+    parser.add_argument("--offload-after-hours", type=float, default=24)
+    parser.add_argument("--no-predict", action="store_true", help="Disable pre-activation")
+    parser.add_argument("--async", dest="asynchronous", action="store_true",
+                        help="Simulate an async client (activation tasks on the event loop)")
+    args = parser.parse_args()
+
+    if args.simulate:
+        simulate(args.tenants, args.budget, args.days, args.requests_per_minute, args.policy,
+                 args.offload_after_hours, predict=not args.no_predict, asynchronous=args.asynchronous)
+    else:
+        parser.print_help()
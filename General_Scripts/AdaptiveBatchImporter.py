@@ -0,0 +1,357 @@
+"""
+Adaptive batch importer: tunes batch_size and concurrent_requests from observed latency.
+
+Optimization_Guides/Batching.md describes a manual loop: watch the import, raise
+concurrent_requests (6 -> 8 -> 12) while the cluster has headroom, then raise batch_size,
+and back off when requests time out. This script automates that loop with AIMD
+(additive increase, multiplicative decrease), the same scheme TCP uses for congestion:
+
+- Every `window` batches the controller looks at the p90 round-trip latency, the
+  error/timeout rate and the objects/sec achieved.
+- Healthy window (no timeouts, p90 under target): additive increase. Concurrency is
+  raised first, then batch size, exactly like the guide's decision tree.
+- Timeouts, errors or p90 over target: multiplicative decrease of both knobs.
+- If an increase did not improve objects/sec, it is undone and that knob is left alone;
+  the next probes go to the other knob. Once neither helps, the controller holds for
+  a few windows and then starts probing again.
+
+Batches are sent with collection.data.insert_many() from a thread pool, so each
+request's latency is measured directly. Batches that fail as a whole (timeouts,
+unavailable nodes) are split and retried; per-object errors are collected.
+
+Usage:
+    with AdaptiveBatcher(weaviate_sender(collection)) as batch:
+        for row in rows:
+            batch.add_object(properties=row["props"], vector=row.get("vector"), uuid=row.get("uuid"))
+    print(batch.summary())
+
+    python AdaptiveBatchImporter.py --simulate   # tune against a local fake server
+"""
+import argparse
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from weaviate.classes.data import DataObject
+
+
+class AIMDController:
+    """
+    Decide batch_size and concurrency from per-batch latency and error feedback.
+
+    Thread-safe: record() is called from the sender threads.
+    """
+
+    def __init__(
+        self,
+        batch_size=100,
+        concurrency=2,
+        min_batch_size=10,
+        max_batch_size=1000,
+        min_concurrency=1,
+        max_concurrency=16,
+        target_latency=5.0,
+        window=8,
+        batch_size_step=50,
+        decrease_factor=0.5,
+        max_error_rate=0.0,
+        hold_windows=5,
+    ):
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.target_latency = target_latency
+        self.window = window
+        self.batch_size_step = batch_size_step
+        self.decrease_factor = decrease_factor
+        self.max_error_rate = max_error_rate
+        self.hold_windows = hold_windows
+
+        self.history = []           # (time, batch_size, concurrency, objects/sec, p90, reason)
+        self._lock = threading.Lock()
+        self._samples = []          # (latency, objects, failed) of the current window
+        self._window_started = time.perf_counter()
+        self._last_throughput = 0.0
+        self._last_increase = None  # ("concurrency" | "batch_size", previous value)
+        self._saturated = set()     # knobs whose last increase did not pay off
+        self._hold = 0
+
+    def record(self, latency, objects, failed=False):
+        """Record one batch request: its round-trip seconds, size, and whether it failed as a whole."""
+        with self._lock:
+            self._samples.append((latency, objects, failed))
+            # Every in-flight slot should contribute to a window, or throughput is just noise
+            if len(self._samples) >= max(self.window, 2 * self.concurrency):
+                self._adjust()
+
+    def _adjust(self):
+        samples, self._samples = self._samples, []
+        elapsed = max(time.perf_counter() - self._window_started, 1e-9)
+        self._window_started = time.perf_counter()
+
+        latencies = sorted(latency for latency, _, _ in samples)
+        p90 = latencies[min(int(len(latencies) * 0.9), len(latencies) - 1)]
+        error_rate = sum(failed for _, _, failed in samples) / len(samples)
+        throughput = sum(objects for _, objects, failed in samples if not failed) / elapsed
+
+        if error_rate > self.max_error_rate or p90 > self.target_latency:
+            reason = f"decrease (errors {error_rate:.0%}, p90 {p90:.2f}s)"
+            self.batch_size = max(self.min_batch_size, int(self.batch_size * self.decrease_factor))
+            self.concurrency = max(self.min_concurrency, int(self.concurrency * self.decrease_factor))
+            self._last_increase = None
+            self._saturated.clear()
+            self._hold = self.hold_windows
+        elif self._last_increase and throughput < self._last_throughput * 1.02:
+            # The last probe bought nothing: undo it and try the other knob next
+            knob, previous = self._last_increase
+            setattr(self, knob, previous)
+            reason = f"revert {knob} (no throughput gain)"
+            self._last_increase = None
+            self._saturated.add(knob)
+            if len(self._saturated) == 2:
+                self._saturated.clear()
+                self._hold = self.hold_windows
+        elif self._hold:
+            self._hold -= 1
+            reason = "hold"
+        elif self.concurrency < self.max_concurrency and "concurrency" not in self._saturated:
+            self._last_increase = ("concurrency", self.concurrency)
+            self.concurrency += 1
+            reason = "increase concurrency"
+        elif self.batch_size < self.max_batch_size and "batch_size" not in self._saturated:
+            self._last_increase = ("batch_size", self.batch_size)
+            self.batch_size = min(self.max_batch_size, self.batch_size + self.batch_size_step)
+            reason = "increase batch_size"
+        else:
+            self._last_increase = None
+            reason = "at maximum"
+
+        if reason != "hold":
+            self._last_throughput = throughput
+        self.history.append((time.time(), self.batch_size, self.concurrency, throughput, p90, reason))
+
+
+def weaviate_sender(collection):
+    """
+    Send function for AdaptiveBatcher backed by collection.data.insert_many().
+
+    Returns the per-object errors of the request; timeouts and connection errors raise
+    and are handled (split + retry) by the batcher.
+    """
+    def send(objects):
+        result = collection.data.insert_many(
+            [DataObject(properties=obj["properties"], vector=obj.get("vector"), uuid=obj.get("uuid"))
+             for obj in objects]
+        )
+        return [(objects[index], error.message) for index, error in result.errors.items()]
+    return send
+
+
+class AdaptiveBatcher:
+    """
+    Batch context manager whose batch size and concurrency follow an AIMDController.
+
+    `send(objects) -> [(object, error message), ...]` performs one batch request;
+    see weaviate_sender(). Each object is a dict with properties / vector / uuid.
+    """
+
+    def __init__(self, send, controller=None, max_retries=3):
+        self.send = send
+        self.controller = controller or AIMDController()
+        self.max_retries = max_retries
+        self.failed_objects = []
+        self.objects_sent = 0
+        self.requests = 0
+        self.request_failures = 0
+        self._buffer = []
+        self._in_flight = 0
+        self._retries = []          # heap of (due time, sequence, objects, attempt)
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._executor = None
+        self._started = None
+        self._elapsed = 0.0
+
+    def __enter__(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.controller.max_concurrency)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._buffer:
+            self._submit(self._buffer)
+            self._buffer = []
+        # Wait for the requests in flight and send the retries they schedule, until both are done
+        while True:
+            with self._condition:
+                if not self._retries:
+                    if self._in_flight == 0:
+                        break
+                    self._condition.wait()
+                    continue
+                delay = self._retries[0][0] - time.perf_counter()
+                if delay > 0:
+                    self._condition.wait(timeout=delay)
+                    continue
+                _, _, objects, attempt = heapq.heappop(self._retries)
+            self._submit(objects, attempt)
+        self._executor.shutdown(wait=True)
+        self._elapsed = time.perf_counter() - self._started
+
+    def add_object(self, properties, vector=None, uuid=None):
+        self._buffer.append({"properties": properties, "vector": vector, "uuid": uuid})
+        if len(self._buffer) >= self.controller.batch_size:
+            self._submit(self._buffer)
+            self._buffer = []
+        self._submit_due_retries()
+
+    def _submit(self, objects, attempt=0):
+        # Only the producer thread submits and blocks here: workers never wait for a slot,
+        # so a slot is always freed by a request that is really running
+        with self._condition:
+            self._condition.wait_for(lambda: self._in_flight < self.controller.concurrency)
+            self._in_flight += 1
+        future = self._executor.submit(self._send, objects, attempt)
+        future.add_done_callback(lambda done: self._check(done, objects))
+
+    def _submit_due_retries(self):
+        while True:
+            with self._condition:
+                if not self._retries or self._retries[0][0] > time.perf_counter():
+                    return
+                _, _, objects, attempt = heapq.heappop(self._retries)
+            self._submit(objects, attempt)
+
+    def _check(self, future, objects):
+        # _send handles request errors itself; anything else raised there must not lose the objects
+        error = future.exception()
+        if error is not None:
+            with self._condition:
+                self.failed_objects.extend((obj, f"{type(error).__name__}: {error}") for obj in objects)
+
+    def _send(self, objects, attempt):
+        started = time.perf_counter()
+        try:
+            try:
+                errors = self.send(objects)
+            except Exception as e:
+                self.controller.record(time.perf_counter() - started, len(objects), failed=True)
+                with self._condition:
+                    self.requests += 1
+                    self.request_failures += 1
+                self._schedule_retry(objects, attempt, e)
+                return
+            self.controller.record(time.perf_counter() - started, len(objects))
+            with self._condition:
+                self.requests += 1
+                self.objects_sent += len(objects) - len(errors)
+                self.failed_objects.extend(errors)
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def _schedule_retry(self, objects, attempt, error):
+        if attempt >= self.max_retries:
+            with self._condition:
+                self.failed_objects.extend((obj, str(error)) for obj in objects)
+            return
+        # A whole-request failure usually means the payload was too heavy: retry in halves
+        # after a backoff; the producer thread (add_object / __exit__) sends them when due
+        due = time.perf_counter() + min(2 ** attempt * 0.5, 10)
+        middle = max(len(objects) // 2, 1)
+        with self._condition:
+            for part in (objects[:middle], objects[middle:]):
+                if part:
+                    heapq.heappush(self._retries, (due, next(self._sequence), part, attempt + 1))
+            self._condition.notify_all()
+
+    def summary(self):
+        elapsed = self._elapsed or (time.perf_counter() - self._started)
+        return {
+            "objects": self.objects_sent,
+            "failed": len(self.failed_objects),
+            "requests": self.requests,
+            "request_failures": self.request_failures,
+            "seconds": round(elapsed, 2),
+            "objects_per_sec": round(self.objects_sent / elapsed, 1) if elapsed else 0.0,
+            "final_batch_size": self.controller.batch_size,
+            "final_concurrency": self.controller.concurrency,
+        }
+
+
+class FakeBatchServer:
+    """
+    Local stand-in for a Weaviate node, to exercise the controller without a cluster.
+
+    Latency grows with the payload size and, once more than `capacity` requests are in
+    flight, with the overload. Requests slower than `timeout` fail like a gRPC deadline.
+    """
+
+    def __init__(self, base_latency=0.02, per_object_latency=0.0002, capacity=6, timeout=1.0, jitter=0.1):
+        self.base_latency = base_latency
+        self.per_object_latency = per_object_latency
+        self.capacity = capacity
+        self.timeout = timeout
+        self.jitter = jitter
+        self.stored = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def send(self, objects):
+        with self._lock:
+            self._in_flight += 1
+            overload = max(self._in_flight / self.capacity, 1.0)
+        try:
+            latency = (self.base_latency + self.per_object_latency * len(objects)) * overload ** 2
+            latency *= 1 + random.uniform(-self.jitter, self.jitter)
+            if latency > self.timeout:
+                time.sleep(self.timeout)
+                raise TimeoutError(f"Deadline exceeded after {self.timeout}s")
+            time.sleep(latency)
+            with self._lock:
+                self.stored += len(objects)
+            return []
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
+def simulate(objects=200000, **server_options):
+    """Import synthetic objects into a FakeBatchServer and print how the knobs evolved."""
+    server = FakeBatchServer(**server_options)
+    controller = AIMDController(batch_size=50, concurrency=1, target_latency=server.timeout / 2)
+    with AdaptiveBatcher(server.send, controller) as batch:
+        for i in range(objects):
+            batch.add_object(properties={"index": i})
+
+    for _, batch_size, concurrency, throughput, p90, reason in controller.history:
+        print(f"batch_size={batch_size:>5} concurrency={concurrency:>3} "
+              f"{throughput:>9.0f} obj/s p90={p90:.3f}s  {reason}")
+    summary = batch.summary()
+    print(summary)
+    assert server.stored + summary["failed"] == objects
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Adaptive (AIMD) batch import")
+    parser.add_argument("--simulate", action="store_true", help="Run against a local fake server")
+    parser.add_argument("--objects", type=int, default=200000)
+    parser.add_argument("--latency", type=float, default=0.02, help="Fake server base latency (s)")
+    parser.add_argument("--per-object-latency", type=float, default=0.0002, help="Fake server cost per object (s)")
+    parser.add_argument("--capacity", type=int, default=6, help="Fake server concurrent requests before degrading")
+    parser.add_argument("--timeout", type=float, default=1.0, help="Fake server request deadline (s)")
+    args = parser.parse_args()
+
+    if args.simulate:
+        simulate(args.objects, base_latency=args.latency, per_object_latency=args.per_object_latency,
+                 capacity=args.capacity, timeout=args.timeout)
+    else:
+        parser.print_help()
@@ -0,0 +1,408 @@
+"""
+Bulk read-modify-write updater: partial updates for millions of objects through batch upserts.
+
+update_object() in Weaviate_Operations/CRUD/update.ipynb sends one data.update() request
+per object, i.e. tens of updates per second. This engine works in pages:
+
+1. Work comes from either
+   - a filter (or the whole collection): UUIDs are listed with after= cursor pages and
+     each page is narrowed to the matching objects with the filter plus
+     Filter.by_id().contains_any(page), because a cursor cannot be combined with filters;
+   - or a stream of (uuid, patch) pairs, read in chunks and fetched by contains_any().
+2. Each page is handled by a worker thread: it reads the full objects (properties,
+   vectors and cross-references), applies the patch dict or a user callable, and writes
+   the changed objects back with one data.insert_many() call. Same UUIDs, vectors and
+   references are sent, so the upsert replaces the object in place and nothing is
+   re-vectorized. Objects the patch does not change are not written.
+3. A JSON checkpoint records the cursor (or stream offset) up to which every page has
+   been written, so an interrupted run resumes where it stopped.
+
+dry_run=True reads and patches everything but writes nothing, and reports how many
+objects would be updated, are unchanged, skipped or missing.
+
+Each UUID should appear only once in a (uuid, patch) stream: pages run concurrently.
+
+Usage:
+    python BulkUpdater.py --url <CLOUD_URL> --key <API_KEY> --collection Article \
+        --where category=news --set reviewed=true --checkpoint backfill.json --dry-run
+    python BulkUpdater.py --url <CLOUD_URL> --key <API_KEY> --collection Article --patches patches.jsonl
+
+    updater = BulkUpdater(collection, workers=8, checkpoint_path="backfill.json")
+    updater.update_where(Filter.by_property("lang").equal("en"), lambda props, obj: {"title": props["title"].strip()})
+"""
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import weaviate
+from weaviate.classes.config import DataType
+from weaviate.classes.data import DataObject, DataReference
+from weaviate.classes.query import Filter, QueryNested, QueryReference
+from weaviate.collections.classes.internal import ReferenceToMulti
+from weaviate.collections.classes.types import PhoneNumber
+
+OUTCOMES = ["updated", "unchanged", "skipped", "missing", "failed"]
+
+
+def _writable(value):
+    # Phone numbers come back as _PhoneNumber (with parsed fields) but are written as PhoneNumber
+    if hasattr(value, "international_formatted"):
+        return PhoneNumber(number=value.number, default_country=value.default_country)
+    return value
+
+
+def _vector_of(obj):
+    vector = obj.vector or None
+    if vector and list(vector) == ["default"]:
+        return vector["default"]
+    return vector
+
+
+def _return_properties(properties):
+    # Every property by name, nested objects spelled out: the server's default set leaves
+    # out blob properties, and an upsert without them would erase the stored blobs
+    return [
+        QueryNested(name=prop.name, properties=_return_properties(prop.nested_properties))
+        if prop.data_type in (DataType.OBJECT, DataType.OBJECT_ARRAY) and prop.nested_properties
+        else prop.name
+        for prop in properties
+    ]
+
+
+def _apply(patch, properties, obj):
+    """Return the patched properties, or None when the object should be skipped."""
+    changes = patch(dict(properties), obj) if callable(patch) else patch
+    if changes is None:
+        return None
+    return {**properties, **changes}
+
+
+class Checkpoint:
+    """Cursor / offset of the last fully written page, saved atomically as JSON."""
+
+    def __init__(self, path):
+        self.path = path
+        self.state = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.state = json.load(f)
+
+    def save(self, **state):
+        self.state.update(state)
+        if self.path:
+            temporary = f"{self.path}.tmp"
+            with open(temporary, "w") as f:
+                json.dump(self.state, f)
+            os.replace(temporary, self.path)
+
+
+class BulkUpdater:
+    def __init__(self, collection, workers=8, page_size=500, checkpoint_path=None, dry_run=False,
+                 max_retries=3, progress_interval=10.0):
+        self.collection = collection
+        self.workers = workers
+        self.page_size = page_size
+        self.dry_run = dry_run
+        self.max_retries = max_retries
+        self.progress_interval = progress_interval
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.stats = Counter()
+        self.errors = []
+        self.examples = []             # (uuid, before, after) of the first changes, for dry runs
+        self._lock = threading.Lock()
+        config = collection.config.get()
+        self._references = self._reference_properties(config)
+        self._properties = _return_properties(config.properties)
+
+    def _reference_properties(self, config):
+        # {name: [target collections]}; references must be re-sent or the upsert drops them
+        return {ref.name: list(ref.target_collections) for ref in (config.references or [])}
+
+    # Reading
+
+    def _fetch(self, ids, filters=None):
+        id_filter = Filter.by_id().contains_any(ids)
+        response = self.collection.query.fetch_objects(
+            filters=id_filter if filters is None else filters & id_filter,
+            limit=len(ids),
+            include_vector=True,
+            return_properties=self._properties,
+            return_references=[QueryReference(link_on=name, return_properties=[]) for name in self._references]
+            or None,
+        )
+        return {str(obj.uuid): obj for obj in response.objects}
+
+    def _references_of(self, obj):
+        """(references for the upsert, extra multi-target references to add afterwards)."""
+        references, extra = {}, []
+        for name, targets in self._references.items():
+            linked = (obj.references or {}).get(name)
+            if linked is None:
+                continue
+            by_collection = {}
+            for target in linked.objects:
+                by_collection.setdefault(target.collection, []).append(target.uuid)
+            if len(targets) == 1:
+                references[name] = [u for uuids in by_collection.values() for u in uuids]
+                continue
+            groups = list(by_collection.items())
+            if groups:
+                references[name] = ReferenceToMulti(target_collection=groups[0][0], uuids=groups[0][1])
+            extra += [DataReference.MultiTarget(from_property=name, from_uuid=obj.uuid, to_uuid=uuids,
+                                                target_collection=collection) for collection, uuids in groups[1:]]
+        return references, extra
+
+    # Writing
+
+    def _write(self, objects, extra_references):
+        for attempt in range(self.max_retries + 1):
+            try:
+                result = self.collection.data.insert_many(objects)
+                break
+            except Exception:
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(min(2 ** attempt, 10))
+        failed = {objects[index].uuid: error.message for index, error in result.errors.items()}
+        extra_references = [ref for ref in extra_references if ref.from_uuid not in failed]
+        if extra_references:
+            # The objects were written, but without these links they are not fully updated
+            result = self.collection.data.reference_add_many(extra_references)
+            for index, error in result.errors.items():
+                failed.setdefault(extra_references[index].from_uuid, error.message)
+        return failed
+
+    def _process(self, ids, patches, filters=None):
+        """Read, patch and write one page; `patches` maps uuid -> patch (dict or callable)."""
+        counts = Counter()
+        objects = self._fetch(ids, filters)
+        if filters is None:
+            counts["missing"] += len(set(ids) - set(objects))
+        to_write, extra_references = [], []
+        for object_id, obj in objects.items():
+            properties = {name: _writable(value) for name, value in obj.properties.items()}
+            patched = _apply(patches[object_id], properties, obj)
+            if patched is None:
+                counts["skipped"] += 1
+                continue
+            if patched == properties:
+                counts["unchanged"] += 1
+                continue
+            references, extra = self._references_of(obj)
+            to_write.append(DataObject(properties=patched, uuid=obj.uuid, vector=_vector_of(obj),
+                                       references=references or None))
+            extra_references += extra
+            if len(self.examples) < 5:
+                with self._lock:
+                    self.examples.append((object_id, properties, patched))
+
+        if self.dry_run or not to_write:
+            counts["updated"] += len(to_write)
+            return counts, []
+        failed = self._write(to_write, extra_references)
+        counts["updated"] += len(to_write) - len(failed)
+        counts["failed"] += len(failed)
+        return counts, list(failed.values())[:3]
+
+    # Driving
+
+    def _run(self, pages, position_key):
+        """
+        Process (position, ids, patches, filters) pages with bounded concurrency; the
+        checkpoint advances to the last position of the contiguous prefix of finished pages.
+        """
+        started = last_report = time.perf_counter()
+        pending = {}
+        finished = {}
+        next_to_commit = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            def drain(block_until):
+                nonlocal next_to_commit
+                while len(pending) > block_until:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        sequence, position, size = pending.pop(future)
+                        try:
+                            counts, errors = future.result()
+                        except Exception as e:
+                            counts, errors = Counter(failed=size), [str(e)]
+                        with self._lock:
+                            self.stats.update(counts)
+                            self.errors += errors[:max(10 - len(self.errors), 0)]
+                        # A page with failures keeps the checkpoint behind it, so a re-run retries it
+                        finished[sequence] = (position, counts["failed"] == 0)
+                    while next_to_commit in finished and finished[next_to_commit][1]:
+                        position, _ = finished.pop(next_to_commit)
+                        next_to_commit += 1
+                        if not self.dry_run:
+                            self.checkpoint.save(**{position_key: position}, stats=dict(self.stats))
+
+            for sequence, (position, ids, patches, filters) in enumerate(pages):
+                with self._lock:
+                    self.stats["read"] += len(ids)
+                pending[executor.submit(self._process, ids, patches, filters)] = (sequence, position, len(ids))
+                drain(self.workers * 2)
+                if time.perf_counter() - last_report >= self.progress_interval:
+                    last_report = time.perf_counter()
+                    self._print_progress(started)
+            drain(0)
+
+        elapsed = time.perf_counter() - started
+        totals = {outcome: self.stats[outcome] for outcome in OUTCOMES}
+        totals["read"] = self.stats["read"]
+        totals["seconds"] = round(elapsed, 1)
+        totals["updates_per_sec"] = round(totals["updated"] / elapsed, 1) if elapsed else 0.0
+        totals["dry_run"] = self.dry_run
+        return totals
+
+    def _print_progress(self, started):
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            stats = dict(self.stats)
+        print(f"[{elapsed:7.0f}s] read {stats.get('read', 0)}, updated {stats.get('updated', 0)} "
+              f"({stats.get('updated', 0) / elapsed:.0f}/s), unchanged {stats.get('unchanged', 0)}, "
+              f"failed {stats.get('failed', 0)}")
+
+    def update_where(self, filters, patch):
+        """Apply `patch` (dict, or callable(properties, obj) -> changes or None) to every object matching `filters`."""
+        after = self.checkpoint.state.get("after")
+        if after:
+            print(f"Resuming after {after}")
+
+        def pages():
+            cursor = after
+            while True:
+                response = self.collection.query.fetch_objects(after=cursor, limit=self.page_size,
+                                                               return_properties=[])
+                ids = [str(obj.uuid) for obj in response.objects]
+                if not ids:
+                    return
+                cursor = ids[-1]
+                yield cursor, ids, _Constant(patch), filters
+                if len(ids) < self.page_size:
+                    return
+
+        return self._run(pages(), "after")
+
+    def update_many(self, pairs):
+        """Apply a stream of (uuid, patch) pairs; on resume the first `offset` pairs are skipped."""
+        offset = self.checkpoint.state.get("offset", 0)
+        if offset:
+            print(f"Resuming at pair {offset}")
+
+        def pages():
+            position = 0
+            chunk = {}
+            for object_id, patch in pairs:
+                position += 1
+                if position <= offset:
+                    continue
+                # Fetched objects are keyed by canonical UUID strings (lowercase, hyphenated)
+                object_id = str(uuid.UUID(str(object_id)))
+                if object_id in chunk:
+                    chunk[object_id] = _chain(chunk[object_id], patch)
+                else:
+                    chunk[object_id] = patch
+                if len(chunk) >= self.page_size:
+                    yield position, list(chunk), chunk, None
+                    chunk = {}
+            if chunk:
+                yield position, list(chunk), chunk, None
+
+        return self._run(pages(), "offset")
+
+    def print_report(self, totals):
+        mode = "DRY RUN: would update" if self.dry_run else "Updated"
+        print(f"\n{mode} {totals['updated']} objects of {totals['read']} read in {totals['seconds']}s "
+              f"({totals['updates_per_sec']}/s); unchanged {totals['unchanged']}, skipped {totals['skipped']}, "
+              f"missing {totals['missing']}, failed {totals['failed']}")
+        for object_id, before, after in self.examples[:3]:
+            changed = {k: (before.get(k), v) for k, v in after.items() if before.get(k) != v}
+            print(f"  {object_id}: {changed}")
+        for error in self.errors[:5]:
+            print(f"  Error: {error}")
+
+
+class _Constant(dict):
+    # The same patch for every uuid of a filtered page
+    def __init__(self, patch):
+        super().__init__()
+        self.patch = patch
+
+    def __missing__(self, key):
+        return self.patch
+
+
+def _chain(first, second):
+    # Two patches for the same uuid in one chunk: apply them in order
+    def patch(properties, obj):
+        properties = _apply(first, properties, obj)
+        return None if properties is None else _apply(second, properties, obj)
+    return patch
+
+
+def _parse_value(text):
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+def _read_patches(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record["uuid"], record["patch"]
+
+
+def connect(url, key):
+    if url == "localhost":
+        return weaviate.connect_to_local(auth_credentials=weaviate.auth.AuthApiKey(api_key=key) if key else None)
+    return weaviate.connect_to_weaviate_cloud(
+        cluster_url=url,
+        auth_credentials=weaviate.auth.AuthApiKey(api_key=key),
+        skip_init_checks=True,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk partial updates through batch upserts")
+    parser.add_argument("--url", default=os.environ.get("WEAVIATE_URL", "localhost"))
+    parser.add_argument("--key", default=os.environ.get("WEAVIATE_API_KEY", ""))
+    parser.add_argument("--collection", required=True)
+    parser.add_argument("--tenant")
+    parser.add_argument("--where", nargs="*", default=[], metavar="PROP=VALUE",
+                        help="Equality filters (JSON values), combined with AND")
+    parser.add_argument("--set", nargs="*", default=[], metavar="PROP=VALUE", help="Properties to set (JSON values)")
+    parser.add_argument("--patches", help="JSONL file of {\"uuid\": ..., \"patch\": {...}} instead of --where/--set")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--checkpoint", help="JSON checkpoint file to resume from / write to")
+    parser.add_argument("--dry-run", action="store_true", help="Count what would change without writing")
+    args = parser.parse_args()
+
+    client = connect(args.url, args.key)
+    try:
+        target = client.collections.use(args.collection)
+        if args.tenant:
+            target = target.with_tenant(args.tenant)
+        updater = BulkUpdater(target, args.workers, args.page_size, args.checkpoint, args.dry_run)
+        if args.patches:
+            result = updater.update_many(_read_patches(args.patches))
+        else:
+            if not args.set:
+                parser.error("--set (or --patches) is required")
+            changes = {name: _parse_value(value) for name, value in (item.split("=", 1) for item in args.set)}
+            conditions = [Filter.by_property(name).equal(_parse_value(value))
+                          for name, value in (item.split("=", 1) for item in args.where)]
+            where = Filter.all_of(conditions) if len(conditions) > 1 else (conditions[0] if conditions else None)
+            result = updater.update_where(where, changes)
+        updater.print_report(result)
+    finally:
+        client.close()
@@ -1,6 +1,13 @@
 import weaviate
+import argparse
 import csv
+import json
+import os
+import time
+from collections import namedtuple
+from pathlib import Path
 from weaviate.classes.config import Configure, Property, DataType, Tokenization
+from weaviate.util import generate_uuid5
 
 # Global Weavaiate credentials and variables
 WEAVIATE_URL = "<URL>"
@@ -49,57 +56,426 @@ def create_collection(client, collection_name):
     )
     print(f"Collection '{collection_name}' created successfully.")
 
-def batch_upload(client, file_path, collection_name, batch_size=10):
+def _parse_bool(value):
+    return value.strip().lower() in ("true", "1", "yes", "y", "t")
+
+def _parse_array(value, item_parser):
+    # Arrays in CSV cells are either JSON lists or "|"-separated values
+    value = value.strip()
+    items = json.loads(value) if value.startswith("[") else value.split("|")
+    return [item_parser(item) if isinstance(item, str) else item for item in items]
+
+# How to turn a CSV cell (always a string) into the property's data type
+_CELL_PARSERS = {
+    DataType.TEXT: str,
+    DataType.UUID: str,
+    DataType.DATE: str,
+    DataType.INT: int,
+    DataType.NUMBER: float,
+    DataType.BOOL: _parse_bool,
+    DataType.TEXT_ARRAY: lambda value: _parse_array(value, str),
+    DataType.UUID_ARRAY: lambda value: _parse_array(value, str),
+    DataType.DATE_ARRAY: lambda value: _parse_array(value, str),
+    DataType.INT_ARRAY: lambda value: _parse_array(value, int),
+    DataType.NUMBER_ARRAY: lambda value: _parse_array(value, float),
+    DataType.BOOL_ARRAY: lambda value: _parse_array(value, _parse_bool),
+}
+
+def _parse_json_cell(value):
+    return json.loads(value) if isinstance(value, str) else value
+
+def detect_format(file_path):
+    suffix = Path(file_path).suffix.lower()
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if suffix in (".parquet", ".pq"):
+        return "parquet"
+    return "csv"
+
+# A block of parsed rows. `offsets` holds each row's start position and `end_offset`
+# the position right after the block: byte offsets for CSV / JSONL, row numbers for
+# Parquet. Seeking to end_offset resumes the file exactly after this block.
+RowBlock = namedtuple("RowBlock", ["rows", "offsets", "end_offset"])
+
+def _iter_lines(file, position):
+    # Decode a binary file line by line, tracking the bytes consumed in position[0]
+    for raw_line in iter(file.readline, b""):
+        position[0] += len(raw_line)
+        yield raw_line.decode("utf-8")
+
+def _iter_parquet_rows(file_path, block_size, start_offset):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise Exception("Parquet import requires pyarrow: pip install pyarrow")
+    parquet_file = pq.ParquetFile(file_path)
+
+    # Skip whole row groups before the resume point, then the rows before it
+    row_index, first_group = 0, 0
+    for first_group in range(parquet_file.num_row_groups):
+        group_rows = parquet_file.metadata.row_group(first_group).num_rows
+        if row_index + group_rows > start_offset:
+            break
+        row_index += group_rows
+    else:
+        return
+
+    row_groups = range(first_group, parquet_file.num_row_groups)
+    for record_batch in parquet_file.iter_batches(batch_size=block_size, row_groups=row_groups):
+        for row in record_batch.to_pylist():
+            if row_index >= start_offset:
+                yield row_index, row, row_index + 1
+            row_index += 1
+
+def _iter_text_rows(file_path, file_format, start_offset):
+    with open(file_path, mode='rb') as file:
+        position = [0]
+        header = None
+        if file_format == "csv":
+            header = [column.strip().lower() for column in next(csv.reader(_iter_lines(file, position)))]
+            # The csv module only asks for more lines mid-row, so nothing was read past the header
+            file.seek(position[0])
+        if start_offset > position[0]:
+            file.seek(start_offset)
+            position[0] = start_offset
+
+        lines = _iter_lines(file, position)
+        start = position[0]
+        if file_format == "csv":
+            for values in csv.reader(lines):
+                yield start, dict(zip(header, values)), position[0]
+                start = position[0]
+        else:
+            for line in lines:
+                if line.strip():
+                    yield start, json.loads(line), position[0]
+                start = position[0]
+
+def iter_row_blocks(file_path, block_size=10000, file_format=None, start_offset=0):
     """
-    Batch upload data from a CSV file into the specified collection.
+    Stream a CSV / JSONL / Parquet file as RowBlocks of at most block_size rows.
+
+    Only one block is held in memory at a time, whatever the file size. CSV headers
+    are normalized (stripped, lower-cased) like the original importer did. Pass the
+    end_offset of the last completed block as `start_offset` to resume after it: an
+    O(1) seek for CSV / JSONL, a row-group skip for Parquet.
+    """
+    file_format = file_format or detect_format(file_path)
+    if file_format == "parquet":
+        rows = _iter_parquet_rows(file_path, block_size, start_offset)
+    else:
+        rows = _iter_text_rows(file_path, file_format, start_offset)
+
+    block, offsets = [], []
+    for offset, row, end_offset in rows:
+        block.append(row)
+        offsets.append(offset)
+        if len(block) >= block_size:
+            yield RowBlock(block, offsets, end_offset)
+            block, offsets = [], []
+    if block:
+        yield RowBlock(block, offsets, end_offset)
+
+class RowMapper:
+    """
+    Map file rows to Weaviate objects using the collection's schema.
+
+    Columns are matched to properties case-insensitively; CSV string cells are converted
+    to the property's data type, empty cells are skipped and unknown columns ignored.
+    `vector_columns` maps a vector name (None for the default vector) to the column that
+    holds a precomputed vector, as a list or a JSON-encoded list.
+    """
+
+    def __init__(self, collection, vector_columns=None):
+        properties = collection.config.get().properties
+        self.vector_columns = dict(vector_columns or {})
+        vector_column_names = {column.lower() for column in self.vector_columns.values()}
+        self.properties = {
+            prop.name.lower(): (prop.name, _CELL_PARSERS.get(prop.data_type, _parse_json_cell))
+            for prop in properties
+            if prop.name.lower() not in vector_column_names
+        }
+        self._columns = {}
+
+    def _columns_of(self, row):
+        # Resolve column -> (property name, parser) once per distinct set of row keys
+        keys = tuple(row)
+        columns = self._columns.get(keys)
+        if columns is None:
+            columns = self._columns[keys] = [
+                (column, *self.properties[column.lower()])
+                for column in keys
+                if column.lower() in self.properties
+            ]
+        return columns
+
+    def properties_of(self, row):
+        properties = {}
+        for column, name, parser in self._columns_of(row):
+            value = row.get(column)
+            if value is None or value == "":
+                continue
+            properties[name] = parser(value) if isinstance(value, str) else value
+        return properties
+
+    def vector_of(self, row):
+        if not self.vector_columns:
+            return None
+        vectors = {name: _parse_json_cell(row[column]) for name, column in self.vector_columns.items()
+                   if row.get(column) not in (None, "")}
+        if list(vectors) == [None]:
+            return vectors[None]
+        return vectors or None
+
+class ImportCheckpoint:
+    """
+    Progress of one file import, persisted as a small JSON file.
+
+    Saved only after a batch context has been closed, i.e. when every object up to
+    `offset` has been answered by Weaviate (inserted, or written to the dead-letter
+    file). The file's size and mtime are recorded so a checkpoint is never applied to
+    a different version of the file.
+    """
+
+    def __init__(self, path, file_path):
+        self.path = Path(path)
+        stat = os.stat(file_path)
+        self.file_path = str(Path(file_path).resolve())
+        self.file_size = stat.st_size
+        self.file_mtime_ns = stat.st_mtime_ns
+        self.offset = 0
+        self.rows = 0
+        self.failed = 0
+
+    def load(self):
+        if not self.path.exists():
+            return self
+        with open(self.path) as file:
+            state = json.load(file)
+        if (state["file_path"], state["file_size"], state["file_mtime_ns"]) != (
+            self.file_path, self.file_size, self.file_mtime_ns
+        ):
+            raise Exception(f"Checkpoint {self.path} belongs to a different or modified file. "
+                            "Delete it to start over.")
+        self.offset, self.rows, self.failed = state["offset"], state["rows"], state["failed"]
+        return self
+
+    def save(self):
+        # Write-then-rename, so a crash never leaves a half-written checkpoint
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, "w") as file:
+            json.dump(vars(self) | {"path": str(self.path)}, file)
+        os.replace(temp_path, self.path)
+
+def write_dead_letters(dead_letter_path, failed_objects):
+    """Append failed objects (uuid, properties, vector, error) to a JSONL file for replay."""
+    with open(dead_letter_path, "a", encoding="utf-8") as file:
+        for failed_obj in failed_objects:
+            obj = failed_obj.object_
+            record = {
+                "uuid": str(obj.uuid),
+                "properties": obj.properties,
+                "vector": obj.vector,
+                "message": failed_obj.message,
+            }
+            file.write(json.dumps(record, default=str) + "\n")
+
+def row_uuid(collection_name, file_path, offset, row, id_column=None):
+    """
+    Deterministic object ID for a row, so replaying part of a file overwrites objects
+    instead of duplicating them: derived from the id column if given, otherwise from
+    the file name and the row's offset in it.
+    """
+    if id_column:
+        if id_column not in row:
+            # CSV headers are lower-cased while JSONL / Parquet keep theirs: match like RowMapper
+            key = id_column.strip().lower()
+            id_column = next((column for column in row if column.lower() == key), id_column)
+        return generate_uuid5(str(row[id_column]), collection_name)
+    return generate_uuid5(f"{Path(file_path).name}:{offset}", collection_name)
+
+def _report_failures(failed_objects, dead_letter_path):
+    if not failed_objects:
+        return
+    print(f"Number of failed objects: {len(failed_objects)}")
+    for i, failed_obj in enumerate(failed_objects[:10], 1):
+        print(f"Failed object {i}: {failed_obj.message}")
+    if dead_letter_path:
+        write_dead_letters(dead_letter_path, failed_objects)
+
+def import_file(client, file_path, collection_name, batch_size=100, concurrent_requests=2,
+                block_size=10000, vector_columns=None, file_format=None, tenant=None,
+                id_column=None, checkpoint_path=None, checkpoint_every=50000, dead_letter_path=None):
+    """
+    Stream a CSV / JSONL / Parquet file into a collection and print a throughput summary.
+
+    Rows are parsed in blocks and mapped to properties from the collection schema, so any
+    file whose columns match the collection can be imported without code changes.
+
+    Every row gets a deterministic UUID (see row_uuid()), so re-importing a range of the
+    file is idempotent. With `checkpoint_path`, the batch is drained every
+    `checkpoint_every` rows and the confirmed file offset is saved; running again with
+    the same checkpoint resumes right after it. Failed objects go to `dead_letter_path`
+    (JSONL) for replay_dead_letters(). Without a dead-letter file, the checkpoint stops
+    advancing at the first window with failures, so the next run sends them again.
+
+    Returns:
+        dict: rows sent, failed object count, elapsed seconds and rows per second
     """
     if not client.collections.exists(collection_name):
         raise Exception(f"Collection '{collection_name}' does not exist. Cannot insert data.")
 
-    failed_objects = []
+    collection = client.collections.use(collection_name)
+    if tenant:
+        collection = collection.with_tenant(tenant)
+    mapper = RowMapper(collection, vector_columns)
+
+    checkpoint = ImportCheckpoint(checkpoint_path, file_path).load() if checkpoint_path else None
+    start_offset = checkpoint.offset if checkpoint else 0
+    if start_offset:
+        print(f"Resuming '{file_path}' at offset {start_offset} ({checkpoint.rows} rows already imported)")
+    blocks = iter_row_blocks(file_path, block_size, file_format, start_offset)
+    window = checkpoint_every if checkpoint else float("inf")
 
+    rows = failed = 0
+    finished = False
+    held_back = False
+    started = time.perf_counter()
     try:
-        with open(file_path, mode='r', encoding='utf-8') as file:
-            csv_reader = csv.DictReader(file)
-            # Normalize column headers
-            csv_reader.fieldnames = [header.strip().lower() for header in csv_reader.fieldnames]
-
-            with client.batch.fixed_size(batch_size=100, concurrent_requests=2) as batch:
-                for i, row in enumerate(csv_reader):
-                    # Prepare object properties
-                    obj_properties = {
-                        "company_id": row.get("company_id", ""),
-                        "last_name": row.get("last_name", ""),
-                        "first_name": row.get("first_name", ""),
-                        "job_title": row.get("job_title", ""),
-                        "email_address": row.get("email_address", ""),
-                        "country": row.get("country", ""),
-                        "interaction_notes": row.get("interaction_notes", ""),
-                    }
-                    batch.add_object(
-                        properties=obj_properties,
-                        collection=collection_name
-                    )
-                print(f"Batch processing completed. {i + 1} objects added.")
+        while not finished:
+            # One batch context per checkpoint window: leaving it waits for every
+            # in-flight request, which is what makes the saved offset safe to resume from
+            window_rows = 0
+            with collection.batch.fixed_size(batch_size=batch_size, concurrent_requests=concurrent_requests) as batch:
+                for block in blocks:
+                    for offset, row in zip(block.offsets, block.rows):
+                        batch.add_object(
+                            properties=mapper.properties_of(row),
+                            vector=mapper.vector_of(row),
+                            uuid=row_uuid(collection_name, file_path, offset, row, id_column),
+                        )
+                    rows += len(block.rows)
+                    window_rows += len(block.rows)
+                    end_offset = block.end_offset
+                    elapsed = time.perf_counter() - started
+                    print(f"{rows} rows queued ({rows / elapsed:.0f} rows/sec)")
+                    if window_rows >= window:
+                        break
+                else:
+                    finished = True
+
+            # Failed objects are tracked per collection (and per batch context), not on the client
+            failed_objects = collection.batch.failed_objects
+            failed += len(failed_objects)
+            _report_failures(failed_objects, dead_letter_path)
+            if checkpoint and failed_objects and not dead_letter_path and not held_back:
+                # Advancing would skip these objects for good: keep the last offset at which
+                # everything before it was confirmed
+                held_back = True
+                print(f"Checkpoint held at offset {checkpoint.offset}: failed objects are not "
+                      f"dead-lettered, resuming will send them again")
+            if checkpoint and window_rows and not held_back:
+                checkpoint.offset = end_offset
+                checkpoint.rows += window_rows
+                checkpoint.failed += len(failed_objects)
+                checkpoint.save()
     except Exception as e:
         raise Exception(f"Batch insertion failed: {e}")
+    elapsed = time.perf_counter() - started
 
-    # Check for failed objects and reason behind to be printed out
-    failed_objects = client.batch.failed_objects
-    if failed_objects:
-        print(f"Number of failed objects: {len(failed_objects)}")
-        for i, failed_obj in enumerate(failed_objects, 1):
-            print(f"Failed object {i}: {failed_obj}")
-    else:
-        print(f"All objects successfully inserted into '{collection_name}'.")
+    summary = {
+        "rows": rows,
+        "failed": failed,
+        "seconds": round(elapsed, 2),
+        "rows_per_sec": round(rows / elapsed, 1) if elapsed else 0.0,
+    }
+    print(f"Import of '{file_path}' into '{collection_name}' finished: {summary}")
+    return summary
+
+def replay_dead_letters(client, collection_name, dead_letter_path, batch_size=100, concurrent_requests=2, tenant=None):
+    """
+    Re-send the objects of a dead-letter file with their original UUIDs and vectors.
+
+    Objects that fail again are written back to the dead-letter file, which is
+    removed once everything went through.
+    """
+    collection = client.collections.use(collection_name)
+    if tenant:
+        collection = collection.with_tenant(tenant)
+
+    replayed = 0
+    with collection.batch.fixed_size(batch_size=batch_size, concurrent_requests=concurrent_requests) as batch:
+        with open(dead_letter_path, encoding="utf-8") as file:
+            for line in file:
+                record = json.loads(line)
+                batch.add_object(properties=record["properties"], vector=record["vector"], uuid=record["uuid"])
+                replayed += 1
+
+    failed_objects = collection.batch.failed_objects
+    os.remove(dead_letter_path)
+    _report_failures(failed_objects, dead_letter_path)
+    print(f"Replayed {replayed} objects, {len(failed_objects)} failed again.")
+    return len(failed_objects)
+
+def batch_upload(client, file_path, collection_name, batch_size=100):
+    """
+    Batch upload data from a CSV file into the specified collection.
+    """
+    return import_file(client, file_path, collection_name, batch_size=batch_size)
+
+def _parse_vector_column(value):
+    # "embedding" -> default vector, "title_vector=title_embedding" -> named vector
+    name, _, column = value.rpartition("=")
+    return (name or None), column
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Stream a CSV / JSONL / Parquet file into a Weaviate collection")
+    parser.add_argument("file_path", help="Path to the .csv, .jsonl or .parquet file")
+    parser.add_argument("collection_name", help="Target collection")
+    parser.add_argument("--format", choices=["csv", "jsonl", "parquet"], help="Defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=100, help="Objects per batch request")
+    parser.add_argument("--concurrent-requests", type=int, default=2, help="Batch requests in flight")
+    parser.add_argument("--block-size", type=int, default=10000, help="Rows parsed per block")
+    parser.add_argument("--vector-column", action="append", default=[], type=_parse_vector_column,
+                        help="Column with a precomputed vector, or NAME=COLUMN for a named vector (repeatable)")
+    parser.add_argument("--tenant", help="Tenant to import into (multi-tenant collections)")
+    parser.add_argument("--id-column", help="Column whose value determines each object's UUID")
+    parser.add_argument("--checkpoint", help="Checkpoint file; an existing one resumes the import")
+    parser.add_argument("--checkpoint-every", type=int, default=50000, help="Rows between checkpoints")
+    parser.add_argument("--dead-letter", help="JSONL file that collects failed objects")
+    parser.add_argument("--replay-dead-letter", action="store_true",
+                        help="Re-send the objects in --dead-letter instead of importing file_path")
+    parser.add_argument("--create", action="store_true", help="Create the example collection first")
+    args = parser.parse_args()
+    if args.replay_dead_letter and not args.dead_letter:
+        parser.error("--replay-dead-letter requires --dead-letter")
+    return args
 
 if __name__ == "__main__":
-    collection_name = "<COLLECTION_NAME>"  # Update the collection name
-    CSV_FILE_PATH = "<PATH>.csv"  # Update this path when requires
+    args = parse_args()
     # Initialize the client
     client = initialize_client()
-    # Create the collection
-    create_collection(client, collection_name)
-    # Perform batch upload
-    batch_upload(client, CSV_FILE_PATH, collection_name)
-    
\ No newline at end of file
+    try:
+        if args.create:
+            create_collection(client, args.collection_name)
+        if args.replay_dead_letter:
+            replay_dead_letters(client, args.collection_name, args.dead_letter,
+                                args.batch_size, args.concurrent_requests, args.tenant)
+        else:
+            import_file(
+                client,
+                args.file_path,
+                args.collection_name,
+                batch_size=args.batch_size,
+                concurrent_requests=args.concurrent_requests,
+                block_size=args.block_size,
+                vector_columns=dict(args.vector_column),
+                file_format=args.format,
+                tenant=args.tenant,
+                id_column=args.id_column,
+                checkpoint_path=args.checkpoint,
+                checkpoint_every=args.checkpoint_every,
+                dead_letter_path=args.dead_letter,
+            )
+    finally:
+        client.close()
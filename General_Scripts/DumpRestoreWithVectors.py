@@ -0,0 +1,347 @@
+"""
+Dump collections (schema, objects and vectors) to disk and restore them without re-vectorizing.
+
+DumpSchemaFromSourceEndpointStepOne.py / DumpSchemaToNewEndpointStepTwo.py only move the
+schema, and the migration notebooks copy data live from cluster to cluster. This script
+writes a portable dump so a migration can be staged offline, and the restore passes the
+stored vectors to batch.add_object(vector=...) so the embedding provider is not paid twice.
+
+Dump layout:
+    <dump_dir>/manifest.json                        schema + shard list per collection / tenant
+    <dump_dir>/<Collection>/<tenant or _>/
+        objects-00000.jsonl                         one object per line: uuid, properties, vectors present,
+                                                    cross-references
+        vectors-00000.<vector name>.npy             float32 [objects, dim], row i = line i of the JSONL
+
+Vectors are stored column-wise per vector name in plain .npy files, written straight to
+disk while the dump streams (no shard is held in memory) and memory-mapped on restore.
+Objects without a given vector get a zero row and are marked in their "vectors" list.
+Multi-vectors (lists of vectors) do not fit a fixed-width column and stay in the JSONL.
+
+Every property is requested by name (the server's default set leaves out blob properties)
+and cross-references are dumped as (target collection, uuid) pairs. The restore sends them
+with each object, so re-running it replaces objects and their references instead of
+duplicating them; only multi-target references pointing into more than one collection
+need extra add_reference() calls, which a repeated restore does add again.
+
+Usage:
+    python DumpRestoreWithVectors.py dump --url <CLOUD_URL> --key <API_KEY> --dump-dir ./dump
+    python DumpRestoreWithVectors.py restore --url <CLOUD_URL> --key <API_KEY> --dump-dir ./dump
+    (use --url localhost [--port 8080] for local instances)
+"""
+import argparse
+import datetime
+import io
+import json
+import os
+import uuid
+
+import numpy as np
+import weaviate
+from weaviate.classes.config import DataType
+from weaviate.classes.query import QueryNested, QueryReference
+from weaviate.classes.tenants import Tenant
+from weaviate.collections.classes.internal import ReferenceToMulti
+from weaviate.collections.classes.types import GeoCoordinate, PhoneNumber
+
+# 2: objects carry cross-references and the manifest lists the reference properties
+DUMP_FORMAT_VERSION = 2
+READABLE_FORMATS = {1, 2}
+NPY_HEADER_SIZE = 128
+
+
+class NpyShardWriter:
+    """
+    Append float32 rows to a .npy file whose row count is only known at the end.
+
+    A fixed 128-byte header is reserved up front and rewritten with the final shape
+    on close(); NumPy pads version 1.0 headers to exactly that size for 2-D float32.
+    """
+
+    def __init__(self, path, dim):
+        self.path = path
+        self.dim = dim
+        self.rows = 0
+        self._file = open(path, "wb")
+        self._file.write(b"\0" * NPY_HEADER_SIZE)
+
+    def append(self, vector):
+        row = np.asarray(vector, dtype="<f4")
+        if row.shape[0] != self.dim:
+            raise ValueError(f"{self.path}: vector of dimension {row.shape[0]}, expected {self.dim}")
+        self._file.write(row.tobytes())
+        self.rows += 1
+
+    def append_missing(self):
+        # Placeholder row for an object without this vector
+        self._file.write(bytes(4 * self.dim))
+        self.rows += 1
+
+    def close(self):
+        header = io.BytesIO()
+        np.lib.format.write_array_header_1_0(
+            header, {"descr": "<f4", "fortran_order": False, "shape": (self.rows, self.dim)}
+        )
+        if len(header.getvalue()) != NPY_HEADER_SIZE:
+            raise ValueError(f"Unexpected .npy header size {len(header.getvalue())}")
+        self._file.seek(0)
+        self._file.write(header.getvalue())
+        self._file.close()
+
+
+def _json_default(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if hasattr(value, "model_dump"):   # GeoCoordinate, phone numbers
+        return value.model_dump()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _is_multi_vector(vector):
+    return len(vector) > 0 and isinstance(vector[0], (list, tuple, np.ndarray))
+
+
+class _ShardWriter:
+    """Writes one shard: the JSONL objects file plus one NpyShardWriter per vector name."""
+
+    def __init__(self, directory, index):
+        self.directory = directory
+        self.index = index
+        self.count = 0
+        self._objects = open(os.path.join(directory, f"objects-{index:05d}.jsonl"), "w", encoding="utf-8")
+        self._vectors = {}
+
+    def add(self, obj):
+        vectors = {}
+        multi_vectors = {}
+        for name, vector in (obj.vector or {}).items():
+            if _is_multi_vector(vector):
+                multi_vectors[name] = [list(map(float, v)) for v in vector]
+            else:
+                vectors[name] = vector
+
+        for name in set(vectors) | set(self._vectors):
+            writer = self._vectors.get(name)
+            if writer is None:
+                # First object of the shard with this vector: earlier objects get zero rows
+                writer = self._vectors[name] = NpyShardWriter(
+                    os.path.join(self.directory, f"vectors-{self.index:05d}.{name}.npy"), len(vectors[name])
+                )
+                for _ in range(self.count):
+                    writer.append_missing()
+            if name in vectors:
+                writer.append(vectors[name])
+            else:
+                writer.append_missing()
+
+        record = {"uuid": str(obj.uuid), "properties": obj.properties, "vectors": sorted(vectors)}
+        if multi_vectors:
+            record["multi_vectors"] = multi_vectors
+        references = {name: [[target.collection, str(target.uuid)] for target in linked.objects]
+                      for name, linked in (obj.references or {}).items() if linked.objects}
+        if references:
+            record["references"] = references
+        self._objects.write(json.dumps(record, default=_json_default) + "\n")
+        self.count += 1
+
+    def close(self):
+        self._objects.close()
+        for writer in self._vectors.values():
+            writer.close()
+        return {"index": self.index, "objects": self.count, "vector_names": sorted(self._vectors)}
+
+
+def _return_properties(properties):
+    # Every property by name, nested objects spelled out: the default set has no blobs
+    return [
+        QueryNested(name=prop.name, properties=_return_properties(prop.nested_properties))
+        if prop.data_type in (DataType.OBJECT, DataType.OBJECT_ARRAY) and prop.nested_properties
+        else prop.name
+        for prop in properties
+    ]
+
+
+def dump_stream(collection, directory, shard_size=100000, config=None):
+    """Dump one collection or tenant into `directory`; returns the shard list for the manifest."""
+    config = config or collection.config.get()
+    os.makedirs(directory, exist_ok=True)
+    shards = []
+    shard = None
+    references = [QueryReference(link_on=ref.name, return_properties=[]) for ref in (config.references or [])]
+    for obj in collection.iterator(include_vector=True, return_properties=_return_properties(config.properties),
+                                   return_references=references or None):
+        if shard is None:
+            shard = _ShardWriter(directory, len(shards))
+        shard.add(obj)
+        if shard.count >= shard_size:
+            shards.append(shard.close())
+            shard = None
+    if shard is not None:
+        shards.append(shard.close())
+    return shards
+
+
+def dump(client, dump_dir, collection_names=None, shard_size=100000):
+    """Dump schema, objects and vectors of the given collections (default: all)."""
+    os.makedirs(dump_dir, exist_ok=True)
+    manifest = {"format": DUMP_FORMAT_VERSION, "collections": {}}
+    for name in collection_names or list(client.collections.list_all().keys()):
+        collection = client.collections.use(name)
+        config = collection.config.get()
+        entry = {"schema": client.collections.export_config(name).to_dict(), "streams": [],
+                 "references": {ref.name: list(ref.target_collections) for ref in (config.references or [])}}
+        tenants = sorted(collection.tenants.get()) if config.multi_tenancy_config.enabled else [None]
+        for tenant in tenants:
+            scoped = collection.with_tenant(tenant) if tenant else collection
+            directory = os.path.join(dump_dir, name, tenant or "_")
+            shards = dump_stream(scoped, directory, shard_size, config)
+            objects = sum(shard["objects"] for shard in shards)
+            entry["streams"].append({"tenant": tenant, "path": os.path.relpath(directory, dump_dir),
+                                     "objects": objects, "shards": shards})
+            print(f"Dumped {objects} objects from {name}/{tenant or '-'}")
+        manifest["collections"][name] = entry
+
+    with open(os.path.join(dump_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Dump written to {dump_dir}")
+    return manifest
+
+
+def _property_types(schema):
+    return {prop["name"]: prop["dataType"][0] for prop in schema.get("properties", [])}
+
+
+def _restore_properties(properties, types):
+    # JSON turns GeoCoordinate / PhoneNumber into dicts; dates stay RFC 3339 strings, which Weaviate accepts
+    restored = dict(properties)
+    for name, value in properties.items():
+        if value is None:
+            continue
+        if types.get(name) == "geoCoordinates":
+            restored[name] = GeoCoordinate(latitude=value["latitude"], longitude=value["longitude"])
+        elif types.get(name) == "phoneNumber":
+            restored[name] = PhoneNumber(number=value["number"], default_country=value.get("default_country"))
+    return restored
+
+
+def _restore_references(references, targets):
+    """(references for add_object, extra (property, ReferenceToMulti) for add_reference)."""
+    inline, extra = {}, []
+    for name, linked in references.items():
+        if len(targets.get(name, ())) <= 1:
+            inline[name] = [object_uuid for _, object_uuid in linked]
+            continue
+        by_collection = {}
+        for collection, object_uuid in linked:
+            by_collection.setdefault(collection, []).append(object_uuid)
+        groups = [ReferenceToMulti(target_collection=c, uuids=u) for c, u in by_collection.items()]
+        inline[name] = groups[0]
+        extra += [(name, group) for group in groups[1:]]
+    return inline, extra
+
+
+def iter_dump_objects(stream_dir, shards):
+    """
+    Yield (uuid, properties, vectors, references) from a dumped stream; vectors are read
+    from memory-mapped .npy files, references are {property: [[collection, uuid], ...]}.
+    """
+    for shard in shards:
+        columns = {
+            name: np.load(os.path.join(stream_dir, f"vectors-{shard['index']:05d}.{name}.npy"), mmap_mode="r")
+            for name in shard["vector_names"]
+        }
+        with open(os.path.join(stream_dir, f"objects-{shard['index']:05d}.jsonl"), encoding="utf-8") as f:
+            for row, line in enumerate(f):
+                record = json.loads(line)
+                vectors = {name: columns[name][row].tolist() for name in record["vectors"]}
+                vectors.update(record.get("multi_vectors", {}))
+                yield record["uuid"], record["properties"], vectors, record.get("references", {})
+
+
+def restore(client, dump_dir, collection_names=None, batch_size=100, concurrent_requests=2):
+    """Create missing collections / tenants and import every dumped object with its stored vectors and references."""
+    with open(os.path.join(dump_dir, "manifest.json")) as f:
+        manifest = json.load(f)
+    if manifest.get("format") not in READABLE_FORMATS:
+        raise ValueError(f"Unsupported dump format {manifest.get('format')}")
+
+    for name, entry in manifest["collections"].items():
+        if collection_names and name not in collection_names:
+            continue
+        if not client.collections.exists(name):
+            print(f"Collection {name} does not exist. Creating its schema first.")
+            client.collections.create_from_dict(entry["schema"])
+        collection = client.collections.use(name)
+        types = _property_types(entry["schema"])
+        targets = entry.get("references", {})
+
+        tenants = [stream["tenant"] for stream in entry["streams"] if stream["tenant"]]
+        if tenants:
+            existing = collection.tenants.get()
+            missing = [Tenant(name=tenant) for tenant in tenants if tenant not in existing]
+            for i in range(0, len(missing), 100):
+                collection.tenants.create(missing[i:i + 100])
+
+        for stream in entry["streams"]:
+            scoped = collection.with_tenant(stream["tenant"]) if stream["tenant"] else collection
+            stream_dir = os.path.join(dump_dir, stream["path"])
+            with scoped.batch.fixed_size(batch_size=batch_size, concurrent_requests=concurrent_requests) as batch:
+                for object_uuid, properties, vectors, references in iter_dump_objects(stream_dir, stream["shards"]):
+                    if list(vectors) == ["default"]:
+                        vectors = vectors["default"]
+                    inline, extra = _restore_references(references, targets)
+                    batch.add_object(
+                        properties=_restore_properties(properties, types),
+                        references=inline or None,
+                        uuid=object_uuid,
+                        vector=vectors or None,
+                    )
+                    for from_property, to in extra:
+                        batch.add_reference(from_uuid=object_uuid, from_property=from_property, to=to)
+            failed = scoped.batch.failed_objects
+            print(f"Restored {stream['objects'] - len(failed)}/{stream['objects']} objects "
+                  f"into {name}/{stream['tenant'] or '-'}")
+            for failure in failed[:5]:
+                print(f"  Failed {failure.original_uuid}: {failure.message}")
+            failed_references = scoped.batch.failed_references
+            if failed_references:
+                print(f"  {len(failed_references)} references failed, e.g. {failed_references[0].message}")
+
+
+def connect(url, key, port):
+    if url != "localhost":
+        return weaviate.connect_to_weaviate_cloud(
+            cluster_url=url,
+            auth_credentials=weaviate.auth.AuthApiKey(api_key=key),
+            skip_init_checks=True,
+        )
+    return weaviate.connect_to_local(
+        host=url,
+        port=port,
+        auth_credentials=weaviate.auth.AuthApiKey(api_key=key) if key else None,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dump / restore Weaviate collections with their vectors")
+    parser.add_argument("command", choices=["dump", "restore"])
+    parser.add_argument("--url", default=os.environ.get("WEAVIATE_URL", "localhost"))
+    parser.add_argument("--key", default=os.environ.get("WEAVIATE_API_KEY", ""))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("WEAVIATE_PORT", "8080")))
+    parser.add_argument("--dump-dir", required=True)
+    parser.add_argument("--collections", nargs="*", help="Collections to dump / restore (default: all)")
+    parser.add_argument("--shard-size", type=int, default=100000, help="Objects per shard file (dump)")
+    parser.add_argument("--batch-size", type=int, default=100, help="Batch size (restore)")
+    parser.add_argument("--concurrent-requests", type=int, default=2, help="Concurrent batch requests (restore)")
+    args = parser.parse_args()
+
+    client = connect(args.url, args.key, args.port)
+    try:
+        if args.command == "dump":
+            dump(client, args.dump_dir, args.collections, args.shard_size)
+        else:
+            restore(client, args.dump_dir, args.collections, args.batch_size, args.concurrent_requests)
+    finally:
+        client.close()
@@ -0,0 +1,305 @@
+"""
+Health-check engine: fetch the schema once and run every Health_Checks.ipynb rule over it.
+
+Each check cell in Health_Checks.ipynb issues its own GET /v1/schema and re-walks the
+class list; on clusters with thousands of classes that payload is tens of MB, fetched
+and parsed once per check. Here the schema is fetched once into a SchemaSnapshot with
+indexed views (by vectorizer, by replication factor, by normalized config hash) and
+each rule is a pass over that shared snapshot.
+
+SchemaSource keeps the snapshot for `ttl` seconds. After that it re-fetches with
+If-None-Match when the server sent an ETag, and otherwise compares the SHA-256 of the
+response body with the previous one, so an unchanged schema is never re-parsed or
+re-indexed. watch() uses this to re-run the rules only when the schema changed.
+
+Usage:
+    python HealthCheckEngine.py --url <CLUSTER_URL> --key <API_KEY>
+    python HealthCheckEngine.py --url <CLUSTER_URL> --key <API_KEY> --watch 300
+"""
+import argparse
+import hashlib
+import json
+import time
+from collections import namedtuple
+from functools import cached_property
+
+import requests
+
+Finding = namedtuple("Finding", ["rule", "collection", "status", "message"])
+
+ALLOWED_DELETE = {"TimeBasedResolution", "DeleteOnConflict"}
+COMPRESSION_KEYS = ("bq", "pq", "rq", "sq")
+MAX_COLLECTIONS = 100
+
+
+def normalize_for_grouping(cls_obj):
+    """
+    Pick only core knobs and serialize deterministically for grouping.
+    Includes: replicationConfig, invertedIndexConfig, shardingConfig, vectorConfig (incl. vectorizer details).
+    """
+    norm_vec = {}
+    for name, cfg in sorted((cls_obj.get("vectorConfig") or {}).items()):
+        v = cfg.get("vectorizer") or {}
+        if isinstance(v, dict) and v:
+            provider = next(iter(v.keys()))
+            details = v.get(provider) or {}
+            norm_vec[name] = {
+                "provider": provider,
+                "model": details.get("model"),
+                "baseURL": details.get("baseURL"),
+                "vectorizeClassName": details.get("vectorizeClassName"),
+                "properties": details.get("properties", []),
+                "vectorIndexType": cfg.get("vectorIndexType"),
+                "vectorIndexConfig": cfg.get("vectorIndexConfig", {}),
+            }
+        else:
+            norm_vec[name] = {"provider": v, "vectorIndexType": cfg.get("vectorIndexType"),
+                              "vectorIndexConfig": cfg.get("vectorIndexConfig", {})}
+
+    norm = {
+        "replicationConfig": cls_obj.get("replicationConfig") or {},
+        "invertedIndexConfig": cls_obj.get("invertedIndexConfig") or {},
+        "shardingConfig": cls_obj.get("shardingConfig") or {},
+        "vectorConfig": norm_vec,
+    }
+    return json.dumps(norm, sort_keys=True, separators=(",", ":"))
+
+
+def _vectorizers(cls_obj):
+    # Class-level vectorizer (legacy single vector) plus the provider of every named vector
+    providers = set()
+    if cls_obj.get("vectorizer") not in (None, "none"):
+        providers.add(cls_obj["vectorizer"])
+    for cfg in (cls_obj.get("vectorConfig") or {}).values():
+        v = cfg.get("vectorizer") or {}
+        providers.add(next(iter(v.keys())) if isinstance(v, dict) and v else str(v or "none"))
+    return providers or {"none"}
+
+
+def _compression(cls_obj):
+    index_configs = [cls_obj.get("vectorIndexConfig") or {}]
+    index_configs += [(cfg or {}).get("vectorIndexConfig") or {} for cfg in (cls_obj.get("vectorConfig") or {}).values()]
+    return sorted({key for config in index_configs for key in COMPRESSION_KEYS
+                   if (config.get(key) or {}).get("enabled") is True})
+
+
+class SchemaSnapshot:
+    """Parsed /v1/schema with lazily built indexes; immutable once created."""
+
+    def __init__(self, schema, digest, etag=None):
+        self.classes = schema.get("classes") or []
+        self.digest = digest
+        self.etag = etag
+        self.fetched_at = time.time()
+
+    @cached_property
+    def by_name(self):
+        return {cls["class"]: cls for cls in self.classes}
+
+    @cached_property
+    def by_vectorizer(self):
+        index = {}
+        for cls in self.classes:
+            for provider in _vectorizers(cls):
+                index.setdefault(provider, []).append(cls["class"])
+        return index
+
+    @cached_property
+    def by_replication_factor(self):
+        index = {}
+        for cls in self.classes:
+            index.setdefault((cls.get("replicationConfig") or {}).get("factor"), []).append(cls["class"])
+        return index
+
+    @cached_property
+    def by_config_hash(self):
+        index = {}
+        for cls in self.classes:
+            signature = hashlib.sha256(normalize_for_grouping(cls).encode()).hexdigest()[:16]
+            index.setdefault(signature, []).append(cls["class"])
+        return index
+
+    @cached_property
+    def compression(self):
+        return {cls["class"]: _compression(cls) for cls in self.classes}
+
+
+class SchemaSource:
+    """
+    Fetches /v1/schema at most once per `ttl` seconds and re-parses only when it changed.
+
+    `fetches` counts HTTP requests, `parses` counts JSON parses / new snapshots.
+    """
+
+    def __init__(self, cluster_url, api_key=None, ttl=60.0, timeout=60):
+        self.url = f"{cluster_url.rstrip('/')}/v1/schema"
+        self.ttl = ttl
+        self.timeout = timeout
+        self.session = requests.Session()
+        if api_key:
+            self.session.headers["Authorization"] = f"Bearer {api_key}"
+        self.snapshot = None
+        self.fetches = 0
+        self.parses = 0
+        self._checked_at = 0.0
+
+    def get(self, force=False):
+        """Return the current snapshot, refreshing it when the TTL expired."""
+        if self.snapshot and not force and time.monotonic() - self._checked_at < self.ttl:
+            return self.snapshot
+
+        headers = {"If-None-Match": self.snapshot.etag} if self.snapshot and self.snapshot.etag else {}
+        response = self.session.get(self.url, headers=headers, timeout=self.timeout)
+        self.fetches += 1
+        self._checked_at = time.monotonic()
+        if response.status_code == 304:
+            return self.snapshot
+        response.raise_for_status()
+
+        digest = hashlib.sha256(response.content).hexdigest()
+        if self.snapshot and digest == self.snapshot.digest:
+            return self.snapshot
+        self.snapshot = SchemaSnapshot(response.json(), digest, response.headers.get("ETag"))
+        self.parses += 1
+        return self.snapshot
+
+
+RULES = {}
+
+
+def rule(name):
+    """Register a check: a function(snapshot) -> list of Findings."""
+    def register(function):
+        RULES[name] = function
+        return function
+    return register
+
+
+@rule("collection_count")
+def check_collection_count(snapshot):
+    count = len(snapshot.classes)
+    if count > MAX_COLLECTIONS:
+        return [Finding("collection_count", None, "WARN",
+                        f"{count} collections. Consider multi-tenancy if many are configured identically "
+                        f"but represent different users, groups etc.")]
+    return [Finding("collection_count", None, "OK", f"{count} collections")]
+
+
+@rule("replication")
+def check_replication(snapshot):
+    findings = []
+    for cls in snapshot.classes:
+        rep = cls.get("replicationConfig") or {}
+        async_enabled = rep.get("asyncEnabled")
+        deletion_strategy = rep.get("deletionStrategy") or rep.get("deletion_strategy")
+        problems = []
+        if async_enabled is not True:
+            problems.append(f"async={async_enabled} -> ENABLE True")
+        if deletion_strategy not in ALLOWED_DELETE:
+            problems.append(f"delete={deletion_strategy} -> SET TimeBasedResolution/DeleteOnConflict")
+        findings.append(Finding("replication", cls["class"], "WARN" if problems else "OK",
+                                f"factor={rep.get('factor', 'N/A')}" + (" | " + " | ".join(problems) if problems else "")))
+    return findings
+
+
+@rule("replication_factor")
+def check_replication_factor(snapshot):
+    findings = []
+    for factor, names in sorted(snapshot.by_replication_factor.items(), key=lambda item: str(item[0])):
+        if factor == 1:
+            status, message = "WARN", "use >= 3 and match number of data nodes (3/5/7/9)"
+        elif factor in {3, 5, 7, 9}:
+            status, message = "OK", f"OK if the cluster has {factor} data nodes; otherwise match node count"
+        else:
+            status, message = "WARN", "match replication factor to number of data nodes"
+        findings.append(Finding("replication_factor", ", ".join(sorted(names)), status,
+                                f"factor {factor}: {message}"))
+    return findings
+
+
+@rule("compression")
+def check_compression(snapshot):
+    return [
+        Finding("compression", name, "OK" if methods else "WARN",
+                f"compression {','.join(methods)}" if methods else "enable one of bq/pq/rq/sq for efficiency")
+        for name, methods in snapshot.compression.items()
+    ]
+
+
+@rule("config_similarity")
+def check_config_similarity(snapshot):
+    groups = [sorted(names) for names in snapshot.by_config_hash.values()]
+    if len(snapshot.classes) > 1 and len(groups) == 1:
+        return [Finding("config_similarity", None, "WARN",
+                        "All collections share identical core settings; candidates for one multi-tenant collection")]
+    return [
+        Finding("config_similarity", ", ".join(names), "WARN",
+                f"{len(names)} collections with identical core settings; candidates for one multi-tenant collection")
+        for names in groups if len(names) > 1
+    ]
+
+
+@rule("vectorizers")
+def check_vectorizers(snapshot):
+    return [
+        Finding("vectorizers", None, "OK", f"{provider}: {len(names)} collections")
+        for provider, names in sorted(snapshot.by_vectorizer.items())
+    ]
+
+
+def run_checks(snapshot, rules=None):
+    """Run the given rule names (default: all) over one snapshot."""
+    findings = []
+    for name in rules or RULES:
+        findings.extend(RULES[name](snapshot))
+    return findings
+
+
+def print_findings(findings, show_ok=False):
+    current = None
+    for finding in findings:
+        if finding.status == "OK" and not show_ok:
+            continue
+        if finding.rule != current:
+            current = finding.rule
+            print(f"\n--- {current} ---")
+        target = f"{finding.collection}: " if finding.collection else ""
+        print(f"[{finding.status}] {target}{finding.message}")
+    warnings = sum(finding.status != "OK" for finding in findings)
+    print(f"\n{len(findings)} checks, {warnings} warnings")
+
+
+def watch(source, interval=300.0, rules=None, show_ok=False):
+    """Health daemon loop: re-run the rules whenever the schema changed."""
+    last_digest = None
+    while True:
+        started = time.perf_counter()
+        try:
+            # The loop already paces the polls; going through the TTL as well would skip
+            # every other tick (the TTL restarts after each fetch) and poll at 2x interval
+            snapshot = source.get(force=True)
+        except Exception as e:
+            print(f"Failed to fetch schema: {e}")
+        else:
+            if snapshot.digest != last_digest:
+                last_digest = snapshot.digest
+                print(f"\n=== Schema {snapshot.digest[:12]} ({len(snapshot.classes)} classes) ===")
+                print_findings(run_checks(snapshot, rules), show_ok)
+        time.sleep(max(interval - (time.perf_counter() - started), 0))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run Weaviate health checks over one schema snapshot")
+    parser.add_argument("--url", required=True, help="Cluster URL, e.g. https://<cluster>.weaviate.cloud")
+    parser.add_argument("--key", help="API key")
+    parser.add_argument("--rules", nargs="*", choices=sorted(RULES), help="Rules to run (default: all)")
+    parser.add_argument("--show-ok", action="store_true", help="Also print passing checks")
+    parser.add_argument("--watch", type=float, metavar="SECONDS",
+                        help="Keep running and re-check whenever the schema changes")
+    args = parser.parse_args()
+
+    schema_source = SchemaSource(args.url, args.key, ttl=args.watch or 60.0)
+    if args.watch:
+        watch(schema_source, args.watch, args.rules, args.show_ok)
+    else:
+        print_findings(run_checks(schema_source.get(), args.rules), args.show_ok)
@@ -0,0 +1,256 @@
+"""
+Async, cluster-wide inventory scanner: object counts per collection / tenant and UUID lookups.
+
+aggregate_collections() (Weaviate_Operations/Aggregation.ipynb) and find_object_in_all()
+(Weaviate_Operations/CRUD/read.ipynb) walk every collection in series: config.get() and
+tenants.get() per collection, then one aggregate.over_all() or one fetch_object_by_id()
+per tenant and UUID. This scanner runs on the async client instead:
+
+- all collection configs come from a single list_all(simple=False) call;
+- tenants.get(), aggregate.over_all() and lookups fan out with bounded concurrency;
+- UUID lookups check a whole set of UUIDs per tenant with one fetch_objects() call
+  filtered on Filter.by_id().contains_any(), instead of one request per UUID;
+- rows are written to a Parquet file (and/or kept for a DataFrame) as they complete.
+
+Tenants that are not ACTIVE are reported with their status instead of being counted,
+because aggregating them would fail (or load them back into memory).
+
+Usage:
+    python InventoryScanner.py counts --url <CLOUD_URL> --key <API_KEY> --parquet inventory.parquet
+    python InventoryScanner.py find --url <CLOUD_URL> --key <API_KEY> --ids <UUID> <UUID> ...
+
+    rows = await scan_counts(client, parquet_path="inventory.parquet")
+    df = pandas.DataFrame(rows)
+"""
+import argparse
+import asyncio
+import inspect
+import itertools
+import time
+import uuid
+from collections import namedtuple
+
+import weaviate
+from weaviate.classes.init import AdditionalConfig, Auth, Timeout
+from weaviate.classes.query import Filter
+
+# tenant is None for collections without multi-tenancy
+Scope = namedtuple("Scope", ["collection", "tenant", "status"])
+
+COUNT_COLUMNS = [("collection", "string"), ("tenant", "string"), ("status", "string"),
+                 ("count", "int64"), ("error", "string")]
+LOOKUP_COLUMNS = [("uuid", "string"), ("collection", "string"), ("tenant", "string")]
+ACTIVE_STATUSES = {"ACTIVE", "HOT"}
+
+
+class ParquetSink:
+    """
+    Append rows to a Parquet file in row groups of `flush_rows`, keeping the file valid
+    for the rows written so far. Optionally keeps every row for a DataFrame.
+    """
+
+    def __init__(self, path, columns, flush_rows=5000, keep_rows=True):
+        self.rows = [] if keep_rows else None
+        self.count = 0
+        self._pending = []
+        self._flush_rows = flush_rows
+        self._writer = None
+        if path:
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise Exception("Writing Parquet requires pyarrow: pip install pyarrow")
+            self._pa = pa
+            self._schema = pa.schema([(name, getattr(pa, kind)()) for name, kind in columns])
+            self._writer = pq.ParquetWriter(path, self._schema)
+
+    def add(self, row):
+        self.count += 1
+        if self.rows is not None:
+            self.rows.append(row)
+        if self._writer:
+            self._pending.append(row)
+            if len(self._pending) >= self._flush_rows:
+                self.flush()
+
+    def flush(self):
+        if self._writer and self._pending:
+            self._writer.write_table(self._pa.Table.from_pylist(self._pending, schema=self._schema))
+            self._pending = []
+
+    def close(self):
+        self.flush()
+        if self._writer:
+            self._writer.close()
+
+    def to_dataframe(self):
+        import pandas as pd
+        return pd.DataFrame(self.rows if self.rows is not None else [])
+
+
+async def list_scopes(client, collection_names=None, max_concurrency=16):
+    """Return one Scope per non-MT collection and per tenant of each MT collection."""
+    configs = await client.collections.list_all(simple=False)
+    names = collection_names or sorted(configs)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def tenants_of(name):
+        async with semaphore:
+            try:
+                tenants = await client.collections.use(name).tenants.get()
+            except Exception as e:
+                print(f"Could not get tenants for {name}: {e}")
+                return []
+        return [Scope(name, tenant_name, tenant.activity_status.value)
+                for tenant_name, tenant in sorted(tenants.items())]
+
+    scopes = []
+    mt_names = [name for name in names if name in configs and configs[name].multi_tenancy_config.enabled]
+    for name in names:
+        if name not in configs:
+            print(f"Collection '{name}' not found, skipping")
+        elif name not in mt_names:
+            scopes.append(Scope(name, None, None))
+    for tenant_scopes in await asyncio.gather(*(tenants_of(name) for name in mt_names)):
+        scopes.extend(tenant_scopes)
+    return scopes
+
+
+def _scoped(client, scope):
+    collection = client.collections.use(scope.collection)
+    return collection.with_tenant(scope.tenant) if scope.tenant else collection
+
+
+async def _bounded(coroutines, max_concurrency):
+    # Yield results as they complete, with at most max_concurrency requests in flight.
+    # Coroutines are taken from the iterable only when a slot frees up, so a scan over
+    # millions of scopes never holds more than max_concurrency of them at once.
+    coroutines = iter(coroutines)
+    pending = set()
+    try:
+        while True:
+            for coroutine in itertools.islice(coroutines, max_concurrency - len(pending)):
+                pending.add(asyncio.ensure_future(coroutine))
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        # Close what was never started, or it warns "coroutine ... was never awaited";
+        # a generator is closed instead, so no further coroutines are created at all
+        if inspect.isgenerator(coroutines):
+            coroutines.close()
+        else:
+            for coroutine in coroutines:
+                coroutine.close()
+
+
+async def _count(client, scope):
+    row = {"collection": scope.collection, "tenant": scope.tenant, "status": scope.status,
+           "count": None, "error": None}
+    if scope.status is not None and scope.status not in ACTIVE_STATUSES:
+        return row
+    try:
+        row["count"] = (await _scoped(client, scope).aggregate.over_all(total_count=True)).total_count
+    except Exception as e:
+        row["error"] = str(e)
+    return row
+
+
+async def scan_counts(client, collection_names=None, parquet_path=None, max_concurrency=32, progress_every=1000):
+    """Count the objects of every collection / tenant; returns the rows (and writes them to Parquet)."""
+    started = time.perf_counter()
+    scopes = await list_scopes(client, collection_names)
+    print(f"Counting {len(scopes)} collections / tenants in {len({s.collection for s in scopes})} collections")
+
+    sink = ParquetSink(parquet_path, COUNT_COLUMNS)
+    total = errors = empty = 0
+    try:
+        async for row in _bounded((_count(client, scope) for scope in scopes), max_concurrency):
+            sink.add(row)
+            total += row["count"] or 0
+            errors += row["error"] is not None
+            empty += row["count"] == 0
+            if sink.count % progress_every == 0:
+                print(f"  {sink.count}/{len(scopes)} done, {total} objects so far")
+    finally:
+        sink.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"{total} objects in {len(scopes)} collections / tenants ({empty} empty, {errors} errors) "
+          f"in {elapsed:.1f}s")
+    if parquet_path:
+        print(f"Results written to {parquet_path}")
+    return sink.rows
+
+
+async def _lookup(client, scope, ids):
+    # One filtered request per scope and chunk of ids, instead of one fetch_object_by_id per id
+    try:
+        response = await _scoped(client, scope).query.fetch_objects(
+            filters=Filter.by_id().contains_any(ids), limit=len(ids), return_properties=[]
+        )
+    except Exception as e:
+        print(f"  Lookup failed in {scope.collection}/{scope.tenant or '-'}: {e}")
+        return []
+    return [{"uuid": str(obj.uuid), "collection": scope.collection, "tenant": scope.tenant}
+            for obj in response.objects]
+
+
+async def find_objects(client, ids, collection_names=None, parquet_path=None, max_concurrency=32, chunk_size=100):
+    """Find which collections / tenants contain the given UUIDs; returns {uuid: [(collection, tenant), ...]}."""
+    # Results come back in canonical form (lowercase, hyphenated), so normalize the input
+    # the same way; uuid.UUID() also rejects malformed ids before any request is sent
+    ids = list(dict.fromkeys(str(uuid.UUID(str(i))) for i in ids))
+    scopes = [s for s in await list_scopes(client, collection_names)
+              if s.status is None or s.status in ACTIVE_STATUSES]
+    chunks = [ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size)]
+    print(f"Looking up {len(ids)} UUIDs in {len(scopes)} collections / tenants "
+          f"({len(scopes) * len(chunks)} requests)")
+
+    results = {object_id: [] for object_id in ids}
+    sink = ParquetSink(parquet_path, LOOKUP_COLUMNS)
+    lookups = (_lookup(client, scope, chunk) for scope in scopes for chunk in chunks)
+    try:
+        async for rows in _bounded(lookups, max_concurrency):
+            for row in rows:
+                sink.add(row)
+                results[row["uuid"]].append((row["collection"], row["tenant"]))
+                print(f"  FOUND: {row['uuid']} in {row['collection']}/{row['tenant'] or '-'}")
+    finally:
+        sink.close()
+
+    missing = [object_id for object_id, found in results.items() if not found]
+    print(f"{len(ids) - len(missing)}/{len(ids)} UUIDs found")
+    for object_id in missing:
+        print(f"  NOT FOUND: {object_id}")
+    return results
+
+
+async def main(args):
+    async with weaviate.use_async_with_weaviate_cloud(
+        cluster_url=args.url,
+        auth_credentials=Auth.api_key(args.key),
+        skip_init_checks=True,
+        additional_config=AdditionalConfig(timeout=Timeout(init=60, query=120)),
+    ) as client:
+        if args.command == "counts":
+            await scan_counts(client, args.collections, args.parquet, args.max_concurrency)
+        else:
+            await find_objects(client, args.ids, args.collections, args.parquet, args.max_concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent inventory of collections and tenants")
+    parser.add_argument("command", choices=["counts", "find"])
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--key", required=True)
+    parser.add_argument("--collections", nargs="*", help="Collections to scan (default: all)")
+    parser.add_argument("--ids", nargs="*", default=[], help="UUIDs to look up (find)")
+    parser.add_argument("--parquet", help="Write the result rows to this Parquet file")
+    parser.add_argument("--max-concurrency", type=int, default=32, help="Requests in flight")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,312 @@
+"""
+Quantization and memory planner: RAM / recall trade-off table from a sample of real vectors.
+
+Optimization_Guides/Memory.md and Vector_Index.md give the sizing formulas (HNSW
+connections, vector cache, 2 GB buffer, GOMEMLIMIT = heap x 1.2, container =
+GOMEMLIMIT / 0.8) that are otherwise worked out by hand. This planner:
+
+1. reads a sample of vectors from collection.iterator(include_vector=True) or a local
+   .npy file (memory-mapped, random rows);
+2. estimates Go heap and container memory at the planned collection size for each
+   compression option (none, PQ, BQ, SQ, RQ-8, RQ-1) and each maxConnections value;
+3. compresses the sample with NumPy re-implementations of each scheme and measures
+   recall@k against brute-force exact search over the same sample, both on compressed
+   distances alone and after rescoring the top candidates with full vectors (as Weaviate
+   does for BQ / PQ / RQ).
+
+Recall here is that of the compressed representation, i.e. an upper bound for what the
+HNSW index can reach with it; the graph itself is not built. The quantizers follow the
+published schemes (PQ: k-means per segment with 256 centroids; SQ: one global 8-bit
+range; BQ: sign bits; RQ: random orthogonal rotation, then 8-bit or 1-bit per-vector
+scalar quantization) rather than Weaviate's exact code.
+
+Memory per connection follows the guide (2-5 bytes, variable encoding): the bytes needed
+to address the planned number of vectors. Only layer 0 (2 x maxConnections links per
+vector) is counted, as it dominates.
+
+Usage:
+    python QuantizationPlanner.py --npy vectors.npy --total-vectors 100000000
+    python QuantizationPlanner.py --url <CLOUD_URL> --key <API_KEY> --collection Article \
+        --target-vector default --sample 20000 --total-vectors 100000000 --json plan.json
+"""
+import argparse
+import json
+import math
+import time
+
+import numpy as np
+
+GIB = 1024 ** 3
+HEAP_BUFFER_BYTES = 2 * GIB
+OPTIONS = ["none", "pq", "bq", "sq", "rq8", "rq1"]
+
+
+# Memory
+
+def bytes_per_connection(total_vectors):
+    """Bytes needed to address `total_vectors` nodes, clamped to the guide's 2-5 bytes."""
+    return min(max(math.ceil(math.log2(max(total_vectors, 2)) / 8), 2), 5)
+
+
+def bytes_per_vector(option, dims, pq_segments):
+    # Per cached vector in the Go heap; compressed options keep full vectors on disk only
+    padded = math.ceil(dims / 64) * 64
+    return {
+        "none": dims * 4 + 30,
+        "pq": pq_segments,
+        "bq": math.ceil(dims / 8),
+        "sq": dims,
+        "rq8": padded + 8,
+        "rq1": math.ceil(padded / 8) + 8,
+    }[option]
+
+
+def estimate_memory(option, dims, total_vectors, max_connections, pq_segments, cache_fraction=1.0):
+    """Go heap / GOMEMLIMIT / container sizes in bytes, following Optimization_Guides/Memory.md."""
+    graph = total_vectors * 2 * max_connections * bytes_per_connection(total_vectors)
+    vectors = total_vectors * cache_fraction * bytes_per_vector(option, dims, pq_segments)
+    if option == "pq":
+        vectors += 256 * dims * 4           # codebook
+    heap = graph + vectors + HEAP_BUFFER_BYTES
+    gomemlimit = heap * 1.2
+    return {"graph": graph, "vectors": vectors, "heap": heap, "gomemlimit": gomemlimit,
+            "container": gomemlimit / 0.8}
+
+
+# Quantizers: each returns the decoded (approximate) base vectors, or for BQ / RQ-1 the
+# vectors whose dot product with the (transformed) query ranks like the compressed distance
+
+def _kmeans(points, clusters, iterations, rng):
+    centroids = points[rng.choice(len(points), clusters, replace=len(points) < clusters)].copy()
+    for _ in range(iterations):
+        distances = (points ** 2).sum(1)[:, None] - 2 * points @ centroids.T + (centroids ** 2).sum(1)[None, :]
+        assignment = distances.argmin(1)
+        counts = np.bincount(assignment, minlength=clusters)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, points)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+    return centroids
+
+
+def pq_decode(base, segments, rng, train_size=10000, iterations=8):
+    dims = base.shape[1]
+    bounds = np.linspace(0, dims, segments + 1).astype(int)
+    train = base[rng.choice(len(base), min(train_size, len(base)), replace=False)]
+    decoded = np.empty_like(base)
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        centroids = _kmeans(train[:, start:end], 256, iterations, rng)
+        part = base[:, start:end]
+        distances = (part ** 2).sum(1)[:, None] - 2 * part @ centroids.T + (centroids ** 2).sum(1)[None, :]
+        decoded[:, start:end] = centroids[distances.argmin(1)]
+    return decoded
+
+
+def sq_decode(base):
+    low, high = float(base.min()), float(base.max())
+    step = (high - low) / 255 or 1.0
+    return (np.round((base - low) / step) * step + low).astype(np.float32)
+
+
+def _rotation(dims, rng):
+    q, r = np.linalg.qr(rng.standard_normal((dims, dims)).astype(np.float32))
+    return q * np.sign(np.diag(r))
+
+
+def rq8_decode(rotated):
+    low = rotated.min(1, keepdims=True)
+    step = (rotated.max(1, keepdims=True) - low) / 255
+    step[step == 0] = 1.0
+    return np.round((rotated - low) / step) * step + low
+
+
+def rq1_decode(rotated):
+    # Sign bits scaled by the per-vector mean magnitude, so norms stay comparable (l2)
+    return np.sign(rotated) * np.abs(rotated).mean(1, keepdims=True)
+
+
+# Search
+
+def _scores(queries, base, metric):
+    # Higher is better
+    if metric == "l2-squared":
+        return 2 * queries @ base.T - (base ** 2).sum(1)[None, :]
+    return queries @ base.T
+
+
+def top_k(scores, k):
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(scores, candidates, 1).argsort(1)[:, ::-1]
+    return np.take_along_axis(candidates, order, 1)
+
+
+def recall(found, truth):
+    k = truth.shape[1]
+    return float(np.mean([len(set(f[:k]) & set(t)) / k for f, t in zip(found, truth)]))
+
+
+def evaluate(sample, queries_count=100, k=10, rescore=100, metric="cosine", pq_segments=None,
+             options=OPTIONS, seed=42):
+    """Recall@k of each compressed representation vs exact search; returns {option: {...}}."""
+    rng = np.random.default_rng(seed)
+    vectors = np.asarray(sample, dtype=np.float32)
+    if metric == "cosine":
+        vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    order = rng.permutation(len(vectors))
+    queries, base = vectors[order[:queries_count]], vectors[order[queries_count:]]
+    k = min(k, len(base))
+    rescore = max(min(rescore, len(base)), k)
+    truth = top_k(_scores(queries, base, metric), k)
+    pq_segments = pq_segments or max(base.shape[1] // 4, 1)
+
+    rotation = None
+    results = {}
+    for option in options:
+        started = time.perf_counter()
+        if option == "none":
+            approx_queries, approx_base = queries, base
+        elif option == "pq":
+            approx_queries, approx_base = queries, pq_decode(base, pq_segments, rng)
+        elif option == "sq":
+            approx_queries, approx_base = queries, sq_decode(base)
+        elif option == "bq":
+            # Weaviate compares the binarized query with the binarized vectors (Hamming)
+            approx_queries, approx_base = np.sign(queries), np.sign(base)
+        else:
+            if rotation is None:
+                rotation = _rotation(base.shape[1], rng)
+            rotated = base @ rotation
+            approx_queries = queries @ rotation
+            approx_base = rq8_decode(rotated) if option == "rq8" else rq1_decode(rotated)
+        approx_metric = "dot" if option == "bq" else metric
+        approx_scores = _scores(approx_queries, approx_base, approx_metric)
+        compressed = top_k(approx_scores, k)
+
+        # Rescore the top `rescore` compressed candidates with the full vectors
+        candidates = top_k(approx_scores, rescore)
+        exact = np.stack([_scores(q[None, :], base[c], metric)[0] for q, c in zip(queries, candidates)])
+        rescored = np.take_along_axis(candidates, top_k(exact, k), 1)
+
+        results[option] = {
+            "recall": recall(compressed, truth),
+            "recall_rescored": recall(rescored, truth),
+            "seconds": round(time.perf_counter() - started, 2),
+        }
+        print(f"  {option:<5} recall@{k}={results[option]['recall']:.3f} "
+              f"rescored={results[option]['recall_rescored']:.3f} ({results[option]['seconds']}s)")
+    return results
+
+
+# Sampling
+
+def sample_from_npy(path, sample_size, seed=42):
+    vectors = np.load(path, mmap_mode="r")
+    if vectors.ndim != 2:
+        raise ValueError(f"{path}: expected a 2-D array, got shape {vectors.shape}")
+    rng = np.random.default_rng(seed)
+    rows = np.sort(rng.choice(len(vectors), min(sample_size, len(vectors)), replace=False))
+    return np.asarray(vectors[rows], dtype=np.float32), len(vectors)
+
+
+def sample_from_collection(collection, sample_size, target_vector=None):
+    """The first `sample_size` vectors in UUID order (random UUIDs make this a random sample)."""
+    rows = []
+    for obj in collection.iterator(include_vector=True):
+        vectors = obj.vector or {}
+        if target_vector:
+            vector = vectors.get(target_vector)
+        else:
+            vector = vectors.get("default", next(iter(vectors.values()), None))
+        if vector is not None and not (vector and isinstance(vector[0], list)):
+            rows.append(vector)
+        if len(rows) >= sample_size:
+            break
+    if not rows:
+        raise ValueError("No vectors found (check --target-vector)")
+    return np.asarray(rows, dtype=np.float32)
+
+
+def plan(sample, total_vectors, max_connections=(16, 32, 64), k=10, rescore=100, queries=100,
+         metric="cosine", pq_segments=None, cache_fraction=1.0, options=OPTIONS):
+    """Rows of the RAM / recall table, one per option and maxConnections."""
+    dims = sample.shape[1]
+    pq_segments = pq_segments or max(dims // 4, 1)
+    quality = evaluate(sample, queries, k, rescore, metric, pq_segments, options)
+    rows = []
+    for option in options:
+        for connections in max_connections:
+            memory = estimate_memory(option, dims, total_vectors, connections, pq_segments, cache_fraction)
+            rows.append({
+                "option": option,
+                "max_connections": connections,
+                "bytes_per_vector": bytes_per_vector(option, dims, pq_segments),
+                **{f"{name}_gib": round(value / GIB, 2) for name, value in memory.items()},
+                f"recall@{k}": round(quality[option]["recall"], 4),
+                f"recall@{k}_rescored": round(quality[option]["recall_rescored"], 4),
+            })
+    return rows
+
+
+def print_table(rows, k, total_vectors, dims, sample_size):
+    print(f"\n{total_vectors:,} vectors x {dims} dims (recall measured on a {sample_size:,}-vector sample)")
+    print(f"{'option':<6} {'maxConn':>7} {'B/vec':>7} {'graph GiB':>10} {'vectors GiB':>12} {'heap GiB':>9} "
+          f"{'container GiB':>14} {'recall@' + str(k):>10} {'rescored':>9}")
+    for row in rows:
+        print(f"{row['option']:<6} {row['max_connections']:>7} {row['bytes_per_vector']:>7} {row['graph_gib']:>10} "
+              f"{row['vectors_gib']:>12} {row['heap_gib']:>9} {row['container_gib']:>14} "
+              f"{row[f'recall@{k}']:>10} {row[f'recall@{k}_rescored']:>9}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plan compression / maxConnections from sampled vectors")
+    parser.add_argument("--npy", help="Local .npy file of vectors [n, dims]")
+    parser.add_argument("--url", help="Weaviate Cloud URL (or 'localhost') to sample a collection")
+    parser.add_argument("--key", default="")
+    parser.add_argument("--collection")
+    parser.add_argument("--tenant")
+    parser.add_argument("--target-vector", help="Named vector to sample (default: the only / default one)")
+    parser.add_argument("--sample", type=int, default=20000, help="Vectors to sample")
+    parser.add_argument("--queries", type=int, default=100, help="Sample vectors held out as queries")
+    parser.add_argument("--total-vectors", type=int, help="Planned collection size (default: source size)")
+    parser.add_argument("--max-connections", type=int, nargs="+", default=[16, 32, 64])
+    parser.add_argument("--metric", choices=["cosine", "dot", "l2-squared"], default="cosine")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rescore", type=int, default=100, help="Candidates rescored with full vectors")
+    parser.add_argument("--pq-segments", type=int, help="PQ segments (default: dims / 4)")
+    parser.add_argument("--cache-fraction", type=float, default=1.0,
+                        help="Share of vectors held in the vector cache (vectorCacheMaxObjects / total)")
+    parser.add_argument("--options", nargs="+", choices=OPTIONS, default=OPTIONS)
+    parser.add_argument("--json", help="Also write the table to this JSON file")
+    args = parser.parse_args()
+
+    if args.npy:
+        sample, source_size = sample_from_npy(args.npy, args.sample)
+    elif args.url and args.collection:
+        import weaviate
+        if args.url == "localhost":
+            client = weaviate.connect_to_local(
+                auth_credentials=weaviate.auth.AuthApiKey(api_key=args.key) if args.key else None)
+        else:
+            client = weaviate.connect_to_weaviate_cloud(
+                cluster_url=args.url, auth_credentials=weaviate.auth.AuthApiKey(api_key=args.key),
+                skip_init_checks=True)
+        try:
+            collection = client.collections.use(args.collection)
+            if args.tenant:
+                collection = collection.with_tenant(args.tenant)
+            source_size = collection.aggregate.over_all(total_count=True).total_count
+            sample = sample_from_collection(collection, args.sample, args.target_vector)
+        finally:
+            client.close()
+    else:
+        parser.error("either --npy or --url with --collection is required")
+
+    total = args.total_vectors or source_size
+    table = plan(sample, total, args.max_connections, args.k, args.rescore, args.queries, args.metric,
+                 args.pq_segments, args.cache_fraction, args.options)
+    print_table(table, args.k, total, sample.shape[1], len(sample))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"total_vectors": total, "dims": int(sample.shape[1]), "sample": len(sample),
+                       "metric": args.metric, "k": args.k, "rescore": args.rescore, "rows": table}, f, indent=2)
+        print(f"\nPlan written to {args.json}")
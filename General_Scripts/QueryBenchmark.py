@@ -0,0 +1,360 @@
+"""
+Query benchmark: latency percentiles and throughput for the query types used in the notebooks.
+
+The timing cell in Weaviate_Operations/CRUD/hybrid_search.ipynb runs one hybrid query ten
+times in a row and prints avg/min/max, which hides tail latency and says nothing about
+behaviour under concurrency. This harness runs each workload
+
+- after a number of warm-up requests that are not recorded;
+- either closed-loop (N workers issuing requests back to back) or open-loop at a fixed
+  QPS, where latency is measured from the scheduled start so a slow server is not
+  hidden by the benchmark slowing down with it (coordinated omission);
+- and reports p50/p95/p99, mean, max, errors and achieved throughput as JSON.
+
+Workloads: hybrid with every HybridFusion, near_vector, bm25, filtered fetch_objects and
+aggregate.over_all with GroupByAggregate.
+
+--fake runs everything against FakeQueryServer, an in-process stand-in with the same
+collection API, so client-side changes can be compared without a cluster. Its latencies
+come from a built-in profile or from samples recorded on a real cluster with --record.
+
+Usage:
+    python QueryBenchmark.py --url <CLOUD_URL> --key <API_KEY> --collection Article \
+        --query "vector database" --filter-property category --filter-value news \
+        --group-by category --concurrency 1 8 32 --output results.json --record profile.json
+    python QueryBenchmark.py --fake --concurrency 1 8 32
+    python QueryBenchmark.py --fake --profile profile.json --qps 50 200
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import weaviate
+from weaviate.classes.aggregate import GroupByAggregate
+from weaviate.classes.query import Filter, HybridFusion
+
+
+def _hybrid(fusion):
+    def run(collection, options):
+        return collection.query.hybrid(query=options.query, alpha=options.alpha, fusion_type=fusion,
+                                       target_vector=options.target_vector, limit=options.limit)
+    return run
+
+
+def _near_vector(collection, options):
+    return collection.query.near_vector(near_vector=options.vector, target_vector=options.target_vector,
+                                        limit=options.limit)
+
+
+def _bm25(collection, options):
+    return collection.query.bm25(query=options.query, limit=options.limit)
+
+
+def _filtered_fetch(collection, options):
+    return collection.query.fetch_objects(
+        filters=Filter.by_property(options.filter_property).equal(options.filter_value), limit=options.limit
+    )
+
+
+def _group_by_aggregate(collection, options):
+    return collection.aggregate.over_all(group_by=GroupByAggregate(prop=options.group_by), total_count=True)
+
+
+# name -> (client operation, function(collection, options))
+WORKLOADS = {f"hybrid_{fusion.name.lower()}": ("query.hybrid", _hybrid(fusion)) for fusion in HybridFusion}
+WORKLOADS.update({
+    "near_vector": ("query.near_vector", _near_vector),
+    "bm25": ("query.bm25", _bm25),
+    "fetch_objects_filtered": ("query.fetch_objects", _filtered_fetch),
+    "aggregate_group_by": ("aggregate.over_all", _group_by_aggregate),
+})
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(workload, latencies, errors, elapsed, **load):
+    ordered = sorted(latencies)
+    ms = lambda seconds: round(seconds * 1000, 3) if seconds is not None else None
+    return {
+        "workload": workload,
+        **load,
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput_qps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": ms(percentile(ordered, 0.50)),
+        "p95_ms": ms(percentile(ordered, 0.95)),
+        "p99_ms": ms(percentile(ordered, 0.99)),
+        "mean_ms": ms(sum(ordered) / len(ordered)) if ordered else None,
+        "max_ms": ms(ordered[-1]) if ordered else None,
+    }
+
+
+class Recorder:
+    """Collects latencies (and optionally raw samples per operation for --record) from all threads."""
+
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.samples = {}
+        self._lock = threading.Lock()
+
+    def add(self, operation, latency, error=None):
+        with self._lock:
+            if error is None:
+                self.latencies.append(latency)
+                self.samples.setdefault(operation, []).append(latency)
+            else:
+                self.errors += 1
+
+
+def _timed(run, collection, options):
+    started = time.perf_counter()
+    try:
+        run(collection, options)
+    except Exception as e:
+        return time.perf_counter() - started, e
+    return time.perf_counter() - started, None
+
+
+def warm_up(collection, run, options, requests):
+    for _ in range(requests):
+        try:
+            run(collection, options)
+        except Exception:
+            pass
+
+
+def closed_loop(collection, operation, run, options, concurrency, requests):
+    """`concurrency` workers send `requests` requests in total, each as soon as the previous returned."""
+    recorder = Recorder()
+    remaining = iter(range(requests))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            latency, error = _timed(run, collection, options)
+            recorder.add(operation, latency, error)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(worker)
+    return recorder, time.perf_counter() - started
+
+
+def open_loop(collection, operation, run, options, qps, requests, max_workers=256):
+    """Start requests at a fixed rate; latency counts from the scheduled start, not the actual one."""
+    recorder = Recorder()
+
+    def request(scheduled):
+        _, error = _timed(run, collection, options)
+        recorder.add(operation, time.perf_counter() - scheduled, error)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for i in range(requests):
+            scheduled = started + i / qps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(request, scheduled)
+    return recorder, time.perf_counter() - started
+
+
+def run_benchmark(collection, options, workloads=None, concurrency_levels=(1,), qps_levels=(),
+                  requests=500, warm_up_requests=20):
+    """Run every workload at every load level; returns (result rows, latency samples per operation)."""
+    results = []
+    samples = {}
+    for name in workloads or WORKLOADS:
+        operation, run = WORKLOADS[name]
+        warm_up(collection, run, options, warm_up_requests)
+        levels = [("concurrency", level) for level in concurrency_levels] + [("qps", level) for level in qps_levels]
+        for mode, level in levels:
+            if mode == "concurrency":
+                recorder, elapsed = closed_loop(collection, operation, run, options, level, requests)
+            else:
+                recorder, elapsed = open_loop(collection, operation, run, options, level, requests)
+            row = summarize(name, recorder.latencies, recorder.errors, elapsed, mode=mode, level=level)
+            results.append(row)
+            for key, values in recorder.samples.items():
+                samples.setdefault(key, []).extend(values)
+            print(f"{name:<28} {mode:>11}={level:<5} p50={row['p50_ms']}ms p95={row['p95_ms']}ms "
+                  f"p99={row['p99_ms']}ms {row['throughput_qps']} req/s errors={row['errors']}")
+    return results, samples
+
+
+# Median latency (s) of each operation on a small cluster; used when no recorded profile is given
+DEFAULT_PROFILE = {
+    "query.hybrid": 0.025,
+    "query.near_vector": 0.012,
+    "query.bm25": 0.010,
+    "query.fetch_objects": 0.008,
+    "aggregate.over_all": 0.030,
+}
+
+
+class FakeQueryServer:
+    """
+    In-process stand-in for a Weaviate node with the collection query / aggregate API.
+
+    Each operation's latency is drawn from `profile`: either a median (log-normal jitter
+    around it) or a list of recorded samples to replay. Once more than `capacity`
+    requests are in flight, latencies grow with the overload.
+    """
+
+    def __init__(self, profile=None, capacity=16, jitter=0.3, seed=None):
+        self.profile = profile or DEFAULT_PROFILE
+        self.capacity = capacity
+        self.jitter = jitter
+        self.calls = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+
+    def handle(self, operation, limit=10):
+        with self._lock:
+            self._in_flight += 1
+            self.calls += 1
+            overload = max(self._in_flight / self.capacity, 1.0)
+            source = self.profile.get(operation, 0.01)
+            if isinstance(source, list):
+                latency = self._random.choice(source)
+            else:
+                latency = source * self._random.lognormvariate(0, self.jitter)
+        try:
+            time.sleep(latency * overload)
+            return SimpleNamespace(objects=[SimpleNamespace(uuid=i, properties={}) for i in range(limit)])
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def collection(self):
+        server = self
+
+        class Query:
+            def hybrid(self, query, limit=10, **kwargs):
+                return server.handle("query.hybrid", limit)
+
+            def near_vector(self, near_vector, limit=10, **kwargs):
+                return server.handle("query.near_vector", limit)
+
+            def bm25(self, query, limit=10, **kwargs):
+                return server.handle("query.bm25", limit)
+
+            def fetch_objects(self, limit=10, **kwargs):
+                return server.handle("query.fetch_objects", limit)
+
+        class Aggregate:
+            def over_all(self, **kwargs):
+                return server.handle("aggregate.over_all", 0)
+
+        collection = SimpleNamespace(query=Query(), aggregate=Aggregate())
+        collection.with_tenant = lambda tenant: collection
+        return collection
+
+
+def connect(url, key):
+    if url == "localhost":
+        return weaviate.connect_to_local(auth_credentials=weaviate.auth.AuthApiKey(api_key=key) if key else None)
+    return weaviate.connect_to_weaviate_cloud(
+        cluster_url=url,
+        auth_credentials=weaviate.auth.AuthApiKey(api_key=key),
+        skip_init_checks=True,
+    )
+
+
+def _query_vector(args, collection):
+    if args.vector_dim:
+        rng = random.Random(42)
+        return [rng.uniform(-1, 1) for _ in range(args.vector_dim)]
+    # Reuse the vector of a stored object so near_vector searches a realistic region
+    obj = collection.query.fetch_objects(limit=1, include_vector=True).objects[0]
+    vectors = obj.vector or {}
+    return vectors.get(args.target_vector or "default") or next(iter(vectors.values()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark Weaviate query latency and throughput")
+    parser.add_argument("--url", default="localhost")
+    parser.add_argument("--key", default="")
+    parser.add_argument("--fake", action="store_true", help="Run against the in-process FakeQueryServer")
+    parser.add_argument("--profile", help="Latency samples recorded with --record, replayed by --fake")
+    parser.add_argument("--capacity", type=int, default=16, help="Fake server requests in flight before degrading")
+    parser.add_argument("--collection", default="Article")
+    parser.add_argument("--tenant")
+    parser.add_argument("--workloads", nargs="*", choices=sorted(WORKLOADS), help="Default: all")
+    parser.add_argument("--query", default="vector database")
+    parser.add_argument("--alpha", type=float, default=0.5)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--target-vector", help="Named vector for hybrid / near_vector")
+    parser.add_argument("--vector-dim", type=int, help="Random query vector of this size (default: a stored vector)")
+    parser.add_argument("--filter-property", default="category")
+    parser.add_argument("--filter-value", default="news")
+    parser.add_argument("--group-by", default="category")
+    parser.add_argument("--concurrency", type=int, nargs="*", default=[1, 8], help="Closed-loop worker counts")
+    parser.add_argument("--qps", type=float, nargs="*", default=[], help="Open-loop request rates")
+    parser.add_argument("--requests", type=int, default=500, help="Measured requests per workload and level")
+    parser.add_argument("--warm-up", type=int, default=20, help="Unrecorded requests per workload")
+    parser.add_argument("--output", help="Write the results as JSON to this file (default: stdout)")
+    parser.add_argument("--record", help="Write raw latency samples per operation, for --fake --profile")
+    args = parser.parse_args()
+
+    client = None
+    if args.fake:
+        profile = None
+        if args.profile:
+            with open(args.profile) as f:
+                profile = json.load(f)
+        target = FakeQueryServer(profile, capacity=args.capacity).collection()
+    else:
+        client = connect(args.url, args.key)
+        target = client.collections.use(args.collection)
+        if args.tenant:
+            target = target.with_tenant(args.tenant)
+
+    try:
+        query_options = SimpleNamespace(
+            query=args.query, alpha=args.alpha, limit=args.limit, target_vector=args.target_vector,
+            vector=[0.0] * (args.vector_dim or 8) if args.fake else _query_vector(args, target),
+            filter_property=args.filter_property, filter_value=args.filter_value, group_by=args.group_by,
+        )
+        rows, latency_samples = run_benchmark(target, query_options, args.workloads, args.concurrency,
+                                              args.qps, args.requests, args.warm_up)
+    finally:
+        if client is not None:
+            client.close()
+
+    report = {
+        "target": "fake" if args.fake else args.url,
+        "collection": args.collection,
+        "tenant": args.tenant,
+        "requests": args.requests,
+        "warm_up": args.warm_up,
+        "results": rows,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+    if args.record:
+        with open(args.record, "w") as f:
+            json.dump(latency_samples, f)
+        print(f"Latency samples written to {args.record}")
@@ -0,0 +1,256 @@
+"""
+Concurrent, cursor-based read-repair sweeper.
+
+Read_Repair_Consistency.ipynb lists a class with limit/offset (slower with every page and
+capped by QUERY_MAXIMUM_RESULTS), keeps every UUID in a list and then reads them one at
+a time with consistency_level=ALL. This sweeper:
+
+- streams UUIDs per class / tenant with after= cursor pagination on GET /v1/objects,
+  holding at most a bounded queue of them in memory;
+- reads each object with GET /v1/objects/{class}/{id}?consistency_level=ALL from a
+  thread pool, each thread keeping its own keep-alive requests.Session;
+- caps the read rate (objects/sec) with a shared token bucket so the sweep can run
+  next to production traffic;
+- covers several classes and all their tenants in one run and prints objects/sec.
+
+A consistency-ALL read makes the coordinator compare all replicas and repair stale ones
+before answering. The API does not say whether a repair happened, so the sweeper counts
+an object as "repaired" when the ALL read returns a newer lastUpdateTimeUnix than the
+listing (served by one replica) did, and as "inconsistent" when the read fails with a
+server-side error, typically a repair that could not complete. "missing" objects were
+deleted between listing and reading.
+
+Usage:
+    python ReadRepairSweeper.py --url https://<ENDPOINT> --key <API_KEY> --classes Article Author \
+        --workers 32 --rate 500
+"""
+import argparse
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+OUTCOMES = ["ok", "repaired", "missing", "inconsistent", "errors"]
+RETRY_STATUSES = {429, 502, 503, 504}
+
+
+class RateLimiter:
+    """Token bucket shared by all worker threads; rate=None disables the cap."""
+
+    def __init__(self, rate=None, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(rate or 1, 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class ReadRepairSweeper:
+    def __init__(self, base_url, api_key=None, workers=16, rate=None, page_size=500, max_retries=3):
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.workers = workers
+        self.page_size = page_size
+        self.max_retries = max_retries
+        self.limiter = RateLimiter(rate)
+        self.stats = {}             # (class, tenant) -> Counter of outcomes
+        self.examples = []          # (class, tenant, uuid, outcome, detail) for non-ok outcomes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _session(self):
+        # One keep-alive session per thread: requests.Session is not thread-safe
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+            self._local.session = session
+        return session
+
+    def _get(self, path, params):
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self._session().get(f"{self.base_url}{path}", params=params, timeout=60)
+            except requests.RequestException:
+                if attempt == self.max_retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    return response
+            time.sleep(min(2 ** attempt, 10))
+
+    def discover_targets(self, class_names=None):
+        """Return (class, tenant) pairs: every tenant of MT classes, (class, None) otherwise."""
+        response = self._get("/v1/schema", {})
+        response.raise_for_status()
+        classes = {c["class"]: c for c in response.json().get("classes", [])}
+        targets = []
+        for name in class_names or sorted(classes):
+            if name not in classes:
+                print(f"Class '{name}' not found, skipping")
+                continue
+            if classes[name].get("multiTenancyConfig", {}).get("enabled"):
+                tenants = self._get(f"/v1/schema/{name}/tenants", {})
+                tenants.raise_for_status()
+                targets.extend((name, tenant["name"]) for tenant in tenants.json())
+            else:
+                targets.append((name, None))
+        return targets
+
+    def iter_listing(self, class_name, tenant=None):
+        """Yield (uuid, lastUpdateTimeUnix) for a class / tenant using after= cursor pagination."""
+        after = None
+        while True:
+            params = {"class": class_name, "limit": self.page_size}
+            if after:
+                params["after"] = after
+            if tenant:
+                params["tenant"] = tenant
+            response = self._get("/v1/objects", params)
+            if response.status_code != 200:
+                raise RuntimeError(f"Listing {class_name}/{tenant or '-'} failed: "
+                                   f"{response.status_code} {response.text[:200]}")
+            objects = response.json().get("objects") or []
+            for obj in objects:
+                yield obj["id"], obj.get("lastUpdateTimeUnix")
+            if len(objects) < self.page_size:
+                return
+            after = objects[-1]["id"]
+
+    def check(self, class_name, tenant, object_id, listed_update):
+        """Read one object with consistency_level=ALL and classify the outcome."""
+        self.limiter.acquire()
+        params = {"consistency_level": "ALL"}
+        if tenant:
+            params["tenant"] = tenant
+        try:
+            response = self._get(f"/v1/objects/{class_name}/{object_id}", params)
+        except requests.RequestException as e:
+            return "errors", str(e)
+        if response.status_code == 200:
+            updated = response.json().get("lastUpdateTimeUnix")
+            if listed_update is not None and updated is not None and int(updated) > int(listed_update):
+                return "repaired", f"lastUpdateTimeUnix {listed_update} -> {updated}"
+            return "ok", None
+        if response.status_code == 404:
+            return "missing", None
+        if response.status_code >= 500:
+            return "inconsistent", f"{response.status_code} {response.text[:200]}"
+        return "errors", f"{response.status_code} {response.text[:200]}"
+
+    def _record(self, key, object_id, outcome, detail):
+        with self._lock:
+            self.stats[key][outcome] += 1
+            if outcome not in ("ok", "missing") and len(self.examples) < 100:
+                self.examples.append((*key, object_id, outcome, detail))
+
+    def sweep(self, targets, progress_interval=10.0):
+        """Read-repair every object of the given (class, tenant) targets; returns the totals."""
+        # Bounded hand-off between the listing (main thread) and the readers
+        work = queue.Queue(maxsize=self.workers * 4)
+        done = object()
+
+        def worker():
+            while True:
+                item = work.get()
+                if item is done:
+                    return
+                key, object_id, listed_update = item
+                try:
+                    outcome, detail = self.check(*key, object_id, listed_update)
+                except Exception as e:
+                    outcome, detail = "errors", str(e)
+                self._record(key, object_id, outcome, detail)
+
+        started = time.perf_counter()
+        last_report = started
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for _ in range(self.workers):
+                executor.submit(worker)
+            try:
+                for key in targets:
+                    self.stats[key] = Counter()
+                    try:
+                        for object_id, listed_update in self.iter_listing(*key):
+                            work.put((key, object_id, listed_update))
+                            if time.perf_counter() - last_report >= progress_interval:
+                                last_report = time.perf_counter()
+                                self._print_progress(started)
+                    except Exception as e:
+                        print(f"Skipping {key[0]}/{key[1] or '-'}: {e}")
+                        self._record(key, None, "errors", str(e))
+            finally:
+                for _ in range(self.workers):
+                    work.put(done)
+
+        totals = self.totals()
+        elapsed = time.perf_counter() - started
+        totals["seconds"] = round(elapsed, 1)
+        totals["objects_per_sec"] = round(totals["checked"] / elapsed, 1) if elapsed else 0.0
+        return totals
+
+    def totals(self):
+        with self._lock:
+            totals = Counter()
+            for counter in self.stats.values():
+                totals.update(counter)
+        result = {outcome: totals[outcome] for outcome in OUTCOMES}
+        result["checked"] = sum(result.values())
+        return result
+
+    def _print_progress(self, started):
+        totals = self.totals()
+        elapsed = time.perf_counter() - started
+        print(f"[{elapsed:7.0f}s] checked {totals['checked']} ({totals['checked'] / elapsed:.0f} obj/s), "
+              f"repaired {totals['repaired']}, inconsistent {totals['inconsistent']}, errors {totals['errors']}")
+
+    def print_report(self, totals):
+        print(f"\n{'Class':<30} {'Tenant':<25} " + " ".join(f"{o:>12}" for o in OUTCOMES))
+        for (class_name, tenant), counter in self.stats.items():
+            if counter:
+                print(f"{class_name:<30} {tenant or '-':<25} " + " ".join(f"{counter[o]:>12}" for o in OUTCOMES))
+        print(f"\nChecked {totals['checked']} objects in {totals['seconds']}s ({totals['objects_per_sec']} obj/s): "
+              f"{totals['repaired']} repaired, {totals['inconsistent']} inconsistent, "
+              f"{totals['missing']} missing, {totals['errors']} errors")
+        for class_name, tenant, object_id, outcome, detail in self.examples[:20]:
+            print(f"  {outcome:<12} {class_name}/{tenant or '-'} {object_id}: {detail}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Trigger read repair (consistency_level=ALL) for whole classes")
+    parser.add_argument("--url", required=True, help="Cluster endpoint, e.g. https://<cluster>.weaviate.cloud")
+    parser.add_argument("--key", help="API key")
+    parser.add_argument("--classes", nargs="*", help="Classes to sweep (default: all)")
+    parser.add_argument("--tenants", nargs="*", help="Only these tenants of multi-tenant classes")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent consistency-ALL reads")
+    parser.add_argument("--rate", type=float, help="Maximum reads per second (default: unlimited)")
+    parser.add_argument("--page-size", type=int, default=500, help="UUIDs per listing page")
+    parser.add_argument("--progress-interval", type=float, default=10.0)
+    args = parser.parse_args()
+
+    sweeper = ReadRepairSweeper(args.url, args.key, workers=args.workers, rate=args.rate, page_size=args.page_size)
+    targets = sweeper.discover_targets(args.classes)
+    if args.tenants:
+        targets = [(c, t) for c, t in targets if t is None or t in args.tenants]
+    print(f"Sweeping {len(targets)} class / tenant targets with {args.workers} workers")
+    sweeper.print_report(sweeper.sweep(targets, args.progress_interval))
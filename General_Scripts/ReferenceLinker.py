@@ -0,0 +1,473 @@
+"""
+Bulk cross-reference linker: resolves external IDs to UUIDs and adds references in batches.
+
+Weaviate_Operations/Cross_Reference.ipynb inserts reports one by one, keeps a
+custom_to_weaviate_uuid dict in memory and links every chunk with its own request. At
+millions of references the round trips dominate. This pipeline reads (source key,
+target key) pairs and, per page of `batch_size` pairs:
+
+1. Resolves both keys to UUIDs with a resolver:
+   - DeterministicResolver: the UUID is generate_uuid5(key, namespace). Import objects
+     with uuid=generate_uuid5(key, namespace) and no lookup table is needed at all.
+   - UUIDIndex: for legacy data with random UUIDs, a compact on-disk SQLite index of
+     key property -> UUID, built once with a cursor scan of the collection.
+2. Sends all references of the page with one data.reference_add_many() call. Pages run
+   on a bounded thread pool (`workers` requests in flight).
+3. Reports pairs whose source or target could not be resolved, and optionally writes
+   them to a JSONL file. Weaviate does not check that a reference target exists, so
+   DeterministicResolver(verify=True) checks targets with a Filter.by_id() query.
+
+At 1000 references per request and 8 workers a 10M-reference run takes minutes.
+
+A JSON checkpoint records which pages were linked and the pairs whose references failed.
+Adding the same reference twice stores it twice, so a re-run never re-sends finished
+pages: it sends only the failed pairs again, then continues with the remaining pages
+(pages that were in flight when the process was killed may be sent again).
+
+Usage:
+    python ReferenceLinker.py --url <CLOUD_URL> --key <API_KEY> --collection Chunk \
+        --property belongsToReport --target-collection Report --pairs chunks.csv \
+        --source-field chunk_uuid --target-field report_custom_uuid \
+        --source-key-property chunk_uuid --target-key-property report_uuid \
+        --checkpoint link.json --unresolved unresolved.jsonl
+
+    targets = UUIDIndex("report_ids.sqlite")
+    targets.build(client.collections.use("Report"), "report_uuid")
+    linker = ReferenceLinker(client.collections.use("Chunk"), "belongsToReport",
+                             DeterministicResolver(), targets, workers=8)
+    linker.print_report(linker.link(pairs))
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import weaviate
+from weaviate.classes.data import DataReference
+from weaviate.classes.query import Filter
+from weaviate.util import generate_uuid5
+
+OUTCOMES = ["linked", "unresolved_source", "unresolved_target", "failed"]
+
+
+class Checkpoint:
+    """Offset, finished pages and failed pairs of a linking run, saved atomically as JSON."""
+
+    def __init__(self, path):
+        self.path = path
+        self.state = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.state = json.load(f)
+
+    def save(self, **state):
+        self.state.update(state)
+        if self.path:
+            temporary = f"{self.path}.tmp"
+            with open(temporary, "w") as f:
+                json.dump(self.state, f)
+            os.replace(temporary, self.path)
+
+
+class DeterministicResolver:
+    """
+    Key -> generate_uuid5(key, namespace), the UUID the object was imported with.
+
+    With verify=True the UUIDs are checked against `collection` and missing ones are left
+    unresolved; UUIDs known to exist are remembered (up to `cache_size`).
+    """
+
+    def __init__(self, namespace="", collection=None, verify=False, cache_size=1_000_000):
+        if verify and collection is None:
+            raise ValueError("verify=True needs the collection to check against")
+        self.namespace = namespace
+        self.collection = collection
+        self.verify = verify
+        self.cache_size = cache_size
+        self._known = set()
+        self._lock = threading.Lock()
+
+    def resolve_many(self, keys):
+        resolved = {key: generate_uuid5(key, self.namespace) for key in keys}
+        if not self.verify:
+            return resolved
+        with self._lock:
+            unknown = list({u for u in resolved.values() if u not in self._known})
+        existing = set()
+        for start in range(0, len(unknown), 1000):
+            chunk = unknown[start:start + 1000]
+            response = self.collection.query.fetch_objects(filters=Filter.by_id().contains_any(chunk),
+                                                           limit=len(chunk), return_properties=[])
+            existing.update(str(obj.uuid) for obj in response.objects)
+        with self._lock:
+            if len(self._known) + len(existing) > self.cache_size:
+                self._known.clear()
+            self._known.update(existing)
+            known = self._known
+            return {key: u for key, u in resolved.items() if u in known or u in existing}
+
+
+class UUIDIndex:
+    """
+    On-disk external ID -> UUID index (SQLite, UUIDs as 16-byte blobs).
+
+    Lookups are served from the file, so the index can be far larger than memory and is
+    reused across runs. Each thread gets its own read connection. `complete` is set only
+    once build() has scanned the whole collection, so an interrupted build is redone.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with sqlite3.connect(path) as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS ids (key TEXT PRIMARY KEY, uuid BLOB NOT NULL) WITHOUT ROWID")
+            connection.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = sqlite3.connect(self.path, check_same_thread=False)
+        return connection
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM ids").fetchone()[0]
+
+    @property
+    def complete(self):
+        return self._connection().execute("SELECT 1 FROM meta WHERE name = 'complete'").fetchone() is not None
+
+    def add_many(self, pairs):
+        """Add (key, uuid) pairs; returns how many keys were already indexed (first one wins)."""
+        connection = self._connection()
+        rows = [(str(key), uuid.UUID(str(value)).bytes) for key, value in pairs]
+        before = connection.total_changes
+        connection.executemany("INSERT OR IGNORE INTO ids VALUES (?, ?)", rows)
+        connection.commit()
+        return len(rows) - (connection.total_changes - before)
+
+    def build(self, collection, key_property, page_size=1000):
+        """Index every object of `collection` by `key_property`; returns (indexed, duplicates, without key)."""
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=OFF")
+        connection.execute("PRAGMA synchronous=OFF")
+        # Start from scratch: rows of an interrupted build would count as duplicates
+        connection.execute("DELETE FROM meta WHERE name = 'complete'")
+        connection.execute("DELETE FROM ids")
+        connection.commit()
+        indexed = duplicates = without_key = 0
+        started = time.perf_counter()
+        page = []
+        for obj in collection.iterator(return_properties=[key_property], cache_size=page_size):
+            key = obj.properties.get(key_property)
+            if key is None:
+                without_key += 1
+                continue
+            page.append((key, obj.uuid))
+            if len(page) >= 10000:
+                duplicates += self.add_many(page)
+                indexed += len(page)
+                page = []
+                print(f"  indexed {indexed} keys ({indexed / (time.perf_counter() - started):.0f}/s)")
+        if page:
+            duplicates += self.add_many(page)
+            indexed += len(page)
+        connection.execute("INSERT INTO meta VALUES ('complete', ?)", (time.strftime("%Y-%m-%dT%H:%M:%S"),))
+        connection.commit()
+        return indexed - duplicates, duplicates, without_key
+
+    def resolve_many(self, keys):
+        connection = self._connection()
+        keys = [str(key) for key in keys]
+        resolved = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = connection.execute(f"SELECT key, uuid FROM ids WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+            resolved.update((key, str(uuid.UUID(bytes=value))) for key, value in rows)
+        return resolved
+
+
+class ReferenceLinker:
+    def __init__(self, collection, from_property, source_resolver, target_resolver, target_collection=None,
+                 workers=8, batch_size=1000, checkpoint_path=None, dry_run=False, unresolved_path=None,
+                 max_retries=3, progress_interval=10.0):
+        self.collection = collection
+        self.from_property = from_property
+        self.source_resolver = source_resolver
+        self.target_resolver = target_resolver
+        self.target_collection = target_collection      # set for multi-target reference properties
+        self.workers = workers
+        self.checkpoint = Checkpoint(checkpoint_path)
+        # Pages must have the same boundaries as the interrupted run
+        self.batch_size = self.checkpoint.state.get("batch_size", batch_size)
+        self.dry_run = dry_run
+        self.unresolved_path = unresolved_path
+        self.max_retries = max_retries
+        self.progress_interval = progress_interval
+        self.stats = Counter()
+        self.errors = []
+        self.unresolved_examples = []
+        self._lock = threading.Lock()
+
+    def _reference(self, source, target):
+        if self.target_collection:
+            return DataReference.MultiTarget(from_property=self.from_property, from_uuid=source, to_uuid=target,
+                                             target_collection=self.target_collection)
+        return DataReference(from_property=self.from_property, from_uuid=source, to_uuid=target)
+
+    def _write(self, references):
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self.collection.data.reference_add_many(references)
+            except Exception:
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(2 ** attempt)
+
+    def _link(self, pairs):
+        """Resolve and link one page; returns (counts, errors, unresolved pairs, failed pairs)."""
+        counts = Counter()
+        sources = self.source_resolver.resolve_many({source for source, _ in pairs})
+        targets = self.target_resolver.resolve_many({target for _, target in pairs})
+        references, resolved, unresolved = [], [], []
+        for source, target in pairs:
+            if source not in sources:
+                counts["unresolved_source"] += 1
+                unresolved.append({"source": source, "target": target, "missing": "source"})
+            elif target not in targets:
+                counts["unresolved_target"] += 1
+                unresolved.append({"source": source, "target": target, "missing": "target"})
+            else:
+                references.append(self._reference(sources[source], targets[target]))
+                resolved.append((source, target))
+        errors, failed = [], []
+        if references and not self.dry_run:
+            try:
+                result = self._write(references)
+            except Exception as e:
+                errors, failed = [str(e)], resolved
+            else:
+                # errors are keyed by the index of the reference in the request
+                errors = [error.message for error in list(result.errors.values())[:10]]
+                failed = [resolved[index] for index in sorted(result.errors)]
+        counts["failed"] += len(failed)
+        counts["linked"] += len(references) - len(failed)
+        return counts, errors, unresolved, failed
+
+    def link(self, pairs):
+        """Link a stream of (source key, target key) pairs; finished pages of an earlier run are skipped."""
+        offset = self.checkpoint.state.get("offset", 0)
+        done = set(self.checkpoint.state.get("done", []))
+        retry = [tuple(pair) for pair in self.checkpoint.state.get("retry", [])]
+        if offset or done or retry:
+            print(f"Resuming at pair {offset} ({len(done)} later pages already linked, "
+                  f"{len(retry)} failed pairs to retry)")
+        if not self.dry_run:
+            self.checkpoint.save(batch_size=self.batch_size)
+        unresolved_file = open(self.unresolved_path, "a" if offset or done or retry else "w", encoding="utf-8") \
+            if self.unresolved_path else None
+
+        def pages():
+            position = 0
+            page = []
+            for source, target in pairs:
+                position += 1
+                if position <= offset:
+                    continue
+                page.append((str(source), str(target)))
+                if len(page) >= self.batch_size:
+                    yield position, page
+                    page = []
+            if page:
+                yield position, page
+
+        # Failed pairs of the previous run go first, in pages of their own; they stay in the
+        # checkpoint's retry list until they are answered
+        carried = {("retry", start): retry[start:start + self.batch_size]
+                   for start in range(0, len(retry), self.batch_size)}
+
+        started = last_report = time.perf_counter()
+        pending = {}
+        finished = set()    # end positions of answered pages
+        order = []          # end positions in submission order
+        committed = 0
+        failed_pairs = []   # pairs whose reference failed in this run, re-sent by the next one
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                def drain(block_until):
+                    nonlocal committed
+                    while len(pending) > block_until:
+                        completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in completed:
+                            key, page = pending.pop(future)
+                            try:
+                                counts, errors, unresolved, failed = future.result()
+                            except Exception as e:
+                                counts, errors, unresolved, failed = Counter(failed=len(page)), [str(e)], [], page
+                            with self._lock:
+                                self.stats.update(counts)
+                                self.errors += errors[:max(10 - len(self.errors), 0)]
+                                self.unresolved_examples += unresolved[:max(10 - len(self.unresolved_examples), 0)]
+                            if unresolved_file:
+                                unresolved_file.writelines(json.dumps(item) + "\n" for item in unresolved)
+                            # Only the failed pairs are re-sent: the rest of the page is linked and
+                            # sending it again would store those references twice
+                            failed_pairs.extend(failed)
+                            if key in carried:
+                                del carried[key]
+                            else:
+                                finished.add(key)
+                                done.add(key)
+                        # The offset advances over the prefix of answered pages
+                        while committed < len(order) and order[committed] in finished:
+                            done.discard(order[committed])
+                            committed += 1
+                        if not self.dry_run and completed:
+                            # One save, so offset, done pages and retry list always match
+                            retry_now = [pair for page in carried.values() for pair in page] + failed_pairs
+                            state = {"offset": order[committed - 1]} if committed else {}
+                            self.checkpoint.save(**state, done=sorted(done),
+                                                 retry=[list(pair) for pair in retry_now], stats=dict(self.stats))
+
+                for key, page in itertools.chain(list(carried.items()), pages()):
+                    if key in done:
+                        finished.add(key)
+                        order.append(key)
+                        continue
+                    with self._lock:
+                        self.stats["read"] += len(page)
+                    if key not in carried:
+                        order.append(key)
+                    pending[executor.submit(self._link, page)] = (key, page)
+                    drain(self.workers * 2)
+                    if time.perf_counter() - last_report >= self.progress_interval:
+                        last_report = time.perf_counter()
+                        self._print_progress(started)
+                drain(0)
+        finally:
+            if unresolved_file:
+                unresolved_file.close()
+
+        elapsed = time.perf_counter() - started
+        totals = {outcome: self.stats[outcome] for outcome in OUTCOMES}
+        totals["read"] = self.stats["read"]
+        totals["seconds"] = round(elapsed, 1)
+        totals["references_per_sec"] = round(totals["linked"] / elapsed, 1) if elapsed else 0.0
+        totals["dry_run"] = self.dry_run
+        return totals
+
+    def _print_progress(self, started):
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            stats = dict(self.stats)
+        unresolved = stats.get("unresolved_source", 0) + stats.get("unresolved_target", 0)
+        print(f"[{elapsed:7.0f}s] read {stats.get('read', 0)}, linked {stats.get('linked', 0)} "
+              f"({stats.get('linked', 0) / elapsed:.0f}/s), unresolved {unresolved}, failed {stats.get('failed', 0)}")
+
+    def print_report(self, totals):
+        mode = "DRY RUN: would link" if self.dry_run else "Linked"
+        print(f"\n{mode} {totals['linked']} references of {totals['read']} pairs in {totals['seconds']}s "
+              f"({totals['references_per_sec']}/s); unresolved sources {totals['unresolved_source']}, "
+              f"unresolved targets {totals['unresolved_target']}, failed {totals['failed']}")
+        for item in self.unresolved_examples[:5]:
+            print(f"  Unresolved {item['missing']}: {item['source']} -> {item['target']}")
+        if self.unresolved_path and (totals["unresolved_source"] or totals["unresolved_target"]):
+            print(f"  All unresolved pairs: {self.unresolved_path}")
+        for error in self.errors[:5]:
+            print(f"  Error: {error}")
+
+
+def _read_pairs(path, source_field, target_field):
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    yield record[source_field], record[target_field]
+        else:
+            for row in csv.DictReader(f):
+                yield row[source_field], row[target_field]
+
+
+def _resolver(collection, key_property, namespace, index_dir, verify, rebuild):
+    if key_property is None:
+        return DeterministicResolver(namespace, collection, verify)
+    os.makedirs(index_dir, exist_ok=True)
+    # Each tenant holds its own objects, so it gets its own index
+    scope = f"{collection.name}.{collection.tenant}" if collection.tenant else collection.name
+    path = os.path.join(index_dir, f"{scope}.{key_property}.sqlite")
+    if rebuild and os.path.exists(path):
+        os.remove(path)
+    index = UUIDIndex(path)
+    if not index.complete:
+        print(f"Building {path} from {scope}.{key_property}")
+        indexed, duplicates, without_key = index.build(collection, key_property)
+        print(f"  {indexed} keys indexed, {duplicates} duplicate keys (first UUID kept), "
+              f"{without_key} objects without a key")
+    return index
+
+
+def connect(url, key):
+    if url == "localhost":
+        return weaviate.connect_to_local(auth_credentials=weaviate.auth.AuthApiKey(api_key=key) if key else None)
+    return weaviate.connect_to_weaviate_cloud(
+        cluster_url=url,
+        auth_credentials=weaviate.auth.AuthApiKey(api_key=key),
+        skip_init_checks=True,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk cross-reference linking by external IDs")
+    parser.add_argument("--url", default=os.environ.get("WEAVIATE_URL", "localhost"))
+    parser.add_argument("--key", default=os.environ.get("WEAVIATE_API_KEY", ""))
+    parser.add_argument("--collection", required=True, help="Collection holding the reference property")
+    parser.add_argument("--property", required=True, help="Reference property to add to")
+    parser.add_argument("--target-collection", required=True)
+    parser.add_argument("--multi-target", action="store_true", help="The property references several collections")
+    parser.add_argument("--tenant")
+    parser.add_argument("--pairs", required=True, help="CSV (with header) or JSONL file of source/target keys")
+    parser.add_argument("--source-field", default="source")
+    parser.add_argument("--target-field", default="target")
+    parser.add_argument("--source-key-property",
+                        help="Resolve sources through an index of this property (default: generate_uuid5)")
+    parser.add_argument("--target-key-property",
+                        help="Resolve targets through an index of this property (default: generate_uuid5)")
+    parser.add_argument("--source-namespace", default="", help="generate_uuid5 namespace of source keys")
+    parser.add_argument("--target-namespace", default="", help="generate_uuid5 namespace of target keys")
+    parser.add_argument("--no-verify-targets", action="store_true",
+                        help="Do not check that generate_uuid5 targets exist")
+    parser.add_argument("--index-dir", default="uuid_index")
+    parser.add_argument("--rebuild-index", action="store_true")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--checkpoint", help="JSON checkpoint file to resume from / write to")
+    parser.add_argument("--unresolved", help="JSONL file for pairs that could not be resolved")
+    parser.add_argument("--dry-run", action="store_true", help="Resolve and count without writing references")
+    args = parser.parse_args()
+
+    client = connect(args.url, args.key)
+    try:
+        source = client.collections.use(args.collection)
+        target = client.collections.use(args.target_collection)
+        if args.tenant:
+            source, target = source.with_tenant(args.tenant), target.with_tenant(args.tenant)
+        linker = ReferenceLinker(
+            source, args.property,
+            _resolver(source, args.source_key_property, args.source_namespace, args.index_dir, False,
+                      args.rebuild_index),
+            _resolver(target, args.target_key_property, args.target_namespace, args.index_dir,
+                      not args.no_verify_targets, args.rebuild_index),
+            target_collection=args.target_collection if args.multi_target else None,
+            workers=args.workers, batch_size=args.batch_size, checkpoint_path=args.checkpoint,
+            dry_run=args.dry_run, unresolved_path=args.unresolved,
+        )
+        linker.print_report(linker.link(_read_pairs(args.pairs, args.source_field, args.target_field)))
+    finally:
+        client.close()
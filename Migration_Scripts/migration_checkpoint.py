@@ -0,0 +1,135 @@
+"""
+Durable per-stream checkpoints for resumable migrations.
+
+A migration stream is one collection, one tenant of a multi-tenant collection, or one
+UUID-range partition of a collection (see parallel_migration.py). For every stream the
+store records the last UUID cursor whose page was written to the target and the number
+of objects written so far. An interrupted run restarts with the same checkpoint file:
+finished streams are skipped and unfinished ones continue with iterator(after=cursor) /
+fetch_objects(after=cursor) instead of re-reading and re-writing everything.
+
+The cursor only moves after the target confirmed the write, and never past an object
+the target rejected, so a crash or a failure can repeat at most the last page; objects
+keep their source UUIDs, so the repeat overwrites instead of duplicating.
+
+Usage (sync client, e.g. from general_migration.ipynb):
+    store = CheckpointStore("migration.sqlite")
+    migrate_stream(source_col.with_tenant("t1"), target_col.with_tenant("t1"),
+                   store, "MyCollection", "t1")
+"""
+import sqlite3
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS streams (
+    collection TEXT NOT NULL,
+    tenant TEXT NOT NULL,
+    partition TEXT NOT NULL,
+    cursor TEXT,
+    written INTEGER NOT NULL DEFAULT 0,
+    done INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (collection, tenant, partition)
+)
+"""
+
+
+def _key(collection, tenant=None, partition=None):
+    # NULLs are never equal in a primary key, so absent parts are stored as ""
+    return collection, tenant or "", partition or ""
+
+
+class CheckpointStore:
+    """SQLite file holding (cursor, written, done) per (collection, tenant, partition)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    def get(self, collection, tenant=None, partition=None):
+        """Return (cursor, written, done) of a stream; (None, 0, False) if it never started."""
+        row = self._db.execute(
+            "SELECT cursor, written, done FROM streams WHERE collection = ? AND tenant = ? AND partition = ?",
+            _key(collection, tenant, partition),
+        ).fetchone()
+        if row is None:
+            return None, 0, False
+        return row[0], row[1], bool(row[2])
+
+    def save(self, collection, tenant=None, partition=None, cursor=None, written=0, done=False):
+        """Record progress of a stream; call only after the page up to `cursor` was written."""
+        self._db.execute(
+            "INSERT OR REPLACE INTO streams (collection, tenant, partition, cursor, written, done, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (*_key(collection, tenant, partition), str(cursor) if cursor else None, written, int(done), time.time()),
+        )
+        self._db.commit()
+
+    def mark_done(self, collection, tenant=None, partition=None):
+        cursor, written, _ = self.get(collection, tenant, partition)
+        self.save(collection, tenant, partition, cursor, written, done=True)
+
+    def summary(self):
+        """Return counts of finished / unfinished streams and objects written."""
+        done, pending, written = self._db.execute(
+            "SELECT COALESCE(SUM(done), 0), COALESCE(SUM(1 - done), 0), COALESCE(SUM(written), 0) FROM streams"
+        ).fetchone()
+        return {"done": done, "in_progress": pending, "written": written}
+
+    def reset(self):
+        self._db.execute("DELETE FROM streams")
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+
+def migrate_stream(source, target, store, collection_name, tenant=None, batch_size=100, checkpoint_every=10000):
+    """
+    Copy one collection / tenant with the sync client, resuming from the stored cursor.
+
+    The target batch is flushed every `checkpoint_every` objects and the cursor is saved
+    only after that batch context closed, i.e. once the objects were sent. If objects
+    failed, the cursor is saved right before the first failed one and the stream stops
+    without being marked done, so the next run copies them again (objects after it that
+    did succeed are overwritten in place).
+    """
+    cursor, written, done = store.get(collection_name, tenant)
+    if done:
+        print(f"{collection_name}/{tenant or '-'}: already migrated ({written} objects)")
+        return written
+
+    iterator = iter(source.iterator(include_vector=True, after=cursor))
+    exhausted = False
+    while not exhausted:
+        window = []
+        with target.batch.fixed_size(batch_size=batch_size) as batch:
+            for _ in range(checkpoint_every):
+                obj = next(iterator, None)
+                if obj is None:
+                    exhausted = True
+                    break
+                vector = obj.vector.get("default") if list(obj.vector or {}) == ["default"] else obj.vector
+                batch.add_object(properties=obj.properties, vector=vector or None, uuid=obj.uuid)
+                window.append(obj.uuid)
+        failed = target.batch.failed_objects
+        if failed:
+            # Everything before the first failed object was written; resume right before it
+            failed_ids = {str(f.object_.uuid) for f in failed}
+            first = next(i for i, object_id in enumerate(window) if str(object_id) in failed_ids)
+            written += first
+            if first:
+                cursor = window[first - 1]
+                store.save(collection_name, tenant, cursor=cursor, written=written)
+            print(f"{collection_name}/{tenant or '-'}: {len(failed)} objects failed, e.g. {failed[0].message}; "
+                  f"stopped at cursor {cursor}, run again to retry from there")
+            return written
+        if window:
+            written += len(window)
+            store.save(collection_name, tenant, cursor=window[-1], written=written)
+            print(f"{collection_name}/{tenant or '-'}: {written} objects written (cursor {window[-1]})")
+
+    store.mark_done(collection_name, tenant)
+    return written
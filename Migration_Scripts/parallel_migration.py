@@ -0,0 +1,461 @@
+"""
+Parallel, multi-stream migration of Weaviate collections and tenants.
+
+general_migration.ipynb copies one collection / tenant at a time through a single
+iterator and a single batch, so a cluster with thousands of tenants is migrated
+strictly in series. This script runs every (collection, tenant) copy as its own
+stream on the async client:
+
+- At most `max_streams` streams run at once (bounded worker pool).
+- Each stream reads pages with fetch_objects(after=cursor) and writes them with
+  data.insert_many(); the next page is read while the previous one is being written.
+- Writes are bounded per target collection (`max_writes_per_target`), so a collection
+  with many tenants cannot flood one set of shards while the rest of the pool waits.
+- A progress line per active stream shows objects/sec while the migration runs.
+- At the end, aggregate.over_all() counts are compared between source and target
+  for every stream and a verification report is printed.
+
+A single large non-MT collection would still be one stream, capped by the round trip
+of one cursor. With `partitions=N` such collections are split into N UUID ranges that
+are read in parallel and written into the same target collection. The cursor API
+cannot be combined with filters, so each partition seeds after= just below its range
+start and stops client-side once the cursor passes its range end (objects come back
+in UUID order). Equal ranges assume roughly uniform UUIDs (uuid4 / uuid5); run
+`python parallel_migration.py --self-check` to verify every object is read once.
+
+With a checkpoint file (`checkpoint_path`, see migration_checkpoint.py) the cursor and
+written count of every stream are saved after each confirmed page; re-running with the
+same file skips finished streams and resumes the others from their last cursor.
+Partition checkpoints are keyed by UUID range, so keep --partitions unchanged between
+runs (a different count simply starts those partitions again).
+
+Collections must exist in the target (see STEP ONE in general_migration.ipynb or
+the schema dump scripts in General_Scripts/); missing tenants are created.
+Cross-references are not copied.
+
+Usage:
+    python parallel_migration.py --source-url <URL> --source-key <KEY> \
+        --target-url <URL> --target-key <KEY> --max-streams 16 [--partitions 8] \
+        [--checkpoint migration.sqlite]
+    python parallel_migration.py --self-check
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from collections import namedtuple
+
+import weaviate
+from weaviate.classes.data import DataObject
+from weaviate.classes.init import AdditionalConfig, Auth, Timeout
+from weaviate.classes.tenants import Tenant
+
+from migration_checkpoint import CheckpointStore
+
+UUID_SPACE = 2 ** 128
+
+# partition / lower / upper are only set for UUID-range partitions of one collection
+Stream = namedtuple("Stream", ["collection", "tenant", "partition", "lower", "upper"], defaults=(None, None, None))
+
+
+class StreamStats:
+    """Progress of one stream; updated by the stream's task and read by the reporter."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.objects = 0
+        self.resumed = 0            # objects written by earlier runs
+        self.failed = 0
+        self.errors = []
+        self.started = None
+        self.finished = None
+
+    @property
+    def name(self):
+        name = f"{self.stream.collection}/{self.stream.tenant}" if self.stream.tenant else self.stream.collection
+        return f"{name}#{self.stream.partition}" if self.stream.partition is not None else name
+
+    def objects_per_sec(self):
+        if self.started is None:
+            return 0.0
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        return (self.objects - self.resumed) / elapsed if elapsed > 0 else 0.0
+
+
+def _scoped(client, stream):
+    collection = client.collections.use(stream.collection)
+    return collection.with_tenant(stream.tenant) if stream.tenant else collection
+
+
+def _vector_of(obj):
+    # Single-vector collections come back as {"default": [...]}; pass those on unnamed
+    if not obj.vector:
+        return None
+    if list(obj.vector) == ["default"]:
+        return obj.vector["default"]
+    return obj.vector
+
+
+def partition_streams(stream, partitions):
+    """Split a stream into `partitions` equal UUID ranges [lower, upper)."""
+    if partitions <= 1:
+        return [stream]
+    bounds = [i * UUID_SPACE // partitions for i in range(partitions)] + [UUID_SPACE]
+    return [
+        stream._replace(partition=i, lower=bounds[i], upper=bounds[i + 1])
+        for i in range(partitions)
+    ]
+
+
+def _partition_after(stream):
+    # after= is exclusive, so start from the UUID just below the range start
+    if not stream.lower:
+        return None
+    return uuid.UUID(int=stream.lower - 1)
+
+
+def _checkpoint_key(stream):
+    partition = f"{stream.lower:032x}-{stream.upper:032x}" if stream.partition is not None else None
+    return stream.collection, stream.tenant, partition
+
+
+async def discover_streams(client, collection_names=None, partitions=1):
+    """
+    Return one Stream per non-MT collection and per tenant of each MT collection.
+
+    Non-MT collections are split into `partitions` UUID-range streams.
+    """
+    names = collection_names or list((await client.collections.list_all()).keys())
+    streams = []
+    for name in names:
+        collection = client.collections.use(name)
+        config = await collection.config.get()
+        if config.multi_tenancy_config.enabled:
+            tenants = await collection.tenants.get()
+            streams.extend(Stream(name, tenant) for tenant in sorted(tenants))
+        else:
+            streams.extend(partition_streams(Stream(name, None), partitions))
+    return streams
+
+
+async def prepare_target(client, streams):
+    """Create the tenants of every MT stream in the target (existing ones are kept)."""
+    by_collection = {}
+    for stream in streams:
+        if stream.tenant:
+            by_collection.setdefault(stream.collection, []).append(stream.tenant)
+    for name, tenants in by_collection.items():
+        collection = client.collections.use(name)
+        existing = await collection.tenants.get()
+        missing = [Tenant(name=tenant) for tenant in tenants if tenant not in existing]
+        # Keep tenant-create requests to a reasonable size
+        for i in range(0, len(missing), 100):
+            await collection.tenants.create(missing[i:i + 100])
+        if missing:
+            print(f"Created {len(missing)} tenants in target collection '{name}'")
+
+
+async def iter_pages(collection, page_size=1000, after=None, until=None):
+    """
+    Yield pages of objects (with vectors) using the after= cursor.
+
+    With `until` (a UUID as int) the scan stops before the first object at or above it.
+    """
+    while True:
+        response = await collection.query.fetch_objects(limit=page_size, after=after, include_vector=True)
+        objects = response.objects
+        if not objects:
+            return
+        if until is not None and objects[-1].uuid.int >= until:
+            objects = [obj for obj in objects if obj.uuid.int < until]
+            if objects:
+                yield objects
+            return
+        yield objects
+        if len(objects) < page_size:
+            return
+        after = objects[-1].uuid
+
+
+async def write_page(collection, objects, stats, target_slots, max_retries=3):
+    """
+    Insert one page into the target, waiting for a free write slot on its collection.
+
+    Returns how many objects at the start of the page were written: all of them, those
+    before the first object the target rejected, or 0 if the request itself kept failing.
+    """
+    data_objects = [
+        DataObject(properties=obj.properties, vector=_vector_of(obj), uuid=obj.uuid)
+        for obj in objects
+    ]
+    for attempt in range(max_retries + 1):
+        try:
+            async with target_slots:
+                result = await collection.data.insert_many(data_objects)
+            break
+        except Exception as e:
+            if attempt == max_retries:
+                stats.failed += len(data_objects)
+                stats.errors.append(str(e))
+                return 0
+            await asyncio.sleep(min(2 ** attempt, 10))
+
+    stats.objects += len(data_objects) - len(result.errors)
+    stats.failed += len(result.errors)
+    for error in list(result.errors.values())[:3]:
+        if len(stats.errors) < 10:
+            stats.errors.append(error.message)
+    # errors are keyed by the index of the object in the request
+    return min(result.errors, default=len(data_objects))
+
+
+async def copy_stream(source, target, stream, stats, target_slots, page_size=1000, store=None):
+    """
+    Copy every object of one stream, overlapping the read of page N+1 with the write of page N.
+
+    With a CheckpointStore the stream resumes from its saved cursor, the cursor is saved
+    after every written page, and the stream is marked done once fully copied. A page
+    whose request keeps failing, or with objects the target rejected, stops the stream:
+    the cursor is saved right before the first object that was not written, so the next
+    run copies it again (later objects of the page are overwritten in place).
+    """
+    key = _checkpoint_key(stream)
+    after = _partition_after(stream)
+    confirmed = 0           # objects up to the saved cursor
+    if store:
+        cursor, written, done = store.get(*key)
+        confirmed = written
+        stats.objects = stats.resumed = written
+        if done:
+            stats.started = stats.finished = time.perf_counter()
+            return
+        if cursor:
+            after = uuid.UUID(cursor)
+
+    src = _scoped(source, stream)
+    tgt = _scoped(target, stream)
+
+    async def write(objects):
+        nonlocal confirmed
+        written = await write_page(tgt, objects, stats, target_slots)
+        if store and written:
+            confirmed += written
+            store.save(*key, cursor=objects[written - 1].uuid, written=confirmed)
+        return written == len(objects)
+
+    stats.started = time.perf_counter()
+    pending = None
+    try:
+        async for objects in iter_pages(src, page_size, after=after, until=stream.upper):
+            if pending and not await pending:
+                pending = None
+                break
+            pending = asyncio.create_task(write(objects))
+        else:
+            if pending is None or await pending:
+                if store:
+                    store.mark_done(*key)
+    except Exception as e:
+        stats.errors.append(f"read failed: {e}")
+    finally:
+        if pending and not pending.done():
+            pending.cancel()
+        stats.finished = time.perf_counter()
+
+
+async def report_progress(all_stats, interval=10.0):
+    """Print objects/sec per active stream and the overall totals every `interval` seconds."""
+    started = time.perf_counter()
+    while True:
+        await asyncio.sleep(interval)
+        active = [s for s in all_stats if s.started is not None and s.finished is None]
+        done = sum(s.finished is not None for s in all_stats)
+        total = sum(s.objects for s in all_stats)
+        copied = total - sum(s.resumed for s in all_stats)
+        elapsed = time.perf_counter() - started
+        print(f"[{elapsed:7.0f}s] {done}/{len(all_stats)} streams done, {total} objects "
+              f"({copied / elapsed:.0f} obj/s), {len(active)} active")
+        for stats in sorted(active, key=lambda s: s.objects, reverse=True)[:10]:
+            print(f"    {stats.name:<50} {stats.objects:>10} objects {stats.objects_per_sec():>8.0f} obj/s")
+
+
+async def count_objects(client, stream):
+    # Counts are per collection / tenant; partitions are verified as a whole
+    result = await _scoped(client, stream).aggregate.over_all(total_count=True)
+    return result.total_count
+
+
+async def verify_counts(source, target, streams, max_concurrency=16):
+    """Compare aggregate.over_all() counts per stream; returns a list of report rows."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def check(stream):
+        async with semaphore:
+            try:
+                source_count, target_count = await asyncio.gather(
+                    count_objects(source, stream), count_objects(target, stream)
+                )
+            except Exception as e:
+                return {"stream": stream, "source": None, "target": None, "match": False, "error": str(e)}
+        return {"stream": stream, "source": source_count, "target": target_count,
+                "match": source_count == target_count, "error": None}
+
+    return await asyncio.gather(*(check(stream) for stream in streams))
+
+
+def print_verification_report(rows):
+    mismatched = [row for row in rows if not row["match"]]
+    print("\nVerification report")
+    print("-" * 90)
+    print(f"{'Collection':<30} {'Tenant':<25} {'Source':>10} {'Target':>10}  Status")
+    for row in mismatched or rows[:20]:
+        stream = row["stream"]
+        status = "OK" if row["match"] else (f"ERROR: {row['error']}" if row["error"] else "MISMATCH")
+        print(f"{stream.collection:<30} {stream.tenant or '-':<25} "
+              f"{row['source'] if row['source'] is not None else '-':>10} "
+              f"{row['target'] if row['target'] is not None else '-':>10}  {status}")
+    source_total = sum(row["source"] or 0 for row in rows)
+    target_total = sum(row["target"] or 0 for row in rows)
+    print("-" * 90)
+    print(f"{len(rows) - len(mismatched)}/{len(rows)} streams match; "
+          f"source total {source_total}, target total {target_total}")
+
+
+async def migrate(source, target, collection_names=None, max_streams=8, max_writes_per_target=4,
+                  page_size=1000, progress_interval=10.0, partitions=1, checkpoint_path=None):
+    """Migrate all streams of the given collections (default: all) and verify the counts."""
+    streams = await discover_streams(source, collection_names, partitions)
+    print(f"Discovered {len(streams)} streams in {len({s.collection for s in streams})} collections")
+    await prepare_target(target, streams)
+
+    store = CheckpointStore(checkpoint_path) if checkpoint_path else None
+    if store:
+        finished = sum(store.get(*_checkpoint_key(stream))[2] for stream in streams)
+        print(f"Checkpoint {checkpoint_path}: {finished} streams already done, "
+              f"{len(streams) - finished} to migrate")
+
+    all_stats = [StreamStats(stream) for stream in streams]
+    target_slots = {s.collection: asyncio.Semaphore(max_writes_per_target) for s in streams}
+    pool = asyncio.Semaphore(max_streams)
+
+    async def run(stats):
+        async with pool:
+            await copy_stream(source, target, stats.stream, stats, target_slots[stats.stream.collection],
+                              page_size, store)
+
+    reporter = asyncio.create_task(report_progress(all_stats, progress_interval))
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(run(stats) for stats in all_stats))
+    finally:
+        reporter.cancel()
+        if store:
+            store.close()
+    elapsed = time.perf_counter() - started
+
+    total = sum(s.objects for s in all_stats)
+    copied = total - sum(s.resumed for s in all_stats)
+    failed = sum(s.failed for s in all_stats)
+    print(f"\nCopied {copied} objects this run, {total} in total ({failed} failed) in {elapsed:.1f}s "
+          f"({copied / elapsed if elapsed else 0:.0f} obj/s)")
+    for stats in all_stats:
+        if stats.errors:
+            print(f"  {stats.name}: {stats.errors[:3]}")
+
+    unpartitioned = list(dict.fromkeys(Stream(s.collection, s.tenant) for s in streams))
+    rows = await verify_counts(source, target, unpartitioned)
+    print_verification_report(rows)
+    return all_stats, rows
+
+
+class FakeCollection:
+    """In-memory stand-in for collection.query.fetch_objects(after=...), ordered by UUID."""
+
+    def __init__(self, uuids):
+        self.uuids = sorted(uuids, key=lambda u: u.int)
+        self.query = self
+
+    async def fetch_objects(self, limit, after=None, include_vector=False):
+        start = 0
+        if after is not None:
+            # Like the server, the cursor need not be an existing object
+            start = next((i for i, u in enumerate(self.uuids) if u.int > after.int), len(self.uuids))
+        page = self.uuids[start:start + limit]
+        return namedtuple("Response", ["objects"])([namedtuple("Obj", ["uuid"])(u) for u in page])
+
+
+async def _read_partitions(collection, partitions, page_size):
+    async def read(stream):
+        return [obj.uuid async for page in iter_pages(collection, page_size, _partition_after(stream), stream.upper)
+                for obj in page]
+    results = await asyncio.gather(*(read(stream) for stream in partition_streams(Stream("Fake", None), partitions)))
+    return [u for result in results for u in result]
+
+
+def self_check(seed=0):
+    """Check that partitioned scans read every object of a fake collection exactly once."""
+    rng = random.Random(seed)
+    for objects, partitions, page_size in [(0, 4, 10), (1, 3, 1), (1000, 1, 100), (1000, 7, 33),
+                                           (5000, 16, 250), (300, 64, 7), (10, 8, 1000)]:
+        uuids = [uuid.UUID(int=rng.getrandbits(128)) for _ in range(objects)]
+        # Objects sitting exactly on (and just below) partition boundaries
+        for bound in partition_streams(Stream("Fake", None), partitions):
+            if bound.lower:
+                uuids += [uuid.UUID(int=bound.lower), uuid.UUID(int=bound.lower - 1)]
+        uuids = list(set(uuids))
+        read = asyncio.run(_read_partitions(FakeCollection(uuids), partitions, page_size))
+        assert len(read) == len(set(read)) == len(uuids) and set(read) == set(uuids), \
+            f"{objects} objects / {partitions} partitions / page {page_size}: read {len(read)} of {len(uuids)}"
+        print(f"OK: {len(uuids):>5} objects, {partitions:>2} partitions, page size {page_size:>4}")
+
+
+def connect(url, api_key):
+    return weaviate.use_async_with_weaviate_cloud(
+        cluster_url=url,
+        auth_credentials=Auth.api_key(api_key),
+        skip_init_checks=True,
+        additional_config=AdditionalConfig(timeout=Timeout(init=120, query=240, insert=480)),
+    )
+
+
+async def main(args):
+    async with connect(args.source_url, args.source_key) as source, \
+            connect(args.target_url, args.target_key) as target:
+        await migrate(
+            source,
+            target,
+            collection_names=args.collections,
+            max_streams=args.max_streams,
+            max_writes_per_target=args.max_writes_per_target,
+            page_size=args.page_size,
+            progress_interval=args.progress_interval,
+            partitions=args.partitions,
+            checkpoint_path=args.checkpoint,
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel Weaviate collection / tenant migration")
+    parser.add_argument("--source-url")
+    parser.add_argument("--source-key")
+    parser.add_argument("--target-url")
+    parser.add_argument("--target-key")
+    parser.add_argument("--collections", nargs="*", help="Collections to migrate (default: all)")
+    parser.add_argument("--max-streams", type=int, default=8, help="Streams copied concurrently")
+    parser.add_argument("--max-writes-per-target", type=int, default=4,
+                        help="Concurrent insert requests per target collection")
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--progress-interval", type=float, default=10.0, help="Seconds between progress lines")
+    parser.add_argument("--partitions", type=int, default=1,
+                        help="UUID-range partitions read in parallel per non-MT collection")
+    parser.add_argument("--checkpoint", help="SQLite checkpoint file; re-run with the same file to resume")
+    parser.add_argument("--self-check", action="store_true", help="Verify partitioned scans against a fake collection")
+    args = parser.parse_args()
+
+    if args.self_check:
+        self_check()
+    elif not all([args.source_url, args.source_key, args.target_url, args.target_key]):
+        parser.error("--source-url, --source-key, --target-url and --target-key are required")
+    else:
+        asyncio.run(main(args))